@@ -1,16 +1,43 @@
 import os
 import json
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 from typing_extensions import TypedDict, Annotated
+from pydantic import BaseModel, Field
 import operator
 import re
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage, SystemMessage
+import asyncio
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, AIMessageChunk, ToolMessage, SystemMessage
 from langchain_core.tools import tool
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 
+from llm_registry import llm_registry
+from model_config import model_router
+from llm_gateway import llm_gateway
+from eval_cache import evaluation_cache, make_cache_key
+from context_manager import build_prompt
+from question_bank import question_bank, curriculum_slice
+from dedup import duplicate_filter
+from speculative import SPECULATIVE_QUESTIONS, SpeculativeQuestionGenerator
+from telemetry import telemetry, traced_tool
+from deadlines import (
+    TURN_BUDGET_SECONDS,
+    PENDING_EVALUATION,
+    PENDING_VERDICT,
+    BudgetExceeded,
+    current_thread,
+    degrade,
+    deferred_evaluations,
+    remaining,
+    reserve,
+    reserve_seconds,
+    resolved_feedback,
+    turn_config,
+    with_deadline,
+)
 from prompts import (
+    INIT_MESSAGE,
     STATIC_SYSTEM_PROMPT,
     STATIC_EVALUATION_PROMPT_TEMPLATE,
     DYNAMIC_SYSTEM_PROMPT,
@@ -19,25 +46,51 @@ from prompts import (
     HYBRID_SYSTEM_PROMPT,
     HYBRID_QUESTION_GENERATION_PROMPT_TEMPLATE,
     FINAL_JUDGING_PROMPT_TEMPLATE,
+    STATIC_FAST_PATH_PHRASING_PROMPT,
+    STRUCTURED_TURN_PROMPT_TEMPLATE,
+    STRUCTURED_NEXT_QUESTION_INSTRUCTIONS,
+    STRUCTURED_JUDGING_PROMPT_TEMPLATE,
 )
 
+# Maximum tool calls from one model turn that run at the same time in async mode
+TOOL_CONCURRENCY = int(os.getenv("TOOL_CONCURRENCY", "4"))
+# Run Static interviews as a local state machine instead of routing every step through the interviewer LLM
+STATIC_FAST_PATH = os.getenv("STATIC_FAST_PATH", "0") == "1"
+STATIC_FAST_PATH_PHRASING = os.getenv("STATIC_FAST_PATH_PHRASING", "0") == "1"
+# Handle each candidate reply with one structured model call (evaluation, verdict and next question together)
+STRUCTURED_TURNS = os.getenv("STRUCTURED_TURNS", "0") == "1"
+
 # --- Agent State Definition ---
+def merge_feedback(existing: List[dict], new: List[dict]) -> List[dict]:
+    """Appends feedback_report entries; an entry with "replaces": i takes the place of entry i (a deferred evaluation filled in later)."""
+    merged = list(existing or [])
+    for entry in new or []:
+        if entry.get("replaces") is None:
+            merged.append(entry)
+        elif entry["replaces"] < len(merged):
+            merged[entry["replaces"]] = {k: v for k, v in entry.items() if k != "replaces"}
+    return merged
+
 class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
     user_name: Optional[str]
     interview_questions: List[dict]
     question_number: int
-    feedback_report: Annotated[List[dict], operator.add]
+    feedback_report: Annotated[List[dict], merge_feedback]
     interview_finished: bool
     interview_type: str
     current_question: str
     final_rating: Optional[str]
     # --- ADDED: Field for number of questions ---
     num_questions_to_ask: Optional[int]
+    # Fallbacks taken because a turn ran out of its latency budget (see deadlines.py)
+    degradations: Annotated[List[dict], operator.add]
 
 
-# --- Tools (No changes needed to tools themselves) ---
+# --- Tools ---
+# @traced_tool runs each tool inside a telemetry span (latency, errors, attributes such as the verdict)
 @tool
+@traced_tool
 def ask_static_question(state: AgentState) -> str:
     """Use this tool to ask the next predefined technical interview question from a list."""
     q_number = state.get("question_number", 0)
@@ -48,73 +101,246 @@ def ask_static_question(state: AgentState) -> str:
     else:
         return "NO_MORE_QUESTIONS"
 
+# --- Question Generation Helpers ---
+def _history_summary(feedback_report: List[dict]) -> str:
+    history_summary = [f"- Asked: '{r['question']}' -> Verdict: {r.get('verdict', 'N/A')}" for r in feedback_report]
+    return "\n".join(history_summary) if history_summary else "No questions have been asked yet."
+
+def generate_question(interview_type: str, feedback_report: List[dict], interview_questions: List[dict], request: str,
+                      candidate: Optional[str] = None) -> str:
+    """
+    Generates the next Dynamic or Hybrid question from the verdict history (shared by the tools and speculation).
+    Near-duplicates of questions already asked (or, for Dynamic, of bank questions) are regenerated (see dedup.py).
+    A candidate question proposed elsewhere (structured turns) is checked first and only regenerated if rejected.
+    """
+    history_str = _history_summary(feedback_report)
+    if interview_type == "Hybrid":
+        # Only the next few curriculum items, so the prompt stays the same size however large the bank is
+        relevant = curriculum_slice(interview_questions, len(feedback_report))
+        curriculum = "\n".join([f"- {q['question']} (Covers: {q['expected_concepts']})" for q in relevant])
+    # Hybrid samples slightly hotter than the generator's route, so curriculum-bound questions still vary
+    temperature = model_router.route("generator").temperature + (0.05 if interview_type == "Hybrid" else 0.0)
+
+    def attempt(avoid: List[str]) -> str:
+        if candidate and not avoid:
+            return candidate
+        attempt_request = request
+        if avoid:
+            attempt_request += " The new question must be clearly different from: " + " | ".join(f"'{q}'" for q in avoid)
+        if interview_type == "Hybrid":
+            prompt = HYBRID_QUESTION_GENERATION_PROMPT_TEMPLATE.format(static_questions=curriculum, history=history_str, request=attempt_request)
+        else:
+            prompt = QUESTION_GENERATION_PROMPT_TEMPLATE.format(history=history_str, request=attempt_request)
+        gen_llm = llm_registry.shared("generator", temperature=temperature)
+        return llm_gateway.invoke("generator", gen_llm, prompt).content
+
+    asked = [r["question"] for r in feedback_report]
+    try:
+        with reserve():
+            return duplicate_filter.generate_unique(attempt, asked, interview_type)
+    except BudgetExceeded:
+        question = fallback_question(interview_type, feedback_report, interview_questions)
+        degrade("question_fallback", question, "Question generation ran past the turn budget; a bank question was asked instead.")
+        return question
+
+def fallback_question(interview_type: str, feedback_report: List[dict], interview_questions: List[dict]) -> str:
+    """A question that needs no model call: the next curriculum item (Hybrid) or a bank question not asked yet."""
+    asked = {r["question"] for r in feedback_report}
+    if interview_type == "Hybrid" and interview_questions:
+        for item in curriculum_slice(interview_questions, len(feedback_report), size=len(interview_questions)):
+            if item["question"] not in asked:
+                return item["question"]
+    # Seeded by the questions so far, so a retried turn falls back to the same question
+    for item in question_bank.sample(len(asked) + 1, seed="|".join(r["question"] for r in feedback_report)):
+        if item["question"] not in asked:
+            return item["question"]
+    return question_bank.sample(1, seed=len(asked))[0]["question"]
+
+speculative_generator = SpeculativeQuestionGenerator(generate_question)
+
 @tool
+@traced_tool
 def generate_dynamic_question(state: AgentState, request: str) -> str:
     """Use this tool to generate a new, adaptive interview question based on the conversation history."""
-    print("\n---GENERATING DYNAMIC QUESTION---")
-    history_summary = [f"- Asked: '{r['question']}' -> Verdict: {r.get('verdict', 'N/A')}" for r in state.get("feedback_report", [])]
-    history_str = "\n".join(history_summary) if history_summary else "No questions have been asked yet."
-    gen_llm = ChatGoogleGenerativeAI(model=os.getenv("CHAT_MODEL", "gemini-2.0-flash"), temperature=0.8)
-    prompt = QUESTION_GENERATION_PROMPT_TEMPLATE.format(history=history_str, request=request)
-    new_question = gen_llm.invoke(prompt).content
-    print(f"Generated new question: {new_question}")
+    new_question = generate_question("Dynamic", state.get("feedback_report", []), [], request)
+    telemetry.annotate("question", new_question)
     return new_question
 
 @tool
+@traced_tool
 def generate_hybrid_question(state: AgentState, request: str) -> str:
     """Use this tool to generate a new, curriculum-based interview question."""
-    print("\n---GENERATING HYBRID QUESTION---")
-    history_summary = [f"- Asked: '{r['question']}' -> Verdict: {r.get('verdict', 'N/A')}" for r in state.get("feedback_report", [])]
-    history_str = "\n".join(history_summary) if history_summary else "No questions have been asked yet."
-    static_questions = state.get("interview_questions", [])
-    curriculum = "\n".join([f"- {q['question']} (Covers: {q['expected_concepts']})" for q in static_questions])
-    gen_llm = ChatGoogleGenerativeAI(model=os.getenv("CHAT_MODEL", "gemini-2.0-flash"), temperature=0.85)
-    prompt = HYBRID_QUESTION_GENERATION_PROMPT_TEMPLATE.format(static_questions=curriculum, history=history_str, request=request)
-    new_question = gen_llm.invoke(prompt).content
-    print(f"Generated new question: {new_question}")
+    new_question = generate_question("Hybrid", state.get("feedback_report", []), state.get("interview_questions", []), request)
+    telemetry.annotate("question", new_question)
     return new_question
 
+# --- Grading Helpers (shared by the tools and batch_grade.py) ---
+def run_evaluation(interview_type: str, question: str, user_answer: str, expected_concepts: str = "", use_cache: bool = True) -> str:
+    """Evaluates one answer: Static answers against their expected concepts, Dynamic/Hybrid answers against the question alone."""
+    if interview_type == "Static":
+        template = STATIC_EVALUATION_PROMPT_TEMPLATE
+        prompt = template.format(question=question, expected_concepts=expected_concepts, user_answer=user_answer)
+    else:
+        expected_concepts = ""
+        template = DYNAMIC_EVALUATION_PROMPT_TEMPLATE
+        prompt = template.format(question=question, user_answer=user_answer)
+
+    # Evaluation runs at temperature 0, so identical (normalized) answers to the same question get the same result
+    # from the same prompt and model
+    cache_key = make_cache_key(template, model_router.route("evaluator").model, question, expected_concepts, user_answer)
+    evaluation = evaluation_cache.get(cache_key) if use_cache else None
+    telemetry.record_cache("evaluation", evaluation is not None)
+    telemetry.annotate("cache_hit", evaluation is not None)
+    if evaluation is None:
+        response = llm_gateway.invoke("evaluator", llm_registry.shared("evaluator"), prompt)
+        evaluation = response.content
+        if "Verdict: " in evaluation:
+            evaluation_cache.put(cache_key, evaluation)
+    telemetry.annotate("verdict", _parse_verdict(evaluation))
+    return evaluation
+
+def _transcript(feedback_report: List[dict]) -> str:
+    transcript_parts = [f"Question: {r['question']}\nCandidate's Answer: {r['user_answer']}\nEvaluation: {r['evaluation']}\n" for r in feedback_report]
+    return "\n".join(transcript_parts)
+
+def run_judgement(feedback_report: List[dict]) -> str:
+    """Produces the final judgement (ending in "Final Rating: X/10") for a list of feedback_report entries."""
+    prompt = FINAL_JUDGING_PROMPT_TEMPLATE.format(interview_transcript=_transcript(feedback_report))
+    response = llm_gateway.invoke("judge", llm_registry.shared("judge"), prompt)
+    final_judgment = response.content
+    telemetry.annotate("final_rating", parse_final_rating(final_judgment))
+    return final_judgment
+
+def parse_final_rating(judgement: str) -> Optional[str]:
+    match = re.search(r"Final Rating: (\d{1,2}/10)", judgement)
+    return match.group(1) if match else None
+
+# --- Latency Budget Fallbacks (see deadlines.py) ---
+VERDICT_SCORES = {"Correct": 1.0, "Partially Correct": 0.5, "Incorrect": 0.0}
+
+def evaluate_within_budget(interview_type: str, question: str, user_answer: str, expected_concepts: str = "") -> str:
+    """run_evaluation, or PENDING_EVALUATION if grading would miss the turn's deadline (it then finishes in the background)."""
+    try:
+        with reserve():
+            return run_evaluation(interview_type, question, user_answer, expected_concepts)
+    except BudgetExceeded:
+        thread_id = current_thread()
+        if thread_id is None:
+            raise
+        deferred_evaluations.submit(thread_id, question, user_answer, lambda: run_evaluation(interview_type, question, user_answer, expected_concepts))
+        degrade("evaluation_deferred", question, "Grading ran past the turn budget; the evaluation was completed in the background.")
+        return PENDING_EVALUATION
+
+def heuristic_rating(feedback_report: List[dict]) -> int:
+    """A 1-10 rating from the share of correct verdicts (partially correct counts half); 5 if nothing was graded."""
+    scores = [VERDICT_SCORES[v] for v in (_parse_verdict(r.get("evaluation", "")).rstrip(".") for r in feedback_report) if v in VERDICT_SCORES]
+    return round(1 + 9 * sum(scores) / len(scores)) if scores else 5
+
+def _graded_report(feedback_report: List[dict]) -> List[dict]:
+    """The report with deferred evaluations filled in, waiting for them as long as the budget allows."""
+    if not any(r.get("verdict") == PENDING_VERDICT for r in feedback_report):
+        return feedback_report
+    left = remaining()
+    # Half of what is left, so the judge still gets a chance to run
+    wait = max(0.0, (left - reserve_seconds()) / 2) if left is not None else 60.0
+    return resolved_feedback(current_thread(), feedback_report, wait=wait)
+
+def judge_within_budget(feedback_report: List[dict]) -> str:
+    """run_judgement, or a rating estimated from the verdicts if judging would miss the turn's deadline."""
+    report = _graded_report(feedback_report)
+    try:
+        with reserve():
+            return run_judgement(report)
+    except BudgetExceeded:
+        rating = heuristic_rating(report)
+        degrade("heuristic_rating", None, "Judging ran past the turn budget; the rating was estimated from the verdicts.")
+        return f"The final judgement could not be completed in time, so the rating is estimated from the per-question verdicts.\nFinal Rating: {rating}/10"
+
+# --- Structured Output ---
+class TurnResult(BaseModel):
+    """The interviewer's handling of one candidate reply."""
+    is_answer: bool = Field(description="False if the candidate asked for clarification instead of answering.")
+    evaluation: str = Field(default="", description="One-paragraph evaluation of the answer; empty if is_answer is false.")
+    verdict: Optional[Literal["Correct", "Partially Correct", "Incorrect"]] = Field(default=None, description="Verdict on the answer; null if is_answer is false.")
+    next_question: Optional[str] = Field(default=None, description="The next interview question, or null.")
+    message: str = Field(description="What the interviewer says to the candidate now.")
+
+class Judgement(BaseModel):
+    """Final, holistic assessment of a completed interview."""
+    summary: str = Field(description="One-paragraph assessment of the candidate's performance.")
+    rating: int = Field(ge=1, le=10, description="Overall rating from 1 to 10.")
+
+def structured_invoke(role: str, client, schema, prompt, attempts: int = 2):
+    """Calls the model through the gateway with its reply validated against schema; a reply that does not validate is retried once."""
+    structured = client.with_structured_output(schema, include_raw=True)
+    for _ in range(attempts):
+        result = llm_gateway.invoke(role, structured, prompt)
+        if result["parsed"] is not None:
+            return result["parsed"]
+        telemetry.increment("structured_output_errors_total", role=role, schema=schema.__name__)
+    raise ValueError(f"The model's reply did not match {schema.__name__}: {result['parsing_error']}")
+
+def run_structured_judgement(feedback_report: List[dict]) -> Judgement:
+    """Like run_judgement, but the rating comes back as a validated field instead of text to parse."""
+    feedback_report = _graded_report(feedback_report)
+    prompt = STRUCTURED_JUDGING_PROMPT_TEMPLATE.format(interview_transcript=_transcript(feedback_report))
+    try:
+        with reserve():
+            judgement = structured_invoke("judge", llm_registry.shared("judge"), Judgement, prompt)
+    except BudgetExceeded:
+        degrade("heuristic_rating", None, "Judging ran past the turn budget; the rating was estimated from the verdicts.")
+        judgement = Judgement(summary="The rating is estimated from the per-question verdicts.", rating=heuristic_rating(feedback_report))
+    telemetry.annotate("final_rating", f"{judgement.rating}/10")
+    return judgement
+
 @tool
+@traced_tool
 def evaluate_candidate_answer(user_answer: str, state: AgentState) -> str:
     """Use this tool to evaluate a candidate's answer to the most recent technical question."""
-    print("\n---EVALUATING ANSWER---")
     interview_type = state.get("interview_type", "Static")
-    eval_llm = ChatGoogleGenerativeAI(model=os.getenv("CHAT_MODEL", "gemini-2.0-flash"), temperature=0.0)
     if interview_type == "Static":
         q_number = state.get("question_number", 0)
         questions = state.get("interview_questions", [])
         if q_number >= len(questions): return "Evaluation failed: No active question."
         question_data = questions[q_number]
-        prompt = STATIC_EVALUATION_PROMPT_TEMPLATE.format(question=question_data["question"], expected_concepts=question_data["expected_concepts"], user_answer=user_answer)
-    else:
-        current_question = state.get("current_question", "No question found.")
-        prompt = DYNAMIC_EVALUATION_PROMPT_TEMPLATE.format(question=current_question, user_answer=user_answer)
-    evaluation = eval_llm.invoke(prompt).content
-    print(f"Evaluation result: {evaluation}")
-    return evaluation
+        return evaluate_within_budget("Static", question_data["question"], user_answer, question_data["expected_concepts"])
+    return evaluate_within_budget(interview_type, state.get("current_question", "No question found."), user_answer)
 
 @tool
+@traced_tool
 def judge_interview_performance(state: AgentState) -> str:
     """Use this tool only at the very end of the interview to provide a final, holistic rating."""
-    print("\n---JUDGING FINAL PERFORMANCE---")
-    feedback_report = state.get("feedback_report", [])
-    transcript_parts = [f"Question: {r['question']}\nCandidate's Answer: {r['user_answer']}\nEvaluation: {r['evaluation']}\n" for r in feedback_report]
-    interview_transcript = "\n".join(transcript_parts)
-    judging_llm = ChatGoogleGenerativeAI(model=os.getenv("CHAT_MODEL", "gemini-2.0-flash"), temperature=0.2)
-    prompt = FINAL_JUDGING_PROMPT_TEMPLATE.format(interview_transcript=interview_transcript)
-    final_judgment = judging_llm.invoke(prompt).content
-    print(f"Final Judgment: {final_judgment}")
-    return final_judgment
+    return judge_within_budget(state.get("feedback_report", []))
 
 @tool
+@traced_tool
 def conclude_interview(state: AgentState) -> str:
     """Use this tool to end the interview after all questions are asked and evaluated."""
     user_name = state.get("user_name", "Candidate")
     return f"Interview concluded for {user_name}."
 
+TOOLS_BY_NAME = {t.name: t for t in [ask_static_question, generate_dynamic_question, generate_hybrid_question, evaluate_candidate_answer, judge_interview_performance, conclude_interview]}
+QUESTION_TOOLS = ("ask_static_question", "generate_dynamic_question", "generate_hybrid_question")
+
+def _parse_verdict(evaluation: str) -> str:
+    return evaluation.split("Verdict: ")[-1].strip() if "Verdict: " in evaluation else "N/A"
+
 # --- Agent Definition ---
-def create_agent_graph(llm, checkpointer, interview_type: str):
-    """Factory function to create the appropriate agent graph based on interview type."""
+def create_agent_graph(llm, checkpointer, interview_type: str, speculative: bool = SPECULATIVE_QUESTIONS, use_async: bool = False,
+                       static_fast_path: bool = STATIC_FAST_PATH, structured_turns: bool = STRUCTURED_TURNS):
+    """
+    Factory function to create the appropriate agent graph based on interview type.
+    With speculative=True (Dynamic/Hybrid only), follow-up questions for both verdicts are generated
+    in the background while the candidate answers.
+    With use_async=True the nodes are coroutines (run the graph with ainvoke/astream) and independent
+    tool calls from one model turn run concurrently, up to TOOL_CONCURRENCY per session.
+    With static_fast_path=True, Static interviews use create_static_fast_graph instead.
+    With structured_turns=True, every interview type uses create_structured_turn_graph instead (takes precedence).
+    """
+    if structured_turns:
+        return create_structured_turn_graph(llm, checkpointer, interview_type)
+    if interview_type == "Static" and static_fast_path:
+        return create_static_fast_graph(llm, checkpointer, phrase_with_llm=STATIC_FAST_PATH_PHRASING)
     if interview_type == "Static":
         tools = [ask_static_question, evaluate_candidate_answer, judge_interview_performance, conclude_interview]
         system_prompt_template = STATIC_SYSTEM_PROMPT
@@ -129,55 +355,175 @@ def create_agent_graph(llm, checkpointer, interview_type: str):
 
     agent = llm.bind_tools(tools)
 
-    def agent_node(state: AgentState):
-        print(f"\n---AGENT NODE ({interview_type})---")
+    def _prompt_messages(state: AgentState) -> List[BaseMessage]:
         # --- MODIFIED: Format the system prompt with the number of questions ---
         num_questions = state.get("num_questions_to_ask", 5) # Default to 5 if not set
         system_prompt = system_prompt_template.format(num_questions=num_questions)
-        
-        messages_with_system_prompt = [SystemMessage(content=system_prompt)] + state["messages"]
-        result = agent.invoke(messages_with_system_prompt)
-        return {"messages": [result]}
+        # Older question/evaluation turns are replaced by a summary so the prompt size stays bounded
+        prompt, stats = build_prompt(
+            system_prompt, state["messages"], state.get("feedback_report", []),
+            current_question=state.get("current_question"), user_name=state.get("user_name"),
+        )
+        for key, value in stats.items():
+            telemetry.annotate(key, value)
+        return prompt
 
-    def tool_node(state: AgentState):
-        print(f"\n---TOOL NODE ({interview_type})---")
-        # (No changes to the logic inside tool_node, it remains the same)
+    def _report_usage(result: AIMessage) -> None:
+        telemetry.annotate("tool_calls", [call["name"] for call in result.tool_calls])
+
+    question_tool = tools[0].name
+
+    def _scripted_step(state: AgentState) -> AIMessage:
+        """
+        The interviewer's next step without a model call, used once the turn is out of budget: evaluate,
+        then ask the next question (or judge and conclude), then relay the question. Replies are taken as answers.
+        """
         messages = state["messages"]
+        q_number = state.get("question_number", 0)
+        total = len(state.get("interview_questions", [])) if interview_type == "Static" else (state.get("num_questions_to_ask") or 5)
+        question_args = {} if interview_type == "Static" else {"request": "Ask the next question, adapting to the previous answer."}
+
+        def call(name: str, args: dict) -> AIMessage:
+            return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"scripted_{len(messages)}_{name}"}])
+
         last_message = messages[-1]
-        tool_invocations = last_message.tool_calls
+        if isinstance(last_message, HumanMessage):
+            if last_message.content == INIT_MESSAGE:
+                return call(question_tool, question_args)
+            if q_number >= total:
+                return call("judge_interview_performance", {})
+            return call("evaluate_candidate_answer", {"user_answer": last_message.content})
+
+        # Results of the last tool round, by tool name
+        results, i = {}, len(messages) - 1
+        while i >= 0 and isinstance(messages[i], ToolMessage):
+            i -= 1
+        names = {c["id"]: c["name"] for c in messages[i].tool_calls} if i >= 0 and isinstance(messages[i], AIMessage) else {}
+        for message in messages[i + 1:]:
+            results[names.get(message.tool_call_id, "")] = message.content
+
+        if "conclude_interview" in results:
+            return AIMessage(content="That concludes the interview. Thank you for your time! Your final performance report is below.")
+        if "judge_interview_performance" in results:
+            return call("conclude_interview", {})
+        if question_tool in results:
+            if q_number == 0:
+                name = state.get("user_name") or "there"
+                return AIMessage(content=f"Hello {name}, I'm Excel Ninja, and I'll be conducting your Excel interview today. There are {total} questions; let's begin.\n\n**Question 1 of {total}:** {results[question_tool]}")
+            return AIMessage(content=f"Thank you. **Question {q_number + 1} of {total}:** {results[question_tool]}")
+        if "evaluate_candidate_answer" in results:
+            return call(question_tool, question_args) if q_number < total else call("judge_interview_performance", {})
+        return AIMessage(content="Thank you. Please go on.")
+
+    def _out_of_budget(state: AgentState) -> AIMessage:
+        result = _scripted_step(state)
+        # One record per turn: the first scripted step of a turn follows the candidate's message
+        if isinstance(state["messages"][-1], HumanMessage):
+            degrade("scripted_routing", state.get("current_question") or None, "The interviewer model ran past the turn budget; the turn was completed with scripted steps.")
+        return result
+
+    def agent_node(state: AgentState):
+        try:
+            result = llm_gateway.invoke("orchestrator", agent, _prompt_messages(state))
+        except BudgetExceeded:
+            result = _out_of_budget(state)
+        _report_usage(result)
+        return {"messages": [result]}
+
+    async def agent_node_async(state: AgentState):
+        try:
+            result = await llm_gateway.ainvoke("orchestrator", agent, _prompt_messages(state))
+        except BudgetExceeded:
+            result = _out_of_budget(state)
+        _report_usage(result)
+        return {"messages": [result]}
+
+    speculate = speculative and interview_type in ("Dynamic", "Hybrid")
+
+    def _invoke_tool(call: dict, state: AgentState, thread_id: str, feedback_so_far: List[dict]) -> str:
+        """Runs a single tool call and returns its raw result. State bookkeeping happens in _merge_tool_results."""
+        tool_name, tool_input = call["name"], {**call["args"], "state": state}
+        if tool_name in QUESTION_TOOLS:
+            if speculate and feedback_so_far:
+                result = speculative_generator.take(thread_id, feedback_so_far)
+                telemetry.record_cache("speculative_question", result is not None)
+                if result is not None:
+                    return result
+            return TOOLS_BY_NAME[tool_name].invoke(tool_input)
+        if tool_name == "judge_interview_performance" and speculate:
+            speculative_generator.cancel(thread_id)
+        if tool_name in TOOLS_BY_NAME:
+            return TOOLS_BY_NAME[tool_name].invoke(tool_input)
+        return f"Unknown tool {tool_name} called."
+
+    def _merge_tool_results(state: AgentState, thread_id: str, tool_invocations: List[dict], results: List[str]) -> dict:
+        """Folds tool results into the state update in call order, so the outcome never depends on completion order."""
         tool_outputs, new_feedback_reports = [], []
         q_number = state.get("question_number", 0)
         current_question = state.get("current_question", "")
         interview_finished = state.get("interview_finished", False)
         final_rating = state.get("final_rating")
 
-        for call in tool_invocations:
-            tool_name, tool_input = call["name"], {**call["args"], "state": state}
+        for call, result in zip(tool_invocations, results):
+            tool_name = call["name"]
             if tool_name == "evaluate_candidate_answer":
                 user_answer = call["args"].get("user_answer", "")
-                result = evaluate_candidate_answer.invoke(tool_input)
-                verdict = result.split("Verdict: ")[-1].strip() if "Verdict: " in result else "N/A"
+                verdict = _parse_verdict(result)
                 question_to_log = current_question if interview_type != "Static" else state["interview_questions"][q_number]["question"]
                 new_feedback_reports.append({"question": question_to_log, "user_answer": user_answer, "evaluation": result, "verdict": verdict})
                 q_number += 1
-            elif tool_name in ["ask_static_question", "generate_dynamic_question", "generate_hybrid_question"]:
-                result = globals()[tool_name].invoke(tool_input)
+            elif tool_name in QUESTION_TOOLS:
                 current_question = result
+                feedback_so_far = state.get("feedback_report", []) + new_feedback_reports
+                # No follow-up is needed once the last question has been shown
+                if speculate and len(feedback_so_far) + 1 < (state.get("num_questions_to_ask") or 5):
+                    speculative_generator.prefetch(thread_id, interview_type, feedback_so_far, state.get("interview_questions", []), result)
             elif tool_name == "judge_interview_performance":
-                result = judge_interview_performance.invoke(tool_input)
-                match = re.search(r"Final Rating: (\d{1,2}/10)", result)
-                if match: final_rating = match.group(1)
+                final_rating = parse_final_rating(result) or final_rating
             elif tool_name == "conclude_interview":
-                result = conclude_interview.invoke(tool_input)
                 interview_finished = True
-            else: result = f"Unknown tool {tool_name} called."
             tool_outputs.append(ToolMessage(content=str(result), tool_call_id=call["id"]))
-            
+
         return {"messages": tool_outputs, "question_number": q_number, "feedback_report": new_feedback_reports, "interview_finished": interview_finished, "current_question": current_question, "final_rating": final_rating}
 
+    def _provisional_feedback(state: AgentState, calls: List[dict], results: List[str]) -> List[dict]:
+        """Feedback history including verdicts from evaluations that ran earlier in the same turn (used for speculation)."""
+        new_verdicts = [{"verdict": _parse_verdict(r)} for c, r in zip(calls, results) if c["name"] == "evaluate_candidate_answer"]
+        return state.get("feedback_report", []) + new_verdicts
+
+    def tool_node(state: AgentState, config: RunnableConfig):
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+        tool_invocations = state["messages"][-1].tool_calls
+        results = []
+        for i, call in enumerate(tool_invocations):
+            feedback_so_far = _provisional_feedback(state, tool_invocations[:i], results)
+            results.append(_invoke_tool(call, state, thread_id, feedback_so_far))
+        return _merge_tool_results(state, thread_id, tool_invocations, results)
+
+    async def tool_node_async(state: AgentState, config: RunnableConfig):
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+        tool_invocations = state["messages"][-1].tool_calls
+        # One node run handles one turn of one session, so this bounds concurrency per session
+        semaphore = asyncio.Semaphore(TOOL_CONCURRENCY)
+        tasks: List[asyncio.Task] = []
+
+        async def run(i: int, call: dict) -> str:
+            feedback_so_far = state.get("feedback_report", [])
+            if speculate and call["name"] in QUESTION_TOOLS:
+                # A speculative question can only be picked once the evaluations before it have a verdict
+                earlier = [(tool_invocations[j], tasks[j]) for j in range(i) if tool_invocations[j]["name"] == "evaluate_candidate_answer"]
+                earlier_results = await asyncio.gather(*(task for _, task in earlier))
+                feedback_so_far = _provisional_feedback(state, [c for c, _ in earlier], list(earlier_results))
+            async with semaphore:
+                return await asyncio.to_thread(_invoke_tool, call, state, thread_id, feedback_so_far)
+
+        for i, call in enumerate(tool_invocations):
+            tasks.append(asyncio.ensure_future(run(i, call)))
+        results = await asyncio.gather(*tasks)
+        return _merge_tool_results(state, thread_id, tool_invocations, list(results))
+
     def should_continue(state: AgentState):
-        # (No changes to routing logic)
-        print("\n---ROUTING---")
+        # Tool calls run in the tools node, a pending answer or tool result goes back to the interviewer, anything else ends the turn
         last_message = state["messages"][-1]
         if isinstance(last_message, AIMessage) and last_message.tool_calls: return "tools"
         if state.get("interview_finished", False): return END
@@ -185,9 +531,246 @@ def create_agent_graph(llm, checkpointer, interview_type: str):
         return END
 
     graph = StateGraph(AgentState)
-    graph.add_node("interviewer", agent_node)
-    graph.add_node("tools", tool_node)
+    # with_deadline runs each node under the turn's latency budget (see deadlines.py)
+    graph.add_node("interviewer", telemetry.trace_node("interviewer", interview_type, with_deadline(agent_node_async if use_async else agent_node)))
+    graph.add_node("tools", telemetry.trace_node("tools", interview_type, with_deadline(tool_node_async if use_async else tool_node)))
     graph.set_entry_point("interviewer")
     graph.add_conditional_edges("interviewer", should_continue, {"tools": "tools", "interviewer": "interviewer", END: END})
     graph.add_edge("tools", "interviewer")
     return graph.compile(checkpointer=checkpointer)
+
+
+# --- Static Fast Path ---
+def create_static_fast_graph(llm, checkpointer, phrase_with_llm: bool = False):
+    """
+    Deterministic state machine for Static interviews. The flow is fixed (ask questions[n], evaluate,
+    then judge and conclude after the last question), so routing and asking run locally. The LLM is
+    only used for evaluation, judging and, with phrase_with_llm=True, for phrasing the questions.
+    Produces the same AgentState fields and feedback_report entries as create_agent_graph. Every
+    candidate message is treated as an answer; there is no interviewer to handle clarification requests.
+    """
+
+    def _phrase(question: str, instruction: str, fallback: str) -> str:
+        if not phrase_with_llm:
+            return fallback
+        prompt = STATIC_FAST_PATH_PHRASING_PROMPT.format(instruction=instruction, question=question)
+        try:
+            response = llm_gateway.invoke("orchestrator", llm, prompt)
+        except BudgetExceeded:
+            degrade("scripted_routing", question, "Phrasing ran past the turn budget; the question was asked as written.")
+            return fallback
+        return response.content
+
+    def ask_node(state: AgentState):
+        question = ask_static_question.invoke({"state": state})
+        q_number = state.get("question_number", 0)
+        total = len(state.get("interview_questions", []))
+        if q_number == 0:
+            name = state.get("user_name") or "there"
+            instruction = f"Greet the candidate ({name}), introduce yourself, and ask the first question."
+            fallback = f"Hello {name}, I'm Excel Ninja, and I'll be conducting your Excel interview today. There are {total} questions; let's begin.\n\n**Question 1 of {total}:** {question}"
+        else:
+            instruction = "Briefly acknowledge the previous answer without evaluating it, then ask the next question."
+            fallback = f"Thank you. **Question {q_number + 1} of {total}:** {question}"
+        return {"messages": [AIMessage(content=_phrase(question, instruction, fallback))], "current_question": question}
+
+    def evaluate_node(state: AgentState):
+        q_number = state.get("question_number", 0)
+        user_answer = state["messages"][-1].content
+        result = evaluate_candidate_answer.invoke({"user_answer": user_answer, "state": state})
+        report = {"question": state["interview_questions"][q_number]["question"], "user_answer": user_answer, "evaluation": result, "verdict": _parse_verdict(result)}
+        return {"feedback_report": [report], "question_number": q_number + 1}
+
+    def judge_node(state: AgentState):
+        result = judge_interview_performance.invoke({"state": state})
+        return {"final_rating": parse_final_rating(result) or state.get("final_rating")}
+
+    def conclude_node(state: AgentState):
+        conclude_interview.invoke({"state": state})
+        closing = "That concludes the interview. Thank you for your time! Your final performance report is below."
+        return {"messages": [AIMessage(content=closing)], "interview_finished": True}
+
+    def route_entry(state: AgentState):
+        last_message = state["messages"][-1]
+        if state.get("interview_finished", False) or not isinstance(last_message, HumanMessage):
+            return END
+        if last_message.content == INIT_MESSAGE:
+            return "ask"
+        if state.get("question_number", 0) >= len(state.get("interview_questions", [])):
+            return "judge"
+        return "evaluate"
+
+    def route_after_evaluate(state: AgentState):
+        if state.get("question_number", 0) < len(state.get("interview_questions", [])):
+            return "ask"
+        return "judge"
+
+    graph = StateGraph(AgentState)
+    for name, node in (("ask", ask_node), ("evaluate", evaluate_node), ("judge", judge_node), ("conclude", conclude_node)):
+        graph.add_node(name, telemetry.trace_node(name, "Static", with_deadline(node)))
+    routes = {"ask": "ask", "evaluate": "evaluate", "judge": "judge", END: END}
+    graph.set_conditional_entry_point(route_entry, routes)
+    # update_state() records the candidate's answer as if written by "ask", so routing resumes from there
+    graph.add_conditional_edges("ask", route_entry, routes)
+    graph.add_conditional_edges("evaluate", route_after_evaluate, {"ask": "ask", "judge": "judge"})
+    graph.add_edge("judge", "conclude")
+    graph.add_edge("conclude", END)
+    return graph.compile(checkpointer=checkpointer)
+
+# --- Structured Turns ---
+def create_structured_turn_graph(llm, checkpointer, interview_type: str):
+    """
+    Handles each candidate reply with one structured-output call that returns a validated TurnResult
+    (evaluation, verdict, next question and the interviewer's message) instead of interviewer -> evaluation
+    -> interviewer (-> generation). Routing is local, as in the Static fast path, and the final rating comes
+    from a structured Judgement. Produces the same AgentState fields and feedback_report entries as
+    create_agent_graph. Evaluations are not served from the evaluation cache in this mode. The turn call
+    grades, so it uses the evaluator's route (model_config.py); llm is not used.
+    """
+    if interview_type not in ("Static", "Dynamic", "Hybrid"):
+        raise ValueError(f"Unknown interview type: {interview_type}")
+
+    def _total(state: AgentState) -> int:
+        if interview_type == "Static":
+            return len(state.get("interview_questions", []))
+        return state.get("num_questions_to_ask") or 5
+
+    def _with_question(text: str, number: int, total: int, question: str) -> str:
+        return f"{text}\n\n**Question {number} of {total}:** {question}"
+
+    def _next_question_instruction(state: AgentState, q_number: int) -> str:
+        if q_number + 1 >= _total(state):
+            return STRUCTURED_NEXT_QUESTION_INSTRUCTIONS["last"]
+        if interview_type == "Static":
+            return STRUCTURED_NEXT_QUESTION_INSTRUCTIONS["given"]
+        if interview_type == "Hybrid":
+            relevant = curriculum_slice(state.get("interview_questions", []), q_number + 1)
+            curriculum = "\n".join([f"- {q['question']} (Covers: {q['expected_concepts']})" for q in relevant])
+            return STRUCTURED_NEXT_QUESTION_INSTRUCTIONS["Hybrid"].format(curriculum=curriculum)
+        return STRUCTURED_NEXT_QUESTION_INSTRUCTIONS["Dynamic"]
+
+    def open_node(state: AgentState):
+        total = _total(state)
+        if interview_type == "Static":
+            question = ask_static_question.invoke({"state": state})
+        else:
+            question = generate_question(interview_type, [], state.get("interview_questions", []), "Ask an opening question of moderate difficulty.")
+        name = state.get("user_name") or "there"
+        greeting = f"Hello {name}, I'm Excel Ninja, and I'll be conducting your Excel interview today. There are {total} questions; let's begin."
+        return {"messages": [AIMessage(content=_with_question(greeting, 1, total, question))], "current_question": question}
+
+    def turn_node(state: AgentState):
+        q_number = state.get("question_number", 0)
+        question = state.get("current_question", "")
+        user_answer = state["messages"][-1].content
+        expected = ""
+        if interview_type == "Static":
+            expected = f"**EXPECTED CONCEPTS:** {state['interview_questions'][q_number]['expected_concepts']}"
+        prompt = STRUCTURED_TURN_PROMPT_TEMPLATE.format(
+            interview_type=interview_type, next_question_instruction=_next_question_instruction(state, q_number),
+            history=_history_summary(state.get("feedback_report", [])), question=question,
+            expected_concepts=expected, user_answer=user_answer,
+        )
+        try:
+            # The turn call grades the answer, so it runs on the evaluator's model rather than the interviewer's
+            result = structured_invoke("evaluator", llm_registry.shared("evaluator"), TurnResult, prompt)
+        except BudgetExceeded:
+            # Out of budget: the reply is taken as an answer and graded separately (deferred if there is no time left)
+            degrade("scripted_routing", question, "The turn call ran past the turn budget; the reply was taken as an answer.")
+            concepts = state["interview_questions"][q_number]["expected_concepts"] if interview_type == "Static" else ""
+            evaluation = evaluate_within_budget(interview_type, question, user_answer, concepts)
+            report = {"question": question, "user_answer": user_answer, "evaluation": evaluation, "verdict": _parse_verdict(evaluation)}
+            return _answered(state, report, "Thank you.", None)
+        telemetry.annotate("is_answer", result.is_answer)
+        if not result.is_answer or result.verdict is None:
+            return {"messages": [AIMessage(content=result.message)]}
+
+        telemetry.annotate("verdict", result.verdict)
+        # Stored in the same "...\nVerdict: X" shape as tool evaluations, so reports and re-grading read it unchanged
+        report = {"question": question, "user_answer": user_answer, "evaluation": f"{result.evaluation.strip()}\nVerdict: {result.verdict}", "verdict": result.verdict}
+        return _answered(state, report, result.message, result.next_question)
+
+    def _answered(state: AgentState, report: dict, message: str, proposed_question: Optional[str]) -> dict:
+        """State update for an answered question: the report entry, then the next question unless it was the last."""
+        q_number = state.get("question_number", 0)
+        total = _total(state)
+        update = {"feedback_report": [report], "question_number": q_number + 1}
+        if q_number + 1 >= total:
+            update["messages"] = [AIMessage(content=message)]
+            return update
+        if interview_type == "Static":
+            next_question = state["interview_questions"][q_number + 1]["question"]
+        else:
+            next_question = generate_question(
+                interview_type, state.get("feedback_report", []) + [report], state.get("interview_questions", []),
+                "Ask the next question, adapting to the previous answer.", candidate=proposed_question,
+            )
+        update["messages"] = [AIMessage(content=_with_question(message, q_number + 2, total, next_question))]
+        update["current_question"] = next_question
+        return update
+
+    def judge_node(state: AgentState):
+        judgement = run_structured_judgement(state.get("feedback_report", []))
+        return {"final_rating": f"{judgement.rating}/10"}
+
+    def conclude_node(state: AgentState):
+        closing = "That concludes the interview. Thank you for your time! Your final performance report is below."
+        return {"messages": [AIMessage(content=closing)], "interview_finished": True}
+
+    def route(state: AgentState):
+        last_message = state["messages"][-1]
+        if state.get("interview_finished", False):
+            return END
+        if isinstance(last_message, HumanMessage):
+            if last_message.content == INIT_MESSAGE:
+                return "open"
+            return "judge" if state.get("question_number", 0) >= _total(state) else "turn"
+        return "judge" if state.get("question_number", 0) >= _total(state) else END
+
+    graph = StateGraph(AgentState)
+    for name, node in (("open", open_node), ("turn", turn_node), ("judge", judge_node), ("conclude", conclude_node)):
+        graph.add_node(name, telemetry.trace_node(name, interview_type, with_deadline(node)))
+    routes = {"open": "open", "turn": "turn", "judge": "judge", END: END}
+    graph.set_conditional_entry_point(route, routes)
+    # update_state() records the candidate's answer as if written by the last node that ran, so both route again
+    graph.add_conditional_edges("open", route, routes)
+    graph.add_conditional_edges("turn", route, routes)
+    graph.add_edge("judge", "conclude")
+    graph.add_edge("conclude", END)
+    return graph.compile(checkpointer=checkpointer)
+
+# --- Streaming ---
+def _content_text(content) -> str:
+    """Returns the text of a message's content, which may be a string or a list of content parts."""
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+
+# Nodes whose model output is addressed to the candidate (the Static fast path phrases questions in "ask")
+INTERVIEWER_NODES = ("interviewer", "ask")
+
+def stream_turn(graph, graph_input, config, budget: float = TURN_BUDGET_SECONDS):
+    """
+    Runs one turn of a compiled interview graph and yields events as they happen:
+    ("token", text) for interviewer tokens, ("message", AIMessage) once an interviewer message is complete,
+    ("tool_start", tool_name) when a tool is called and ("tool_end", tool_name) when it has returned.
+    The turn must finish within budget seconds; model calls that would run later fall back (see deadlines.py).
+    """
+    tool_names = {}
+    for mode, chunk in graph.stream(graph_input, turn_config(config, budget), stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            message, metadata = chunk
+            if metadata.get("langgraph_node") in INTERVIEWER_NODES and isinstance(message, AIMessageChunk):
+                text = _content_text(message.content)
+                if text:
+                    yield "token", text
+        elif mode == "updates":
+            for node, update in (chunk or {}).items():
+                for message in (update or {}).get("messages", []):
+                    if isinstance(message, AIMessage):
+                        yield "message", message
+                        for call in message.tool_calls:
+                            tool_names[call["id"]] = call["name"]
+                            yield "tool_start", call["name"]
+                    elif isinstance(message, ToolMessage):
+                        yield "tool_end", tool_names.get(message.tool_call_id, "tool")
@@ -0,0 +1,219 @@
+"""Incrementally maintained interview analytics. Rebuild from the results store with: python analytics.py --rebuild"""
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from storage import get_backend, parse_verdict, result_columns
+from question_bank import question_bank
+
+ANALYTICS_FILE = os.getenv("ANALYTICS_FILE", "analytics.json")
+ROLLING_WINDOW = int(os.getenv("ANALYTICS_ROLLING_WINDOW", "20"))  # Interviews in the rolling average
+# Journal entry ids remembered so a replayed entry is not counted twice
+APPLIED_IDS_KEPT = 1000
+
+VERDICT_KEYS = {"Correct": "correct", "Partially Correct": "partially_correct", "Incorrect": "incorrect"}
+_RATING_PATTERN = r"(\d+(?:\.\d+)?)\s*/\s*10"
+# Evaluation cells are "Question: q\n\nCandidate's Answer: a\n\nEvaluation: e", or without the answer when older
+_QUESTION_PATTERN = re.compile(r"^Question: (.*?)\n\n(?:Candidate's Answer|Evaluation): ", re.S)
+
+
+def parse_rating(final_rating) -> Optional[float]:
+    """'7/10' -> 7.0; None for missing or unparseable ratings."""
+    match = re.search(_RATING_PATTERN, str(final_rating)) if final_rating is not None else None
+    return float(match.group(1)) if match else None
+
+def verdict_key(verdict: str) -> str:
+    """Maps a verdict ('Partially Correct.', 'Incorrect', ...) to its counter name."""
+    verdict = (verdict or "").strip()
+    for label in sorted(VERDICT_KEYS, key=len, reverse=True):
+        if verdict.startswith(label):
+            return VERDICT_KEYS[label]
+    return "other"
+
+def question_key(question: str, interview_type: Optional[str]) -> Dict[str, str]:
+    """Bank questions are tracked one by one; generated questions are pooled per interview type."""
+    bank_question = question_bank.find_by_question(question) if question else None
+    if bank_question:
+        return {"key": f"bank:{bank_question['id']}", "question": bank_question["question"], "category": bank_question["category"]}
+    return {"key": f"generated:{interview_type or 'Unknown'}", "question": f"Generated questions ({interview_type or 'Unknown'})", "category": "Generated"}
+
+
+def _empty() -> dict:
+    return {"interviews": 0, "ratings": {}, "questions": {}, "applied_ids": [], "updated_at": None}
+
+
+class InterviewAnalytics:
+    """
+    Running aggregates over finished interviews, persisted to ANALYTICS_FILE after every update.
+    record() is fed by the results journal's compactor; summary() only reads the aggregates.
+    """
+
+    def __init__(self, path: str = ANALYTICS_FILE, window: int = ROLLING_WINDOW):
+        self.path = path
+        self.window = window
+        self._lock = threading.Lock()
+        self._data: Optional[dict] = None
+
+    # --- Persistence ---
+    def _load_locked(self) -> dict:
+        if self._data is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._data = _empty()
+        return self._data
+
+    def _save_locked(self) -> None:
+        self._data["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._data, f)
+        os.replace(tmp_path, self.path)
+
+    # --- Incremental updates ---
+    def _rating_bucket(self, data: dict, interview_type: str) -> dict:
+        return data["ratings"].setdefault(interview_type, {"count": 0, "sum": 0.0, "histogram": {}, "recent": []})
+
+    def record(self, entries: List[dict]) -> int:
+        """
+        Adds finished interviews (journal entries with username, final_rating, feedback_report and
+        interview_type). Entries already counted are skipped. Returns the number added.
+        """
+        with self._lock:
+            data = self._load_locked()
+            applied = deque(data["applied_ids"], maxlen=APPLIED_IDS_KEPT)
+            seen = set(applied)
+            added = 0
+            for entry in entries:
+                if entry.get("id") in seen:
+                    continue
+                interview_type = entry.get("interview_type") or "Unknown"
+                rating = parse_rating(entry.get("final_rating"))
+                if rating is not None:
+                    bucket = self._rating_bucket(data, interview_type)
+                    bucket["count"] += 1
+                    bucket["sum"] += rating
+                    label = str(int(round(rating)))
+                    bucket["histogram"][label] = bucket["histogram"].get(label, 0) + 1
+                    bucket["recent"] = (bucket["recent"] + [rating])[-self.window:]
+                for report in entry.get("feedback_report", []):
+                    verdict = report.get("verdict") or parse_verdict(report.get("evaluation", ""))
+                    key = question_key(report.get("question", ""), interview_type)
+                    stats = data["questions"].setdefault(key["key"], {"question": key["question"], "category": key["category"], "asked": 0})
+                    stats["asked"] += 1
+                    counter = verdict_key(verdict)
+                    stats[counter] = stats.get(counter, 0) + 1
+                data["interviews"] += 1
+                if entry.get("id"):
+                    applied.append(entry["id"])
+                    seen.add(entry["id"])
+                added += 1
+            if added:
+                data["applied_ids"] = list(applied)
+                self._save_locked()
+            return added
+
+    # --- Full rebuild ---
+    def rebuild(self, df: Optional[pd.DataFrame] = None) -> dict:
+        """Recomputes every aggregate from the results store (vectorized over the whole table)."""
+        df = get_backend().get_all_results() if df is None else df
+        data = _empty()
+        done = df[df["test_taken"].fillna(False).astype(bool)].copy()
+        done["interview_type"] = done["interview_type"].fillna("Unknown")
+
+        ratings = done.assign(rating=pd.to_numeric(done["final_rating"].astype(str).str.extract(_RATING_PATTERN)[0], errors="coerce"))
+        ratings = ratings.dropna(subset=["rating"])
+        for interview_type, group in ratings.groupby("interview_type"):
+            histogram = group["rating"].round().astype(int).astype(str).value_counts()
+            data["ratings"][interview_type] = {
+                "count": int(len(group)), "sum": float(group["rating"].sum()),
+                "histogram": {label: int(n) for label, n in histogram.items()},
+                # Store order stands in for completion order
+                "recent": group["rating"].tail(self.window).tolist(),
+            }
+
+        count = max([0] + [int(c.split("_")[1]) for c in done.columns if c.startswith("evaluation_")])
+        columns = [c for c in result_columns(count) if c in done.columns]
+        if columns and not done.empty:
+            long = pd.wide_to_long(
+                done[["username", "interview_type"] + columns].reset_index(drop=True).reset_index(),
+                stubnames=["answer", "evaluation"], i="index", j="question_index", sep="_",
+            ).dropna(subset=["evaluation"])
+            long["question"] = long["evaluation"].astype(str).str.extract(_QUESTION_PATTERN)[0]
+            # Cells saved before questions were stored have no question text; they still count as generated
+            long["verdict_key"] = long["answer"].fillna("").astype(str).map(verdict_key)
+            keys = {
+                (question, interview_type): question_key(question, interview_type)
+                for question, interview_type in long[["question", "interview_type"]].drop_duplicates().itertuples(index=False)
+                if isinstance(question, str)
+            }
+            long["key"] = [keys[(q, t)]["key"] if isinstance(q, str) else f"generated:{t}" for q, t in zip(long["question"], long["interview_type"])]
+            counts = long.groupby(["key", "verdict_key"]).size().unstack(fill_value=0)
+            labels = {k["key"]: k for k in keys.values()}
+            for key, row in counts.iterrows():
+                label = labels.get(key) or {"question": f"Generated questions ({key.split(':', 1)[1]})", "category": "Generated"}
+                stats = {"question": label["question"], "category": label["category"], "asked": int(row.sum())}
+                stats.update({counter: int(n) for counter, n in row.items() if n})
+                data["questions"][key] = stats
+
+        data["interviews"] = int(len(done))
+        with self._lock:
+            # Journal entries counted before are in the store too, so a replay must still skip them
+            data["applied_ids"] = self._load_locked()["applied_ids"]
+            self._data = data
+            self._save_locked()
+        return data
+
+    # --- Reads ---
+    def summary(self, hardest: int = 10, min_asked: int = 3) -> dict:
+        """Dashboard view of the aggregates: per-type rating stats and the questions with the lowest pass rate."""
+        with self._lock:
+            data = self._load_locked()
+            ratings = {
+                interview_type: {
+                    "count": r["count"],
+                    "average": r["sum"] / r["count"] if r["count"] else None,
+                    "rolling_average": sum(r["recent"]) / len(r["recent"]) if r["recent"] else None,
+                    "histogram": {str(i): r["histogram"].get(str(i), 0) for i in range(1, 11)},
+                }
+                for interview_type, r in sorted(data["ratings"].items())
+            }
+            questions = [
+                {**q, "pass_rate": q.get("correct", 0) / q["asked"]}
+                for q in data["questions"].values() if q["asked"] >= min_asked
+            ]
+            return {
+                "interviews": data["interviews"], "updated_at": data["updated_at"], "ratings": ratings,
+                "hardest_questions": sorted(questions, key=lambda q: q["pass_rate"])[:hardest],
+            }
+
+
+analytics = InterviewAnalytics()
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Interview analytics aggregates.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the aggregates from the results store.")
+    args = parser.parse_args(argv)
+    if args.rebuild:
+        start = time.perf_counter()
+        data = analytics.rebuild()
+        print(f"Rebuilt analytics from {data['interviews']} interviews in {time.perf_counter() - start:.2f}s -> {analytics.path}")
+    summary = analytics.summary()
+    for interview_type, r in summary["ratings"].items():
+        average = f"{r['average']:.1f}" if r["average"] is not None else "n/a"
+        rolling = f"{r['rolling_average']:.1f}" if r["rolling_average"] is not None else "n/a"
+        print(f"{interview_type}: {r['count']} rated interviews, average {average}/10, last {analytics.window}: {rolling}/10")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
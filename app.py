@@ -1,40 +1,158 @@
 import streamlit as st
 import os
-import json
+import io
 import time
-import pandas as pd
-from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.memory import MemorySaver
+import statistics
+from collections import deque
 
-from agent import create_agent_graph, AgentState
+# Script runs start here; the time to the end of main() is recorded per run (see record_run_time)
+_RUN_STARTED = time.perf_counter()
+
+
+# --- Shared Resources ---
+# Built once per process with st.cache_resource and reused by every rerun and every session.
+# Heavy modules (LangGraph, LangChain, the Gemini client, numpy) are imported inside them, so the
+# login page renders without loading them. Session-specific state lives in the checkpointer, keyed
+# by the session's thread_id.
+@st.cache_resource
+def load_environment() -> bool:
+    """Loads .env once, before the modules below read their settings from the environment."""
+    from dotenv import load_dotenv
+    return load_dotenv()
+
+load_environment()
+
+from telemetry import telemetry
 from excel_handler import (
     initialize_excel_file,
     validate_user,
     save_interview_results,
-    get_all_results,
-    EXCEL_FILE
+    list_users,
+    count_users,
+    get_user_results,
+    roster_changes_from_editor,
+    validate_roster_changes,
+    apply_roster_changes,
+    export_results_to_excel,
+    get_user_cache_stats,
+    get_analytics_summary,
 )
 
 # --- Configuration and Initialization ---
-load_dotenv()
 CHAT_KEY = os.getenv("GOOGLE_API_KEY")
-CHAT_MODEL = os.getenv("CHAT_MODEL", "gemini-2.0-flash")
+ADMIN_PAGE_SIZES = [25, 50, 100, 250]
 
-llm = None
-if CHAT_KEY:
-    llm = ChatGoogleGenerativeAI(model=CHAT_MODEL, google_api_key=CHAT_KEY, temperature=0.7)
-else:
-    st.error("LLM configuration missing. Please set GOOGLE_API_KEY in your .env file.")
-
-def load_questions():
-    try:
-        with open("questions.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-interview_questions = load_questions()
+@st.cache_resource
+def start_services() -> bool:
+    """Initializes the results store and starts the metrics exporter once per process."""
+    initialize_excel_file()
+    telemetry.start()
+    return True
+
+@st.cache_resource
+def get_llm():
+    from llm_registry import llm_registry
+    # The interviewer runs on the orchestrator's route (FAST_MODEL when set); see model_config.py
+    return llm_registry.shared("orchestrator")
+
+@st.cache_resource
+def get_checkpointer():
+    from checkpointing import create_checkpointer
+    from session_manager import session_manager
+    checkpointer = create_checkpointer()
+    # Idle interview threads are archived and dropped from the checkpointer (see session_manager.py)
+    session_manager.bind(checkpointer)
+    session_manager.start()
+    return checkpointer
+
+@st.cache_resource
+def get_question_bank():
+    from question_bank import question_bank
+    question_bank.count()  # Builds the in-memory index (compiling questions.db if the JSON changed)
+    return question_bank
+
+@st.cache_resource
+def get_graph(interview_type: str):
+    """The compiled graph for an interview type, shared by all sessions (each session is a checkpointer thread)."""
+    from agent import create_agent_graph
+    return create_agent_graph(get_llm(), checkpointer=get_checkpointer(), interview_type=interview_type)
+
+@st.cache_resource
+def run_timings() -> dict:
+    return {"runs": 0, "cold_ms": None, "rerun_ms": deque(maxlen=500)}
+
+def record_run_time():
+    """Records this script run's duration: the first run in the process is the cold start, the rest are reruns."""
+    elapsed = time.perf_counter() - _RUN_STARTED
+    timings = run_timings()
+    kind = "cold" if timings["runs"] == 0 else "warm"
+    if kind == "cold":
+        timings["cold_ms"] = elapsed * 1000
+    else:
+        timings["rerun_ms"].append(elapsed * 1000)
+    timings["runs"] += 1
+    telemetry.observe("app_script_seconds", elapsed, run=kind)
+
+
+TOOL_PROGRESS_LABELS = {
+    "ask_static_question": "Picking the next question...",
+    "generate_dynamic_question": "Writing the next question...",
+    "generate_hybrid_question": "Writing the next question...",
+    "evaluate_candidate_answer": "Evaluating your answer...",
+    "judge_interview_performance": "Preparing your final rating...",
+    "conclude_interview": "Wrapping up the interview...",
+}
+
+def run_streaming_turn(graph_input):
+    """Runs one agent turn, rendering interviewer tokens and tool progress in the chat as they arrive."""
+    with st.chat_message("ai"):
+        status = st.status("Thinking...", expanded=False)
+        placeholder = st.empty()
+        text = ""
+        from agent import stream_turn
+        graph = get_graph(st.session_state.get("interview_type", "Static"))
+        for event, payload in stream_turn(graph, graph_input, st.session_state.thread_config):
+            if event == "token":
+                text += payload
+                placeholder.markdown(text + "▌")
+            elif event == "message":
+                # The interviewer message is complete; keep it and start a fresh placeholder for the next one
+                if not payload.tool_calls and payload.content:
+                    # The final message wins over streamed tokens (a call abandoned at the deadline may have streamed some)
+                    placeholder.markdown(payload.content if isinstance(payload.content, str) else text)
+                    placeholder = st.empty()
+                else:
+                    placeholder.empty()
+                text = ""
+            elif event == "tool_start":
+                status.update(label=TOOL_PROGRESS_LABELS.get(payload, "Working..."))
+            elif event == "tool_end":
+                status.write(f"Finished: {TOOL_PROGRESS_LABELS.get(payload, payload)}")
+        status.update(label="Done", state="complete")
+
+def visible_messages(thread_config, messages):
+    """
+    The (role, content) chat bubbles of a thread. The graph only ever appends messages, so the list
+    is cached in the session and extended with the messages added since the previous rerun.
+    """
+    from langchain_core.messages import AIMessage, HumanMessage
+    from prompts import INIT_MESSAGE
+
+    thread_id = thread_config["configurable"]["thread_id"]
+    cache = st.session_state.get("render_cache")
+    seen = cache["seen"] if cache else 0
+    # Start over on a new thread or if the history was rewritten under the cache
+    if not cache or cache["thread_id"] != thread_id or len(messages) < seen or (seen and messages[seen - 1].content != cache["last_content"]):
+        cache = {"thread_id": thread_id, "seen": 0, "last_content": None, "visible": []}
+    for message in messages[cache["seen"]:]:
+        if isinstance(message, HumanMessage) and message.content != INIT_MESSAGE:
+            cache["visible"].append(("human", message.content))
+        elif isinstance(message, AIMessage) and not message.tool_calls and message.content:
+            cache["visible"].append(("ai", message.content))
+    if messages:
+        cache["seen"], cache["last_content"] = len(messages), messages[-1].content
+    st.session_state.render_cache = cache
+    return cache["visible"]
 
 # --- App Pages ---
 def show_login_page():
@@ -73,64 +191,132 @@ def show_login_page():
                 st.error("Invalid admin credentials.")
 
 def show_admin_dashboard():
+    from llm_gateway import llm_gateway
+    from model_config import model_router
+    from eval_cache import evaluation_cache
+    from checkpointing import checkpoint_timings
+    from dedup import duplicate_filter
+    from session_manager import session_manager
+
     st.header("Admin Dashboard: Interview Results & User Management")
     st.write("View results, manage users, and configure interview settings.")
 
-    results_df = get_all_results()
-    if not results_df.empty:
-        st.info("You can add/delete users and change settings for anyone who has not taken the test. Usernames for completed interviews cannot be changed.")
-        
-        edited_df = st.data_editor(
-            results_df,
-            column_config={
-                "username": st.column_config.TextColumn(
-                    "Username", help="The candidate's unique username.", required=True,
-                ),
-                "interview_type": st.column_config.SelectboxColumn(
-                    "Interview Type", options=["Static", "Dynamic", "Hybrid"], required=True,
-                ),
-                "num_questions": st.column_config.NumberColumn(
-                    "Number of Questions", help="Set number of questions for Dynamic/Hybrid interviews (e.g., 5). Leave empty for Static.", min_value=1, max_value=10, step=1,
-                ),
-                "test_taken": st.column_config.CheckboxColumn("Test Taken?", disabled=True),
-                "final_rating": st.column_config.TextColumn("Final Rating", disabled=True),
-            },
-            disabled=[col for col in results_df.columns if "answer_" in col or "evaluation_" in col or col in ["test_taken", "final_rating"]],
-            num_rows="dynamic"
+    # --- Filters and paging (applied by the storage backend, only the visible page is loaded) ---
+    filter_cols = st.columns([3, 2, 2, 1])
+    search = filter_cols[0].text_input("Search username")
+    type_filter = filter_cols[1].selectbox("Interview type", ["All", "Static", "Dynamic", "Hybrid"])
+    status_filter = filter_cols[2].selectbox("Status", ["All", "Pending", "Completed"])
+    page_size = filter_cols[3].selectbox("Rows", ADMIN_PAGE_SIZES)
+    filters = {
+        "search": search.strip() or None,
+        "interview_type": None if type_filter == "All" else type_filter,
+        "test_taken": None if status_filter == "All" else status_filter == "Completed",
+    }
+    total = count_users(**filters)
+    page_count = max(1, -(-total // page_size))
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1) - 1
+    page_df = list_users(page, page_size, **filters)
+    st.caption(f"{total} matching users, showing {len(page_df)}.")
+
+    st.info("You can add/delete users and change settings for anyone who has not taken the test. Usernames for completed interviews cannot be changed.")
+    # A new key per page/filter discards unsaved edits from another view instead of applying them to the wrong rows
+    editor_key = f"roster_editor_{page}_{page_size}_{filters['search']}_{type_filter}_{status_filter}"
+    st.data_editor(
+        page_df,
+        key=editor_key,
+        column_config={
+            "username": st.column_config.TextColumn(
+                "Username", help="The candidate's unique username.", required=True,
+            ),
+            "interview_type": st.column_config.SelectboxColumn(
+                "Interview Type", options=["Static", "Dynamic", "Hybrid"], required=True,
+            ),
+            "num_questions": st.column_config.NumberColumn(
+                "Number of Questions", help="Set number of questions for Dynamic/Hybrid interviews (e.g., 5). Leave empty for Static.", min_value=1, max_value=10, step=1,
+            ),
+            "test_taken": st.column_config.CheckboxColumn("Test Taken?", disabled=True),
+            "final_rating": st.column_config.TextColumn("Final Rating", disabled=True),
+        },
+        disabled=["test_taken", "final_rating"],
+        hide_index=True,
+        num_rows="dynamic"
+    )
+
+    if st.button("Save Changes"):
+        try:
+            changes = roster_changes_from_editor(page_df, st.session_state.get(editor_key, {}))
+            errors = validate_roster_changes(changes)
+            for error in errors:
+                st.error(f"Error: {error}")
+            if not errors:
+                apply_roster_changes(changes)
+                st.success(f"Changes saved successfully! ({len(changes['updates'])} updated, {len(changes['added'])} added, {len(changes['deleted'])} deleted)")
+                del st.session_state[editor_key]
+                st.rerun()
+        except Exception as e:
+            st.error(f"Failed to save changes: {e}")
+
+    # --- Evaluations, fetched for one candidate at a time ---
+    completed = page_df.loc[page_df["test_taken"].fillna(False).astype(bool), "username"].tolist()
+    if completed:
+        selected = st.selectbox("View evaluations for", ["-"] + completed)
+        if selected != "-":
+            for result in get_user_results(selected):
+                with st.expander(f"Question {result['index']}: {result['answer'] or 'N/A'}"):
+                    st.markdown(result["evaluation"] or "_No evaluation stored._")
+
+    # --- Analytics (precomputed aggregates, see analytics.py) ---
+    summary = get_analytics_summary()
+    if summary["ratings"]:
+        st.subheader("Interview Analytics")
+        type_cols = st.columns(len(summary["ratings"]))
+        for col, (interview_type, r) in zip(type_cols, summary["ratings"].items()):
+            col.metric(
+                f"{interview_type}: {r['count']} rated", f"{r['average']:.1f}/10",
+                delta=f"{r['rolling_average'] - r['average']:+.1f} recent", help="Average rating; the delta compares the most recent interviews with the overall average.",
+            )
+        st.bar_chart({t: r["histogram"] for t, r in summary["ratings"].items()})
+        if summary["hardest_questions"]:
+            st.caption("Lowest pass rates (share of Correct verdicts):")
+            st.dataframe(
+                [{"Question": q["question"], "Category": q["category"], "Asked": q["asked"], "Pass rate": f"{q['pass_rate']:.0%}"} for q in summary["hardest_questions"]],
+                hide_index=True,
+            )
+        st.caption(f"Analytics over {summary['interviews']} interviews, updated {summary['updated_at']}. Run `python analytics.py --rebuild` after importing results.")
+
+    # The workbook is a report generated on demand, not the live store
+    if st.button("Export Excel Report"):
+        report = io.BytesIO()
+        export_results_to_excel(report)
+        st.download_button(
+            "Download Report", data=report.getvalue(), file_name="interview_results.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
 
-        if st.button("Save Changes"):
-            try:
-                original_df = get_all_results()
-                validation_error = False
-
-                for index, edited_row in edited_df.iterrows():
-                    if index in original_df.index:
-                        original_row = original_df.loc[index]
-                        if original_row['test_taken'] == True and original_row['username'] != edited_row['username']:
-                            st.error(f"Error: Cannot rename user '{original_row['username']}' because they have already completed the interview.")
-                            validation_error = True
-                            break
-                
-                if not validation_error and edited_df['username'].duplicated().any():
-                    st.error("Error: Usernames must be unique. Please resolve duplicate entries before saving.")
-                    validation_error = True
-                
-                if not validation_error and edited_df['username'].isnull().any():
-                    st.error("Error: Username cannot be empty. Please enter a username for all users.")
-                    validation_error = True
-
-                if not validation_error:
-                    edited_df['num_questions'] = pd.to_numeric(edited_df['num_questions'], errors='coerce').astype('Int64')
-                    edited_df.to_excel(EXCEL_FILE, index=False)
-                    st.success("Changes saved successfully!")
-                    st.rerun()
-
-            except Exception as e:
-                st.error(f"Failed to save changes: {e}")
-
-    else:
-        st.info("No interview results found. The file might be empty.")
+    checkpoint_stats = checkpoint_timings.stats()
+    if checkpoint_stats:
+        st.caption("Checkpoints: " + ", ".join(f"{op} {v['count']}x avg {v['avg_ms']:.1f} ms (max {v['max_ms']:.1f} ms)" for op, v in checkpoint_stats.items()))
+    cache_stats = get_user_cache_stats()
+    st.caption(f"User cache: {cache_stats['users']} users, {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['reloads']} reloads.")
+    eval_stats = evaluation_cache.stats()
+    st.caption(f"Evaluation cache: {eval_stats['entries']} entries, {eval_stats['hit_rate']:.0%} hit rate ({eval_stats['memory_hits']} memory / {eval_stats['disk_hits']} disk hits, {eval_stats['misses']} misses).")
+    gateway_stats = llm_gateway.stats()
+    st.caption(f"LLM gateway: {gateway_stats['calls']} calls, {gateway_stats['retries']} retries, {gateway_stats['failures']} failures, {gateway_stats['in_flight']} in flight, {gateway_stats['queue_depth']} queued, concurrency limit {gateway_stats['concurrency_limit']}.")
+    role_stats = model_router.stats()
+    if role_stats:
+        st.caption("Models: " + "; ".join(
+            f"{role} {r['model']} {r['calls']} calls, p50 {r['p50_ms']:.0f} ms / p95 {r['p95_ms']:.0f} ms, {r['input_tokens']} in / {r['output_tokens']} out tokens"
+            for role, r in role_stats.items()) + ".")
+    dedup_stats = duplicate_filter.stats()
+    st.caption(f"Question dedup: {dedup_stats['checks']} generated questions checked, {dedup_stats['rejections']} near-duplicates regenerated ({dedup_stats['rejection_rate']:.0%}), retry budget exhausted {dedup_stats['exhausted']} times.")
+    session_stats = session_manager.stats()
+    rss_text = f", resident memory {session_stats['rss_mb']:.0f} MB" if session_stats["rss_mb"] else ""
+    st.caption(f"Interview sessions: {session_stats['live']} live, {session_stats['evictions']} evicted, {session_stats['restores']} restored{rss_text}.")
+    timings = run_timings()
+    if timings["cold_ms"] is not None:
+        reruns = sorted(timings["rerun_ms"])
+        rerun_text = f", reruns p50 {statistics.median(reruns):.1f} ms / p95 {reruns[int(0.95 * (len(reruns) - 1))]:.1f} ms over {len(reruns)} runs" if reruns else ""
+        st.caption(f"App: cold start {timings['cold_ms']:.0f} ms{rerun_text}.")
 
     if st.button("Logout"):
         for key in list(st.session_state.keys()):
@@ -138,40 +324,66 @@ def show_admin_dashboard():
         st.rerun()
 
 def show_interview_page():
+    from langchain_core.messages import HumanMessage
+    from prompts import INIT_MESSAGE
+    from session_manager import session_manager
+
     interview_type = st.session_state.get("interview_type", "Static")
     st.subheader(f"Mode: {interview_type} Interview")
-
-    if "agent" not in st.session_state:
+    graph = get_graph(interview_type)
+    checkpointer = get_checkpointer()
+
+    if "resume_checked" not in st.session_state:
+        st.session_state.resume_checked = True
+        # Resume an interview that was interrupted (e.g. by a worker restart) when the checkpointer is persistent
+        resume_thread_id = session_manager.find_thread(st.session_state.username)
+        if resume_thread_id and resume_thread_id.startswith(f"interview-{interview_type}-"):
+            session_manager.touch(resume_thread_id, st.session_state.username, interview_type)
+            resume_config = {"configurable": {"thread_id": resume_thread_id}}
+            resume_state = graph.get_state(resume_config)
+            if resume_state and resume_state.values.get("messages"):
+                st.session_state.thread_config = resume_config
+                st.session_state.processing = False
+                st.info("Resuming your interview where you left off.")
+
+    if "thread_config" not in st.session_state:
         thread_id = f"interview-{interview_type}-{st.session_state.username}-{int(time.time())}"
         st.session_state.thread_config = {"configurable": {"thread_id": thread_id}}
-
-        memory = MemorySaver()
-        st.session_state.agent = create_agent_graph(llm, checkpointer=memory, interview_type=interview_type)
-        
-        initial_state: AgentState = {
-            "messages": [HumanMessage(content="INITIALIZE_INTERVIEW_AGENT")],
-            "interview_questions": interview_questions if interview_type in ["Static", "Hybrid"] else [],
+        checkpointer.register_thread(st.session_state.username, thread_id, interview_type)
+        session_manager.touch(thread_id, st.session_state.username, interview_type)
+
+        # Each candidate gets their own stratified sample of the bank (the same one again if they restart)
+        interview_questions = []
+        if interview_type in ["Static", "Hybrid"]:
+            interview_questions = get_question_bank().sample(st.session_state.get("num_questions"), seed=st.session_state.username)
+        initial_state = {
+            "messages": [HumanMessage(content=INIT_MESSAGE)],
+            "interview_questions": interview_questions,
             "question_number": 0, "feedback_report": [], "interview_finished": False,
             "user_name": st.session_state.username, "interview_type": interview_type,
             "current_question": "", "final_rating": None,
             "num_questions_to_ask": st.session_state.get("num_questions")
         }
-        with st.spinner(f"Initializing {interview_type} interview..."):
-            st.session_state.agent.invoke(initial_state, st.session_state.thread_config)
+        run_streaming_turn(initial_state)
         st.session_state.processing = False
+        st.rerun()
 
     if "processing" not in st.session_state:
         st.session_state.processing = False
 
-    history = st.session_state.agent.get_state(st.session_state.thread_config)
+    # Marks the session active; a thread evicted while the tab sat idle is restored from the archive here
+    session_manager.touch(st.session_state.thread_config["configurable"]["thread_id"], st.session_state.username, interview_type)
+
+    # The one state fetch of this rerun: a turn always ends in st.rerun(), so it cannot go stale below
+    history = graph.get_state(st.session_state.thread_config)
     if not history:
         st.rerun()
 
-    # --- NEW: Progress Bar Logic ---
+    # --- Progress Bar ---
     interview_is_finished = history.values.get("interview_finished", False)
     if not interview_is_finished:
         if interview_type == "Static":
-            total_questions = len(interview_questions)
+            total_questions = len(history.values.get("interview_questions", []))
         else:
             total_questions = st.session_state.get("num_questions", 5)
 
@@ -185,36 +397,42 @@ def show_interview_page():
             st.markdown("---")
     # --- End of Progress Bar Logic ---
 
-    for message in history.values['messages']:
-        if isinstance(message, (SystemMessage, ToolMessage)) or (isinstance(message, HumanMessage) and message.content == "INITIALIZE_INTERVIEW_AGENT"):
-            continue
-        if isinstance(message, HumanMessage):
-            with st.chat_message("human"): st.markdown(message.content)
-        elif isinstance(message, AIMessage) and not message.tool_calls and message.content:
-            with st.chat_message("ai"): st.markdown(message.content)
+    for role, content in visible_messages(st.session_state.thread_config, history.values.get("messages", [])):
+        with st.chat_message(role): st.markdown(content)
 
     if not interview_is_finished:
         if prompt := st.chat_input("Your answer...", disabled=st.session_state.processing):
             st.session_state.processing = True
-            st.session_state.agent.update_state(st.session_state.thread_config, {"messages": [HumanMessage(content=prompt)]})
+            graph.update_state(st.session_state.thread_config, {"messages": [HumanMessage(content=prompt)]})
             st.rerun()
 
     if st.session_state.processing:
-        with st.spinner("Thinking..."):
-            st.session_state.agent.invoke(None, st.session_state.thread_config)
+        run_streaming_turn(None)
         st.session_state.processing = False
         st.rerun()
 
-    final_state = st.session_state.agent.get_state(st.session_state.thread_config)
-    if final_state and final_state.values.get("interview_finished", False):
+    if interview_is_finished:
         st.markdown("---")
         st.header("Final Performance Report")
 
-        final_rating = final_state.values.get("final_rating")
+        if "final_report" not in st.session_state:
+            from agent import heuristic_rating
+            from deadlines import TURN_BUDGET_SECONDS, resolved_feedback
+            # Answers whose grading was deferred past their turn's latency budget are filled in before saving
+            with st.spinner("Finishing the evaluation of your answers..."):
+                feedback_data = resolved_feedback(st.session_state.thread_config["configurable"]["thread_id"], history.values["feedback_report"], wait=TURN_BUDGET_SECONDS)
+            final_rating = history.values.get("final_rating")
+            degraded = {d["kind"] for d in history.values.get("degradations", [])}
+            if "heuristic_rating" in degraded:
+                final_rating = f"{heuristic_rating(feedback_data)}/10"
+            st.session_state.final_report = (feedback_data, final_rating, degraded)
+        feedback_data, final_rating, degraded = st.session_state.final_report
+
         if final_rating:
             st.metric(label="**Final Interview Score**", value=final_rating)
+        if "heuristic_rating" in degraded:
+            st.caption("The final judgement took too long, so this score is estimated from the per-question verdicts.")
         
-        feedback_data = final_state.values["feedback_report"]
         for item in feedback_data:
             with st.expander(label=f"**{item.get('question', 'Unknown Question')}**"):
                 st.markdown(f"**Your Answer:**\n{item.get('user_answer', 'N/A')}")
@@ -222,11 +440,20 @@ def show_interview_page():
                 st.markdown(f"**Evaluation:**\n{item.get('evaluation', 'No evaluation found.')}")
 
         if "results_saved" not in st.session_state:
-            save_interview_results(st.session_state.username, feedback_data, final_rating)
-            st.session_state.results_saved = True
-            st.success("Your interview results have been saved.")
+            try:
+                save_interview_results(st.session_state.username, feedback_data, final_rating)
+                st.session_state.results_saved = True
+                from deadlines import deferred_evaluations
+                deferred_evaluations.forget(st.session_state.thread_config["configurable"]["thread_id"])
+                st.success("Your interview results have been saved.")
+            except Exception as e:
+                st.error(f"Failed to save your interview results: {e}")
 
         if st.button("Logout"):
+            # The interview is over and saved, so its checkpoints are no longer needed for resuming
+            if st.session_state.get("results_saved"):
+                checkpointer.delete_thread(st.session_state.thread_config["configurable"]["thread_id"])
+                session_manager.end(st.session_state.thread_config["configurable"]["thread_id"])
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.rerun()
@@ -235,20 +462,26 @@ def main():
     st.set_page_config(page_title="AI Excel Interviewer", page_icon="🤖", layout="wide")
     st.title("AI-Powered Excel Interviewer")
 
-    initialize_excel_file()
+    start_services()
 
     if "logged_in" not in st.session_state:
         st.session_state.logged_in = False
 
     if not st.session_state.logged_in:
+        if not CHAT_KEY:
+            st.error("LLM configuration missing. Please set GOOGLE_API_KEY in your .env file.")
         show_login_page()
     elif st.session_state.get("role") == "admin":
         show_admin_dashboard()
     elif st.session_state.get("role") == "user":
-        if not llm:
+        if not CHAT_KEY:
             st.warning("The interview system is not configured. Please contact an administrator.")
             st.stop()
         show_interview_page()
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        # st.rerun() and st.stop() end a run by raising, so record it either way
+        record_run_time()
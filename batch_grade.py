@@ -0,0 +1,197 @@
+"""
+Offline batch grading.
+
+Re-runs the evaluation and final judging logic from agent.py over archived interviews, e.g. after
+changing STATIC_EVALUATION_PROMPT_TEMPLATE or FINAL_JUDGING_PROMPT_TEMPLATE:
+
+    python batch_grade.py --input interviews.jsonl --output regraded.jsonl --workers 8 --rate 5
+    python batch_grade.py --workbook user_credential_and_analysis.xlsx --output regraded.jsonl
+
+Input JSONL has one interview per line:
+    {"id": "...", "username": "...", "interview_type": "Static", "answers": [{"question": "...", "user_answer": "..."}]}
+("feedback_report" is accepted in place of "answers"). Results are streamed to the output file, one
+line per interview, and interviews already graded there are skipped, so an interrupted batch resumes.
+"""
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from storage import EXCEL_FILE, parse_report_entry
+from question_bank import question_bank
+from prompts import EVALUATION_PROMPT_VERSION
+from llm_registry import llm_registry
+from llm_gateway import llm_gateway, priority_class, BATCH
+from agent import run_evaluation, run_judgement, parse_final_rating, _parse_verdict
+
+
+# --- Input ---
+def _normalize(record: dict, default_id: str) -> dict:
+    answers = record.get("answers") or record.get("feedback_report") or []
+    return {
+        "id": str(record.get("id") or record.get("username") or default_id),
+        "username": record.get("username"),
+        "interview_type": record.get("interview_type", "Static"),
+        "answers": [
+            {"question": a["question"], "user_answer": a.get("user_answer", a.get("answer", "")), "expected_concepts": a.get("expected_concepts")}
+            for a in answers
+        ],
+    }
+
+
+def load_jsonl(path: str) -> List[dict]:
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                records.append(_normalize(json.loads(line), f"line-{line_number}"))
+    return records
+
+
+def load_workbook(path: str) -> Tuple[List[dict], int]:
+    """
+    Reads finished interviews from a results workbook (the live Excel store or an exported report).
+    Rows whose cells predate stored candidate answers cannot be re-graded; their count is returned.
+    """
+    df = pd.read_excel(path)
+    records, skipped = [], 0
+    for _, row in df.iterrows():
+        if not row.get("test_taken") or pd.isna(row.get("test_taken")):
+            continue
+        answers, i = [], 1
+        while f"evaluation_{i}" in df.columns:
+            if not pd.isna(row[f"evaluation_{i}"]):
+                entry = parse_report_entry(row[f"evaluation_{i}"])
+                if entry is None or entry["user_answer"] is None:
+                    answers = None
+                    break
+                answers.append({"question": entry["question"], "user_answer": entry["user_answer"]})
+            i += 1
+        if not answers:
+            skipped += 1
+            continue
+        records.append(_normalize({"username": row["username"], "interview_type": row.get("interview_type", "Static"), "answers": answers}, str(row["username"])))
+    return records, skipped
+
+
+def load_done(output_path: str) -> Set[str]:
+    """Ids that already have a successful result in the output file. A torn last line (from a crash) is cut off."""
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[:data.rfind(b"\n") + 1]
+    for line in data.decode("utf-8").splitlines():
+        try:
+            result = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if "error" not in result:
+            done.add(result["id"])
+    return done
+
+
+# --- Grading ---
+def _expected_concepts(answer: dict) -> str:
+    if answer.get("expected_concepts"):
+        return answer["expected_concepts"]
+    bank_question = question_bank.find_by_question(answer["question"])
+    return bank_question["expected_concepts"] if bank_question else ""
+
+
+def grade_record(record: dict, use_cache: bool = True, judge: bool = True) -> dict:
+    """Evaluates every answer of one interview in order, then judges the whole interview."""
+    with priority_class(BATCH):
+        return _grade_record(record, use_cache, judge)
+
+
+def _grade_record(record: dict, use_cache: bool, judge: bool) -> dict:
+    feedback_report = []
+    for answer in record["answers"]:
+        concepts = _expected_concepts(answer)
+        evaluation = run_evaluation(record["interview_type"], answer["question"], answer["user_answer"], concepts, use_cache=use_cache)
+        feedback_report.append({"question": answer["question"], "user_answer": answer["user_answer"], "evaluation": evaluation, "verdict": _parse_verdict(evaluation)})
+    result = {
+        "id": record["id"], "username": record["username"], "interview_type": record["interview_type"],
+        "prompt_version": EVALUATION_PROMPT_VERSION, "evaluations": feedback_report,
+    }
+    if judge and feedback_report:
+        result["judgement"] = run_judgement(feedback_report)
+        result["final_rating"] = parse_final_rating(result["judgement"])
+    result["graded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return result
+
+
+def run_batch(records: List[dict], output_path: str, workers: int, rate: float, use_cache: bool = True, judge: bool = True) -> Dict[str, float]:
+    """Grades records with a bounded worker pool and appends each result to output_path as soon as it is done."""
+    done = load_done(output_path)
+    pending = [r for r in records if r["id"] not in done]
+    print(f"{len(records)} interviews, {len(records) - len(pending)} already graded, {len(pending)} to grade with {workers} workers")
+    if rate > 0:
+        llm_gateway.configure(rate=rate)
+    graded = failed = 0
+    start = time.perf_counter()
+
+    with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-grade") as executor:
+        futures = {executor.submit(grade_record, r, use_cache, judge): r for r in pending}
+        for future in as_completed(futures):
+            record = futures[future]
+            try:
+                result = future.result()
+                graded += 1
+            except Exception as e:
+                result = {"id": record["id"], "username": record["username"], "error": f"{type(e).__name__}: {e}"}
+                failed += 1
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            if (graded + failed) % 10 == 0 or graded + failed == len(pending):
+                elapsed = time.perf_counter() - start
+                print(f"  {graded + failed}/{len(pending)} done ({failed} failed), {(graded + failed) / elapsed:.2f} interviews/s")
+
+    elapsed = time.perf_counter() - start
+    return {"graded": graded, "failed": failed, "skipped": len(records) - len(pending), "seconds": round(elapsed, 3),
+            "interviews_per_second": round(graded / elapsed, 3) if elapsed and graded else 0.0}
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(description="Re-grade archived interviews offline.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="JSONL file with one interview per line.")
+    source.add_argument("--workbook", nargs="?", const=EXCEL_FILE, help=f"Results workbook (default {EXCEL_FILE}).")
+    parser.add_argument("--output", required=True, help="JSONL file results are appended to; also the resume checkpoint.")
+    parser.add_argument("--workers", type=int, default=4, help="Interviews graded in parallel.")
+    parser.add_argument("--rate", type=float, default=0.0, help="Maximum LLM calls per second for the process (0 = keep LLM_RATE_PER_SECOND).")
+    parser.add_argument("--restart", action="store_true", help="Discard previous results in --output instead of resuming.")
+    parser.add_argument("--no-cache", action="store_true", help="Call the evaluator for every answer instead of reusing cached evaluations (editing a prompt already invalidates them).")
+    parser.add_argument("--no-judge", action="store_true", help="Only re-run the per-answer evaluations.")
+    parser.add_argument("--fake-latency-ms", type=float, default=None, help="Use the offline fake models with this latency (dry runs).")
+    args = parser.parse_args(argv)
+
+    if args.fake_latency_ms is not None:
+        from fake_llm import fake_client_factory
+        llm_registry.set_factory(fake_client_factory(latency=args.fake_latency_ms / 1000))
+
+    if args.input:
+        records = load_jsonl(args.input)
+    else:
+        records, skipped = load_workbook(args.workbook)
+        if skipped:
+            print(f"Skipped {skipped} workbook rows saved before candidate answers were stored; they cannot be re-graded.")
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+
+    summary = run_batch(records, args.output, max(1, args.workers), args.rate, use_cache=not args.no_cache, judge=not args.no_judge)
+    print(f"Graded {summary['graded']} interviews ({summary['failed']} failed, {summary['skipped']} already done) "
+          f"in {summary['seconds']:.1f}s, {summary['interviews_per_second']:.2f} interviews/s")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
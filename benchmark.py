@@ -0,0 +1,284 @@
+"""
+Offline benchmark for the interview graph.
+
+Runs complete interviews for each interview type against the scripted fake models in fake_llm.py
+(no network, no API key) and writes per-mode costs to a JSON file so runs can be compared between commits:
+
+    python benchmark.py --interviews 5 --output benchmark_results.json
+"""
+import io
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import subprocess
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage
+
+from fake_llm import call_log, fake_client_factory, fake_interviewer
+from llm_registry import llm_registry
+from llm_gateway import llm_gateway
+from eval_cache import evaluation_cache
+from checkpointing import create_checkpointer, checkpoint_timings
+from agent import create_agent_graph
+from deadlines import turn_config
+from model_config import model_router
+from question_bank import question_bank
+from prompts import INIT_MESSAGE
+
+INTERVIEW_TYPES = ["Static", "Dynamic", "Hybrid"]
+
+# Synthetic candidate answers: strong, partial and "don't know" answers, repeated across candidates
+ANSWER_CORPUS = [
+    "A relative reference like A1 shifts when the formula is copied, an absolute reference like $A$1 never changes, "
+    "and a mixed reference like $A1 or A$1 locks only the column or the row. I would use mixed references to build a multiplication table.",
+    "I would use INDEX with MATCH, or XLOOKUP in newer versions, because it can look to the left and does not break when columns are inserted.",
+    "I'm not sure, I haven't used that feature.",
+    "I would create a PivotTable from the data, put Region in rows and Sales in values, then add a slicer for the year so managers can filter it.",
+    "Use conditional formatting.",
+    "I don't know.",
+    "I would use Data Validation with a named range per region and INDIRECT to point the second dropdown at the range matching the first selection.",
+]
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Collects wall time per graph node from LangGraph's callback events."""
+
+    def __init__(self):
+        self._started: Dict[object, tuple] = {}
+        self.timings: Dict[str, List[float]] = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Node runs carry a graph:step tag; runs nested inside a node (tools, models) do not
+        if node and kwargs.get("name") == node and any(tag.startswith("graph:step") for tag in tags or []):
+            self._started[run_id] = (node, time.perf_counter())
+
+    def _finish(self, run_id) -> None:
+        started = self._started.pop(run_id, None)
+        if started:
+            self.timings.setdefault(started[0], []).append(time.perf_counter() - started[1])
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _summary_ms(values: List[float]) -> dict:
+    return {
+        "count": len(values),
+        "total_ms": round(sum(values) * 1000, 3),
+        "mean_ms": round(statistics.mean(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(_percentile(values, 50) * 1000, 3),
+        "p95_ms": round(_percentile(values, 95) * 1000, 3),
+        "p99_ms": round(_percentile(values, 99) * 1000, 3),
+        "max_ms": round(max(values) * 1000, 3) if values else 0.0,
+    }
+
+
+def _size_summary(calls: List[dict]) -> dict:
+    by_role: Dict[str, dict] = {}
+    for call in calls:
+        role = by_role.setdefault(call["role"], {"calls": 0, "prompt_chars": [], "response_chars": []})
+        role["calls"] += 1
+        role["prompt_chars"].append(call["prompt_chars"])
+        role["response_chars"].append(call["response_chars"])
+    return {
+        name: {
+            "calls": role["calls"],
+            "prompt_chars_mean": round(statistics.mean(role["prompt_chars"]), 1),
+            "prompt_chars_max": max(role["prompt_chars"]),
+            "response_chars_mean": round(statistics.mean(role["response_chars"]), 1),
+            "est_prompt_tokens_total": sum(role["prompt_chars"]) // 4,
+            "est_response_tokens_total": sum(role["response_chars"]) // 4,
+        }
+        for name, role in sorted(by_role.items())
+    }
+
+
+def _run_turn(graph, graph_input, config, use_async: bool, budget: float = 0.0):
+    config = turn_config(config, budget)
+    if use_async:
+        return asyncio.run(graph.ainvoke(graph_input, config))
+    return graph.invoke(graph_input, config)
+
+
+def run_interview(interview_type: str, candidate: int, num_questions: int, args, timer: NodeTimer,
+                  turn_times: Optional[List[float]] = None, structured_turns: bool = False) -> dict:
+    """Runs one interview to completion and returns its final state values. Answered-turn wall times are appended to turn_times."""
+    questions = question_bank.sample(num_questions, seed=f"candidate{candidate}") if interview_type in ["Static", "Hybrid"] else []
+    total = len(questions) if interview_type == "Static" else num_questions
+    interviewer = fake_interviewer(interview_type, total, latency=args.latency_ms / 1000, error_rate=args.error_rate,
+                                   slow_rate=args.slow_rate, slow_latency=args.slow_ms / 1000, model_latency=args.model_latency)
+    graph = create_agent_graph(
+        interviewer, checkpointer=create_checkpointer(args.checkpoint), interview_type=interview_type,
+        speculative=args.speculative, use_async=args.use_async, static_fast_path=args.static_fast_path,
+        structured_turns=structured_turns,
+    )
+    config = {"configurable": {"thread_id": f"benchmark-{interview_type}-{candidate}-{time.time_ns()}"}, "callbacks": [timer]}
+    initial_state = {
+        "messages": [HumanMessage(content=INIT_MESSAGE)],
+        "interview_questions": questions,
+        "question_number": 0, "feedback_report": [], "interview_finished": False,
+        "user_name": f"candidate{candidate}", "interview_type": interview_type,
+        "current_question": "", "final_rating": None, "num_questions_to_ask": num_questions,
+    }
+    budget = args.turn_budget_ms / 1000
+    _run_turn(graph, initial_state, config, args.use_async, budget)
+    for turn in range(total + 1):
+        state = graph.get_state(config).values
+        if state.get("interview_finished"):
+            break
+        answer = ANSWER_CORPUS[(candidate + turn) % len(ANSWER_CORPUS)]
+        graph.update_state(config, {"messages": [HumanMessage(content=answer)]})
+        start = time.perf_counter()
+        _run_turn(graph, None, config, args.use_async, budget)
+        if turn_times is not None:
+            turn_times.append(time.perf_counter() - start)
+    return graph.get_state(config).values
+
+
+def benchmark_mode(interview_type: str, args, structured_turns: bool = False) -> dict:
+    """Runs args.interviews interviews of one type and summarizes their cost."""
+    call_log.reset()
+    model_router.reset()
+    checkpoint_timings.reset()
+    cache_before = evaluation_cache.stats()
+    gateway_before = llm_gateway.stats()
+    timer = NodeTimer()
+    interview_times, turn_times, questions_asked, finished = [], [], 0, 0
+    degradations: Dict[str, int] = {}
+
+    tracemalloc.start()
+    for candidate in range(args.interviews):
+        start = time.perf_counter()
+        state = run_interview(interview_type, candidate, args.questions, args, timer, turn_times, structured_turns)
+        interview_times.append(time.perf_counter() - start)
+        questions_asked += len(state.get("feedback_report", []))
+        finished += bool(state.get("interview_finished"))
+        for degradation in state.get("degradations", []):
+            degradations[degradation["kind"]] = degradations.get(degradation["kind"], 0) + 1
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    calls = call_log.reset()
+    cache_after = evaluation_cache.stats()
+    checkpoints = checkpoint_timings.stats()
+    gateway_after = llm_gateway.stats()
+    return {
+        "interviews": args.interviews,
+        "finished": finished,
+        "questions_asked": questions_asked,
+        "llm_calls": len(calls),
+        "llm_calls_per_question": round(len(calls) / questions_asked, 3) if questions_asked else None,
+        "llm_calls_by_role": _size_summary(calls),
+        # Model, latency percentiles and tokens per role, as accounted by model_config.py
+        "model_routes": model_router.reset(),
+        "interview_wall_time": _summary_ms(interview_times),
+        # From submitting an answer to the next question (or the final report) being ready
+        "turn_wall_time": _summary_ms(turn_times),
+        "degradations": degradations,
+        "node_wall_time": {node: _summary_ms(values) for node, values in sorted(timer.timings.items())},
+        "checkpointer": {
+            "operations": checkpoints,
+            "total_ms": round(sum(op["total_ms"] for op in checkpoints.values()), 3),
+        },
+        "evaluation_cache_hits": (cache_after["memory_hits"] + cache_after["disk_hits"]) - (cache_before["memory_hits"] + cache_before["disk_hits"]),
+        "gateway": {key: gateway_after[key] - gateway_before[key] for key in ("calls", "retries", "failures", "throttled")},
+        "peak_memory_kb": round(peak_bytes / 1024, 1),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Offline benchmark for the interview graph (scripted fake LLM, no network).")
+    parser.add_argument("--modes", nargs="+", default=INTERVIEW_TYPES, choices=INTERVIEW_TYPES)
+    parser.add_argument("--interviews", type=int, default=3, help="Interviews per mode.")
+    parser.add_argument("--questions", type=int, default=5, help="Questions per interview (Static and Hybrid sample this many from the bank).")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated latency of every fake model call.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake model calls that fail with a 429.")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of fake model calls that take --slow-ms instead (latency tail).")
+    parser.add_argument("--slow-ms", type=float, default=0.0, help="Latency of the slow fake model calls.")
+    parser.add_argument("--turn-budget-ms", type=float, default=0.0, help="Per-turn latency budget (deadlines.py); 0 = no deadline.")
+    parser.add_argument("--route", action="append", default=[], metavar="ROLE=MODEL",
+                        help="Routes a role (orchestrator, generator, evaluator, judge) to another model; repeatable.")
+    parser.add_argument("--model-latency-ms", action="append", default=[], metavar="MODEL=MS",
+                        help="Simulated latency of one model's fake calls, overriding --latency-ms; repeatable.")
+    parser.add_argument("--checkpoint", default="memory", choices=["memory", "sqlite"])
+    parser.add_argument("--use-async", action="store_true")
+    parser.add_argument("--speculative", action="store_true")
+    parser.add_argument("--static-fast-path", action="store_true")
+    parser.add_argument("--structured-turns", action="store_true", help="One structured-output call per answered turn (agent.create_structured_turn_graph).")
+    parser.add_argument("--compare-structured", action="store_true", help="Run every mode both with and without --structured-turns.")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--verbose", action="store_true", help="Show the graph's own logging.")
+    args = parser.parse_args(argv)
+    if args.use_async and args.checkpoint == "sqlite":
+        parser.error("the sqlite checkpointer is synchronous; use --checkpoint memory with --use-async")
+
+    for route in args.route:
+        role, _, model = route.partition("=")
+        if role not in model_router.routes() or not model:
+            parser.error(f"--route expects ROLE=MODEL with ROLE one of {', '.join(model_router.routes())}, got {route!r}")
+        model_router.configure(role, model=model)
+    args.model_latency = {}
+    for entry in args.model_latency_ms:
+        model, _, ms = entry.partition("=")
+        args.model_latency[model] = float(ms) / 1000
+    llm_registry.set_factory(fake_client_factory(latency=args.latency_ms / 1000, error_rate=args.error_rate,
+                                                 slow_rate=args.slow_rate, slow_latency=args.slow_ms / 1000,
+                                                 model_latency=args.model_latency))
+
+    results = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "verbose", "model_latency")},
+        "routes": {role: route._asdict() for role, route in model_router.routes().items()},
+        "modes": {},
+    }
+    variants = [False, True] if args.compare_structured else [args.structured_turns]
+    for interview_type in args.modes:
+        for structured in variants:
+            name = f"{interview_type} (structured)" if structured and args.compare_structured else interview_type
+            log = sys.stdout if args.verbose else io.StringIO()
+            with redirect_stdout(log):
+                results["modes"][name] = benchmark_mode(interview_type, args, structured)
+            mode = results["modes"][name]
+            print(f"{name}: {mode['llm_calls_per_question']} LLM calls/question, "
+                  f"{mode['interview_wall_time']['mean_ms']:.1f} ms/interview, "
+                  f"turn p50 {mode['turn_wall_time']['p50_ms']:.1f} / p95 {mode['turn_wall_time']['p95_ms']:.1f} / p99 {mode['turn_wall_time']['p99_ms']:.1f} ms, "
+                  f"checkpoints {mode['checkpointer']['total_ms']:.1f} ms, peak {mode['peak_memory_kb']:.0f} KB"
+                  + (f", degradations {mode['degradations']}" if mode["degradations"] else ""))
+            print("  " + ", ".join(f"{role} ({r['model']}) {r['calls']} calls p50 {r['p50_ms']:.1f} ms {r['input_tokens'] + r['output_tokens']} tokens"
+                                   for role, r in mode["model_routes"].items()))
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
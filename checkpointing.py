@@ -0,0 +1,203 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "memory")  # "memory" (per worker process) or "sqlite" (persistent)
+CHECKPOINT_DB_FILE = os.getenv("CHECKPOINT_DB_FILE", "checkpoints.db")
+CHECKPOINT_KEEP = int(os.getenv("CHECKPOINT_KEEP", "5"))
+
+
+class CheckpointTimings:
+    """Latency counters for checkpoint reads and writes, shared by every checkpointer in the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: Dict[str, Dict[str, float]] = {}
+
+    def record(self, op: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._ops.setdefault(op, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += seconds * 1000
+            stats["max_ms"] = max(stats["max_ms"], seconds * 1000)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ops.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                op: {**s, "avg_ms": s["total_ms"] / s["count"] if s["count"] else 0.0}
+                for op, s in self._ops.items()
+            }
+
+
+checkpoint_timings = CheckpointTimings()
+
+
+class _TimedCheckpointMixin:
+    """Times get_tuple/put/put_writes/list on any checkpointer."""
+
+    def get_tuple(self, config):
+        start = time.perf_counter()
+        try:
+            return super().get_tuple(config)
+        finally:
+            checkpoint_timings.record("read", time.perf_counter() - start)
+
+    def list(self, config, **kwargs):
+        start = time.perf_counter()
+        try:
+            # Materialize so the timing covers the whole query
+            return iter(list(super().list(config, **kwargs)))
+        finally:
+            checkpoint_timings.record("list", time.perf_counter() - start)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        start = time.perf_counter()
+        try:
+            return super().put(config, checkpoint, metadata, new_versions)
+        finally:
+            checkpoint_timings.record("write", time.perf_counter() - start)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        start = time.perf_counter()
+        try:
+            return super().put_writes(config, writes, task_id, task_path)
+        finally:
+            checkpoint_timings.record("write_pending", time.perf_counter() - start)
+
+
+class TimedMemorySaver(_TimedCheckpointMixin, MemorySaver):
+    """In-process checkpointer shared by the worker's sessions, pruned like PrunedSqliteSaver. Cannot resume after a restart."""
+
+    def __init__(self, keep_last: int = CHECKPOINT_KEEP):
+        super().__init__()
+        self.keep_last = max(1, keep_last)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        self._prune(config["configurable"]["thread_id"], config["configurable"].get("checkpoint_ns", ""))
+        return next_config
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        ids = sorted(checkpoints)
+        if len(ids) <= self.keep_last:
+            return
+        stale, kept = ids[:-self.keep_last], ids[-self.keep_last:]
+        kept_versions = set()
+        for checkpoint_id in kept:
+            kept_versions.update(self.serde.loads_typed(checkpoints[checkpoint_id][0])["channel_versions"].items())
+        for checkpoint_id in stale:
+            saved = checkpoints.pop(checkpoint_id, None)
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            if saved is None:
+                continue
+            # Each channel value is stored once per version; drop the versions no kept checkpoint reads
+            for channel_version in self.serde.loads_typed(saved[0])["channel_versions"].items():
+                if channel_version not in kept_versions:
+                    self.blobs.pop((thread_id, checkpoint_ns, *channel_version), None)
+
+    def register_thread(self, username: str, thread_id: str, interview_type: str) -> None:
+        pass
+
+    def find_thread(self, username: str) -> Optional[str]:
+        return None
+
+
+class PrunedSqliteSaver(_TimedCheckpointMixin, SqliteSaver):
+    """
+    Persistent checkpointer shared by all sessions in the process. Only the latest keep_last checkpoints
+    of each thread are kept, and each candidate's interview thread is recorded so an interview
+    interrupted by a worker restart can be resumed by username.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, keep_last: int = CHECKPOINT_KEEP):
+        super().__init__(conn)
+        self.keep_last = max(1, keep_last)
+        self.setup()
+        with self.lock:
+            self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS interview_threads (
+                    username TEXT PRIMARY KEY,
+                    thread_id TEXT NOT NULL,
+                    interview_type TEXT,
+                    updated_at REAL NOT NULL
+                );
+                """
+            )
+            self.conn.commit()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        self._prune(config["configurable"]["thread_id"], config["configurable"].get("checkpoint_ns", ""))
+        return next_config
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        # Checkpoint ids are time-ordered, so the newest keep_last sort last
+        with self.lock:
+            stale = [
+                row[0] for row in self.conn.execute(
+                    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+                    (thread_id, checkpoint_ns, self.keep_last),
+                )
+            ]
+            if not stale:
+                return
+            placeholders = ",".join("?" * len(stale))
+            params = (thread_id, checkpoint_ns, *stale)
+            self.conn.execute(f"DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id IN ({placeholders})", params)
+            self.conn.execute(f"DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id IN ({placeholders})", params)
+            self.conn.commit()
+
+    def register_thread(self, username: str, thread_id: str, interview_type: str) -> None:
+        """Records the candidate's current interview thread."""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO interview_threads (username, thread_id, interview_type, updated_at) VALUES (?, ?, ?, ?)",
+                (username, thread_id, interview_type, time.time()),
+            )
+            self.conn.commit()
+
+    def find_thread(self, username: str) -> Optional[str]:
+        """Returns the candidate's last interview thread_id, if one was recorded."""
+        with self.lock:
+            row = self.conn.execute("SELECT thread_id FROM interview_threads WHERE username = ?", (username,)).fetchone()
+        return row[0] if row else None
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self.lock:
+            self.conn.execute("DELETE FROM interview_threads WHERE thread_id = ?", (thread_id,))
+            self.conn.commit()
+
+
+_shared_sqlite_saver: Optional[PrunedSqliteSaver] = None
+_shared_lock = threading.Lock()
+
+def create_checkpointer(backend: str = CHECKPOINT_BACKEND):
+    """
+    Returns a checkpointer: a new TimedMemorySaver for "memory" (app.py creates one and shares it across
+    all sessions of the worker, with session_manager evicting idle threads), or the process-wide
+    PrunedSqliteSaver for "sqlite".
+    """
+    global _shared_sqlite_saver
+    if backend == "memory":
+        return TimedMemorySaver()
+    if backend != "sqlite":
+        raise ValueError(f"Unknown checkpoint backend: {backend}")
+    with _shared_lock:
+        if _shared_sqlite_saver is None:
+            conn = sqlite3.connect(CHECKPOINT_DB_FILE, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA busy_timeout=30000")
+            _shared_sqlite_saver = PrunedSqliteSaver(conn)
+        return _shared_sqlite_saver
@@ -0,0 +1,88 @@
+import os
+import json
+from typing import List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+CONTEXT_KEEP_TURNS = int(os.getenv("CONTEXT_KEEP_TURNS", "2"))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+
+# Rough average for English text; only used to enforce the budget, not for billing
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(messages: List[BaseMessage]) -> int:
+    """Cheap token estimate for a list of messages, including tool call arguments."""
+    total = 0
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+        chars = len(content)
+        if isinstance(message, AIMessage) and message.tool_calls:
+            chars += sum(len(call["name"]) + len(json.dumps(call["args"])) for call in message.tool_calls)
+        total += chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+def split_turns(messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+    """
+    Splits the transcript into turns, each starting at a HumanMessage.
+    Cutting only at turn boundaries keeps every ToolMessage next to the AIMessage that requested it.
+    """
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def summarize_progress(feedback_report: List[dict], current_question: Optional[str], summarized_turns: int,
+                       user_name: Optional[str] = None) -> str:
+    """Compact, structured replacement for the turns that were dropped from the prompt."""
+    lines = [f"**Interview Progress So Far** ({summarized_turns} earlier turns summarized, full transcript omitted):"]
+    if user_name:
+        lines.append(f"- Candidate username: {user_name}")
+    if feedback_report:
+        for i, report in enumerate(feedback_report, 1):
+            lines.append(f"- Q{i}: {report['question']} -> Verdict: {report.get('verdict', 'N/A')}")
+    else:
+        lines.append("- No questions have been evaluated yet.")
+    lines.append(f"- Questions asked and evaluated: {len(feedback_report)}")
+    if current_question:
+        lines.append(f"- Current question: {current_question}")
+    return "\n".join(lines)
+
+
+def build_prompt(system_prompt: str, messages: List[BaseMessage], feedback_report: List[dict],
+                 current_question: Optional[str] = None, user_name: Optional[str] = None,
+                 keep_turns: int = CONTEXT_KEEP_TURNS,
+                 token_budget: int = CONTEXT_TOKEN_BUDGET) -> Tuple[List[BaseMessage], dict]:
+    """
+    Builds the interviewer prompt: the system prompt, a summary of older turns taken from feedback_report,
+    and the last keep_turns turns verbatim. If that is still over token_budget, more turns are summarized,
+    but the latest turn is always kept. Returns (messages, stats).
+    """
+    turns = split_turns(messages)
+    keep = max(1, keep_turns)
+    older, kept = turns[:-keep], turns[-keep:]
+
+    def assemble() -> List[BaseMessage]:
+        content = system_prompt
+        if older:
+            content += "\n\n" + summarize_progress(feedback_report, current_question, len(older), user_name)
+        # A single leading system message: some providers reject system messages mid-conversation
+        return [SystemMessage(content=content)] + [m for turn in kept for m in turn]
+
+    prompt = assemble()
+    while len(kept) > 1 and estimate_tokens(prompt) > token_budget:
+        older, kept = older + kept[:1], kept[1:]
+        prompt = assemble()
+
+    stats = {
+        "prompt_tokens": estimate_tokens(prompt),
+        "full_history_tokens": estimate_tokens([SystemMessage(content=system_prompt)] + messages),
+        "kept_turns": len(kept),
+        "summarized_turns": len(older),
+    }
+    return prompt, stats
@@ -0,0 +1,289 @@
+"""Per-turn latency budgets, and the fallbacks taken when a turn runs out of time."""
+import os
+import time
+import asyncio
+import inspect
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from telemetry import telemetry
+
+TURN_BUDGET_SECONDS = float(os.getenv("TURN_BUDGET_SECONDS", "25"))  # 0 = no deadline
+# Time a tool leaves for the interviewer's reply after it (generation and grading give up this much earlier),
+# at most a quarter of the budget
+TURN_RESERVE_SECONDS = float(os.getenv("TURN_RESERVE_SECONDS", "4"))
+MAX_RESERVE_SHARE = 0.25
+DEFERRED_EVALUATION_WORKERS = int(os.getenv("DEFERRED_EVALUATION_WORKERS", "4"))
+# Deferred evaluations nobody collected (e.g. the candidate left) are dropped after this long
+DEFERRED_KEEP_SECONDS = 3600
+CALL_WORKERS = 32
+
+PENDING_VERDICT = "Pending"
+PENDING_EVALUATION = f"Grading this answer took longer than the turn budget; it is being completed in the background.\nVerdict: {PENDING_VERDICT}"
+
+
+class BudgetExceeded(Exception):
+    """A model call (or the wait for one) would end after the turn's deadline. Never retried by the gateway."""
+
+    def __init__(self, message: str, abandoned: Optional[Future] = None):
+        super().__init__(message)
+        # The call that was given up on, still running in a worker thread
+        self.abandoned = abandoned
+
+
+class TurnContext:
+    def __init__(self, deadline: Optional[float], thread_id: Optional[str], budget: Optional[float] = None):
+        self.deadline = deadline  # time.monotonic() value
+        self.thread_id = thread_id
+        self.budget = budget
+        self.degradations: List[dict] = []
+
+
+_turn: contextvars.ContextVar = contextvars.ContextVar("turn_context", default=None)
+_call_executor = ThreadPoolExecutor(max_workers=CALL_WORKERS, thread_name_prefix="deadline-call")
+
+
+def turn_config(config: dict, budget: float = TURN_BUDGET_SECONDS) -> dict:
+    """A copy of a run config whose nodes must finish within budget seconds from now (no change if budget is 0)."""
+    if not budget or budget <= 0:
+        return config
+    return {**config, "configurable": {**config.get("configurable", {}), "turn_deadline": time.time() + budget, "turn_budget": budget}}
+
+
+# --- Current deadline ---
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None when there is none."""
+    turn = _turn.get()
+    if turn is None or turn.deadline is None:
+        return None
+    return turn.deadline - time.monotonic()
+
+
+def reserve_seconds() -> float:
+    """The time reserve() keeps back in the current turn."""
+    turn = _turn.get()
+    return min(TURN_RESERVE_SECONDS, turn.budget * MAX_RESERVE_SHARE) if turn and turn.budget else TURN_RESERVE_SECONDS
+
+
+def clear_turn() -> None:
+    """Removes the current turn from this context (run it in a copied context for background work that outlives the turn)."""
+    _turn.set(None)
+
+
+def current_thread() -> Optional[str]:
+    turn = _turn.get()
+    return turn.thread_id if turn else None
+
+
+@contextmanager
+def reserve(seconds: float = TURN_RESERVE_SECONDS):
+    """Brings the deadline forward by seconds inside the block, keeping that time for the steps after it."""
+    turn = _turn.get()
+    if turn is None or turn.deadline is None:
+        yield
+        return
+    if turn.budget:
+        seconds = min(seconds, turn.budget * MAX_RESERVE_SHARE)
+    inner = TurnContext(turn.deadline - seconds, turn.thread_id, turn.budget)
+    inner.degradations = turn.degradations
+    token = _turn.set(inner)
+    try:
+        yield
+    finally:
+        _turn.reset(token)
+
+
+def call_before_deadline(fn: Callable[[], Any], what: str) -> Any:
+    """
+    Runs fn() and returns its result, or raises BudgetExceeded if it has not returned by the deadline.
+    Python threads cannot be killed, so a late call is abandoned: it finishes in its worker thread and its
+    result is discarded.
+    """
+    left = remaining()
+    if left is None:
+        return fn()
+    if left <= 0:
+        raise BudgetExceeded(f"No time left in the turn budget for {what}.")
+    context = contextvars.copy_context()
+    future = _call_executor.submit(context.run, fn)
+    try:
+        return future.result(timeout=left)
+    except FutureTimeoutError:
+        raise BudgetExceeded(f"{what} did not finish within the turn budget.", abandoned=future) from None
+
+
+async def acall_before_deadline(make_awaitable: Callable[[], Any], what: str) -> Any:
+    """Async variant of call_before_deadline(); a late call is cancelled."""
+    left = remaining()
+    if left is None:
+        return await make_awaitable()
+    if left <= 0:
+        raise BudgetExceeded(f"No time left in the turn budget for {what}.")
+    try:
+        return await asyncio.wait_for(make_awaitable(), timeout=left)
+    except asyncio.TimeoutError:
+        raise BudgetExceeded(f"{what} did not finish within the turn budget.") from None
+
+
+# --- Degradations ---
+def degrade(kind: str, question: Optional[str] = None, detail: str = "") -> None:
+    """Records a fallback taken in the current turn (kind: question_fallback, evaluation_deferred, heuristic_rating, scripted_routing)."""
+    telemetry.increment("turn_degradations_total", kind=kind)
+    telemetry.annotate(f"degraded_{kind}", detail or True)
+    turn = _turn.get()
+    if turn is not None:
+        turn.degradations.append({"kind": kind, "question": question, "detail": detail, "at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+
+
+def _with_degradations(entry: dict, degradations: List[dict]) -> dict:
+    matching = [d for d in degradations if d.get("question") == entry.get("question")]
+    if not matching:
+        return entry
+    metadata = dict(entry.get("metadata") or {})
+    known = metadata.get("degradations", [])
+    metadata["degradations"] = known + [d for d in matching if d not in known]
+    return {**entry, "metadata": metadata}
+
+
+# --- Deferred evaluations ---
+class DeferredEvaluations:
+    """Evaluations that missed their turn, run in the background and collected by a later turn of the same thread."""
+
+    def __init__(self, workers: int = DEFERRED_EVALUATION_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deferred-evaluation")
+        self._lock = threading.Lock()
+        # thread_id -> {(question, user_answer): (future, submitted_at)}
+        self._pending: Dict[str, Dict[Tuple[str, str], Tuple[Future, float]]] = {}
+
+    def submit(self, thread_id: str, question: str, user_answer: str, evaluate: Callable[[], str]) -> None:
+        # Executor threads start with an empty context, so the background evaluation has no deadline
+        future = self._executor.submit(evaluate)
+        with self._lock:
+            cutoff = time.monotonic() - DEFERRED_KEEP_SECONDS
+            for thread in list(self._pending):
+                self._pending[thread] = {k: v for k, v in self._pending[thread].items() if v[1] >= cutoff}
+                if not self._pending[thread]:
+                    del self._pending[thread]
+            self._pending.setdefault(thread_id, {})[(question, user_answer)] = (future, time.monotonic())
+
+    def resolve(self, thread_id: Optional[str], feedback_report: List[dict], wait: float = 0.0) -> Dict[int, dict]:
+        """
+        Completed entries for the report's pending evaluations, by index. Waits up to wait seconds for
+        evaluations still running; entries still pending after that are left out. Results stay available
+        until taken() is called for them, so a caller that only reads them (e.g. the judge building its
+        prompt) does not hide them from the node update that writes them into the state.
+        """
+        pending = [(i, r) for i, r in enumerate(feedback_report) if r.get("verdict") == PENDING_VERDICT]
+        if not pending or thread_id is None:
+            return {}
+        with self._lock:
+            futures = dict(self._pending.get(thread_id, {}))
+        deadline = time.monotonic() + wait
+        resolved: Dict[int, dict] = {}
+        for i, entry in pending:
+            key = (entry["question"], entry["user_answer"])
+            if key not in futures:
+                continue
+            future = futures[key][0]
+            try:
+                evaluation = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                continue
+            except Exception as e:
+                evaluation = f"Evaluation failed: {type(e).__name__}: {e}"
+            verdict = evaluation.split("Verdict: ")[-1].strip() if "Verdict: " in evaluation else "N/A"
+            metadata = dict(entry.get("metadata") or {})
+            metadata["degradations"] = [{**d, "resolved": True} if d["kind"] == "evaluation_deferred" else d for d in metadata.get("degradations", [])]
+            resolved[i] = {**entry, "evaluation": evaluation, "verdict": verdict, "metadata": metadata}
+        return resolved
+
+    def taken(self, thread_id: Optional[str], entries: List[dict]) -> None:
+        """Drops the results of resolved entries once they are part of the thread's state."""
+        with self._lock:
+            futures = self._pending.get(thread_id, {})
+            for entry in entries:
+                futures.pop((entry["question"], entry["user_answer"]), None)
+            if not futures:
+                self._pending.pop(thread_id, None)
+
+    def forget(self, thread_id: Optional[str]) -> None:
+        """Drops everything deferred for a thread (e.g. once its results are saved)."""
+        with self._lock:
+            self._pending.pop(thread_id, None)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(1 for futures in self._pending.values() for future, _ in futures.values() if not future.done())
+
+
+deferred_evaluations = DeferredEvaluations()
+
+
+def resolved_feedback(thread_id: Optional[str], feedback_report: List[dict], wait: float = 0.0) -> List[dict]:
+    """The report with every deferred evaluation that has completed (within wait seconds) filled in."""
+    resolved = deferred_evaluations.resolve(thread_id, feedback_report, wait)
+    return [resolved.get(i, entry) for i, entry in enumerate(feedback_report)]
+
+
+# --- Graph nodes ---
+def _enter(state: dict, config: dict) -> Tuple[TurnContext, dict, Dict[int, dict]]:
+    configurable = (config or {}).get("configurable", {})
+    wall_deadline = configurable.get("turn_deadline")
+    deadline = time.monotonic() + (wall_deadline - time.time()) if wall_deadline else None
+    turn = TurnContext(deadline, configurable.get("thread_id"), configurable.get("turn_budget"))
+    # Evaluations deferred in earlier turns that have finished since are folded in before the node runs
+    replacements = deferred_evaluations.resolve(turn.thread_id, state.get("feedback_report", []))
+    if replacements:
+        report = [replacements.get(i, entry) for i, entry in enumerate(state["feedback_report"])]
+        state = {**state, "feedback_report": report}
+    return turn, state, replacements
+
+
+def _exit(turn: TurnContext, state: dict, replacements: Dict[int, dict], update: Optional[dict]) -> Optional[dict]:
+    # Evaluations that finished while the node ran (e.g. the judge waited for them)
+    replacements.update(deferred_evaluations.resolve(turn.thread_id, state.get("feedback_report", [])))
+    deferred_evaluations.taken(turn.thread_id, list(replacements.values()))
+    if not replacements and not turn.degradations:
+        return update
+    update = dict(update or {})
+    degradations = state.get("degradations", []) + turn.degradations
+    new_entries = [_with_degradations(entry, degradations) for entry in update.get("feedback_report", [])]
+    update["feedback_report"] = [{**entry, "replaces": i} for i, entry in sorted(replacements.items())] + new_entries
+    if turn.degradations:
+        update["degradations"] = turn.degradations
+    return update
+
+
+def with_deadline(node: Callable) -> Callable:
+    """
+    Wraps a graph node (sync or async, taking state or state and config) so its calls run under the
+    turn's deadline, its fallbacks are recorded, and finished deferred evaluations are merged into
+    feedback_report. Runs without a deadline when the config carries none.
+    """
+    accepts_config = "config" in inspect.signature(node).parameters
+
+    if asyncio.iscoroutinefunction(node):
+        async def async_wrapper(state, config):
+            turn, state, replacements = _enter(state, config)
+            token = _turn.set(turn)
+            try:
+                update = await (node(state, config) if accepts_config else node(state))
+            finally:
+                _turn.reset(token)
+            return _exit(turn, state, replacements, update)
+        async_wrapper.__name__ = node.__name__
+        return async_wrapper
+
+    def wrapper(state, config):
+        turn, state, replacements = _enter(state, config)
+        token = _turn.set(turn)
+        try:
+            update = node(state, config) if accepts_config else node(state)
+        finally:
+            _turn.reset(token)
+        return _exit(turn, state, replacements, update)
+    wrapper.__name__ = node.__name__
+    return wrapper
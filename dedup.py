@@ -0,0 +1,159 @@
+import os
+import re
+import zlib
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from telemetry import telemetry
+from question_bank import question_bank
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") == "1"
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.5"))  # Estimated Jaccard similarity treated as a repeat
+DEDUP_MAX_RETRIES = int(os.getenv("DEDUP_MAX_RETRIES", "2"))
+
+SHINGLE_SIZE = 5  # Character shingles, robust to small rewordings
+NUM_PERM = 96
+BANDS = 32  # 3 rows per band: pairs above ~0.5 similarity almost always share a bucket
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, _PRIME, size=NUM_PERM, dtype=np.int64)
+_PERM_B = _rng.randint(0, _PRIME, size=NUM_PERM, dtype=np.int64)
+
+_NON_WORD = re.compile(r"[^a-z0-9$]+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Character shingles of the normalized text (case, punctuation and spacing ignored)."""
+    normalized = _NON_WORD.sub(" ", (text or "").lower()).strip()
+    if len(normalized) <= size:
+        return [normalized] if normalized else []
+    return [normalized[i:i + size] for i in range(len(normalized) - size + 1)]
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature of a text's shingles (NUM_PERM values)."""
+    hashed = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in set(shingles(text))), dtype=np.int64)
+    if hashed.size == 0:
+        return np.full(NUM_PERM, _PRIME, dtype=np.int64)
+    return ((np.outer(hashed, _PERM_A) + _PERM_B) % _PRIME).min(axis=0)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+class SimilarityIndex:
+    """MinHash LSH index: candidates share at least one band, then are ranked by estimated similarity."""
+
+    def __init__(self):
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = {}
+        self._rows = NUM_PERM // BANDS
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _bands(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(BANDS):
+            yield band, signature[band * self._rows:(band + 1) * self._rows].tobytes()
+
+    def add(self, text: str) -> None:
+        if text in self._signatures:
+            return
+        signature = minhash(text)
+        self._signatures[text] = signature
+        for key in self._bands(signature):
+            self._buckets.setdefault(key, []).append(text)
+
+    def most_similar(self, text: str, signature: Optional[np.ndarray] = None) -> Optional[Tuple[str, float]]:
+        signature = minhash(text) if signature is None else signature
+        candidates = {match for key in self._bands(signature) for match in self._buckets.get(key, ())}
+        scored = [(match, similarity(signature, self._signatures[match])) for match in candidates]
+        return max(scored, key=lambda item: item[1]) if scored else None
+
+
+class DuplicateFilter:
+    """
+    Rejects generated questions that are near-duplicates of a question already asked in the session
+    or (Dynamic only) of a question in the static bank, and regenerates them within a bounded retry budget.
+    Session questions are compared directly; the bank is indexed once per process with MinHash LSH.
+    """
+
+    def __init__(self, bank_loader: Callable[[], Iterable[str]], threshold: float = DEDUP_THRESHOLD,
+                 max_retries: int = DEDUP_MAX_RETRIES, enabled: bool = DEDUP_ENABLED):
+        self.bank_loader = bank_loader
+        self.threshold = threshold
+        self.max_retries = max_retries
+        self.enabled = enabled
+        self._bank_index: Optional[SimilarityIndex] = None
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.rejections = 0
+        self.exhausted = 0
+
+    def _bank(self) -> SimilarityIndex:
+        with self._lock:
+            if self._bank_index is None:
+                index = SimilarityIndex()
+                for text in self.bank_loader():
+                    index.add(text)
+                self._bank_index = index
+            return self._bank_index
+
+    def find_duplicate(self, question: str, asked: List[str], check_bank: bool = True) -> Optional[Tuple[str, str, float]]:
+        """Returns (source, matched question, similarity) for the closest match over the threshold, or None."""
+        signature = minhash(question)
+        best: Optional[Tuple[str, str, float]] = None
+        for previous in asked:
+            score = similarity(signature, minhash(previous))
+            if score >= self.threshold and (best is None or score > best[2]):
+                best = ("session", previous, score)
+        if best is None and check_bank:
+            match = self._bank().most_similar(question, signature)
+            if match and match[1] >= self.threshold:
+                best = ("bank", match[0], match[1])
+        return best
+
+    def generate_unique(self, generate: Callable[[List[str]], str], asked: List[str], interview_type: str) -> str:
+        """
+        Calls generate(avoid) until it returns a question that is not a near-duplicate, passing the
+        rejected questions as `avoid`. After max_retries regenerations the least similar candidate is used.
+        """
+        if not self.enabled:
+            return generate([])
+        # Hybrid questions are drawn from the bank's curriculum, so only repeats within the session count
+        check_bank = interview_type != "Hybrid"
+        avoid: List[str] = []
+        candidates: List[Tuple[float, str]] = []
+        for attempt in range(self.max_retries + 1):
+            question = generate(avoid)
+            duplicate = self.find_duplicate(question, asked, check_bank)
+            with self._lock:
+                self.checks += 1
+                if duplicate:
+                    self.rejections += 1
+            telemetry.increment("dedup_checks_total", interview_type=interview_type)
+            if duplicate is None:
+                return question
+            source, matched, score = duplicate
+            telemetry.increment("dedup_rejections_total", interview_type=interview_type, source=source)
+            telemetry.annotate(f"dedup_rejected_{attempt + 1}", f"{score:.2f} similar to {source} question")
+            candidates.append((score, question))
+            avoid.append(matched)
+        with self._lock:
+            self.exhausted += 1
+        telemetry.increment("dedup_exhausted_total", interview_type=interview_type)
+        return min(candidates)[1]
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "checks": self.checks, "rejections": self.rejections, "exhausted": self.exhausted,
+                "rejection_rate": self.rejections / self.checks if self.checks else 0.0,
+            }
+
+
+duplicate_filter = DuplicateFilter(question_bank.texts)
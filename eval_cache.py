@@ -0,0 +1,155 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+EVAL_CACHE_SIZE = int(os.getenv("EVAL_CACHE_SIZE", "2048"))
+EVAL_CACHE_TTL_SECONDS = float(os.getenv("EVAL_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+EVAL_CACHE_PATH = os.getenv("EVAL_CACHE_PATH")  # Optional on-disk layer, e.g. "eval_cache.db"
+EVAL_CACHE_DISK_MAX = int(os.getenv("EVAL_CACHE_DISK_MAX", "100000"))
+# Expired and excess disk entries are pruned once every this many puts (the bound is approximate in between)
+EVAL_CACHE_PRUNE_EVERY = int(os.getenv("EVAL_CACHE_PRUNE_EVERY", "100"))
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = "\"'`.,!?;: "
+
+
+def normalize_answer(answer: str) -> str:
+    """
+    Normalizes an answer for cache lookups: case, curly quotes, surrounding punctuation and whitespace.
+    Characters inside the answer are kept because they matter in Excel ($A$1 vs A1).
+    """
+    text = (answer or "").replace("’", "'").replace("‘", "'").replace("“", '"').replace("”", '"')
+    text = _WHITESPACE.sub(" ", text.lower())
+    return text.strip(_EDGE_PUNCTUATION)
+
+
+def make_cache_key(template: str, model: str, question: str, expected_concepts: str, answer: str) -> str:
+    """
+    Returns the cache key for an evaluation. It covers the full prompt template text and the evaluator
+    model, so editing a prompt or switching models never serves evaluations made under the old ones.
+    """
+    payload = json.dumps([template, model, question.strip(), (expected_concepts or "").strip(), normalize_answer(answer)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """
+    Deterministic evaluation cache in front of the temperature-0 evaluation call.
+    An in-memory LRU layer is backed by an optional SQLite layer so results survive restarts and
+    are shared between worker processes. Both layers expire entries after ttl seconds.
+    """
+
+    def __init__(self, max_entries: int = EVAL_CACHE_SIZE, ttl: float = EVAL_CACHE_TTL_SECONDS,
+                 path: Optional[str] = EVAL_CACHE_PATH, disk_max_entries: int = EVAL_CACHE_DISK_MAX,
+                 prune_every: int = EVAL_CACHE_PRUNE_EVERY):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.disk_max_entries = disk_max_entries
+        self.prune_every = max(1, prune_every)
+        self._puts_since_prune = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # --- Disk layer ---
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS eval_cache (key TEXT PRIMARY KEY, evaluation TEXT NOT NULL, created_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_eval_cache_created ON eval_cache(created_at)")
+            self._local.conn = conn
+        return conn
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        conn = self._connect()
+        if conn is None:
+            return None
+        row = conn.execute("SELECT evaluation, created_at FROM eval_cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] + self.ttl < time.time():
+            return None
+        return row[0], row[1] + self.ttl
+
+    def _disk_put(self, key: str, evaluation: str, created_at: float) -> None:
+        conn = self._connect()
+        if conn is None:
+            return
+        conn.execute("INSERT OR REPLACE INTO eval_cache (key, evaluation, created_at) VALUES (?, ?, ?)", (key, evaluation, created_at))
+        with self._lock:
+            self._puts_since_prune += 1
+            due = self._puts_since_prune >= self.prune_every
+            if due:
+                self._puts_since_prune = 0
+        if due:
+            self.prune()
+
+    def prune(self) -> None:
+        """Deletes expired disk entries and the oldest ones beyond disk_max_entries."""
+        conn = self._connect()
+        if conn is None:
+            return
+        conn.execute("DELETE FROM eval_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        conn.execute(
+            "DELETE FROM eval_cache WHERE key IN (SELECT key FROM eval_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_max_entries,),
+        )
+
+    # --- Public API ---
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] >= now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._memory[key]
+        entry = self._disk_get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store_memory(key, entry)
+            return entry[0]
+
+    def put(self, key: str, evaluation: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._store_memory(key, (evaluation, now + self.ttl))
+        self._disk_put(key, evaluation, now)
+
+    def _store_memory(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+            }
+
+
+evaluation_cache = EvaluationCache()
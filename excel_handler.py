@@ -1,113 +1,146 @@
 import pandas as pd
-import os
-import json
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
-EXCEL_FILE = "user_credential_and_analysis.xlsx"
+from storage import EXCEL_FILE, EDITABLE_COLUMNS, get_backend
+from user_cache import user_cache
+from results_journal import results_journal
+from analytics import analytics
+
+def _on_compacted(records: list):
+    # Journaled results become visible in the store once the compactor has merged them
+    user_cache.invalidate()
+    users = [(record, user_cache.get_user(record["username"])) for record in records]
+    analytics.record([{**record, "interview_type": user["interview_type"]} for record, user in users if user is not None])
+
+results_journal.on_compacted = _on_compacted
 
 def initialize_excel_file():
-    """Creates the Excel file with the required columns and default users if it doesn't exist."""
-    if not os.path.exists(EXCEL_FILE):
-        try:
-            with open("questions.json", "r") as f:
-                num_static_questions = len(json.load(f))
-        except FileNotFoundError:
-            num_static_questions = 5
-
-        # Defines the new column order as requested
-        columns = ["username", "interview_type", "num_questions", "test_taken", "final_rating"]
-        for i in range(1, num_static_questions + 1):
-            columns.append(f"answer_{i}")
-            columns.append(f"evaluation_{i}")
-
-        df = pd.DataFrame(columns=columns)
-        
-        # Populates with the new default users and num_questions as requested
-        default_users = [
-            {"username": "user1", "interview_type": "Static", "num_questions": None},
-            {"username": "user2", "interview_type": "Dynamic", "num_questions": 4},
-            {"username": "user3", "interview_type": "Hybrid", "num_questions": 5},
-        ]
-        
-        df = pd.concat([df, pd.DataFrame(default_users)], ignore_index=True)
-        # Ensure correct column order and handle NaNs for empty cells
-        df = df.reindex(columns=columns)
-        df.to_excel(EXCEL_FILE, index=False)
-        print(f"'{EXCEL_FILE}' created with default users.")
+    """Creates the data store with the required columns and default users if it doesn't exist."""
+    get_backend().initialize()
+    results_journal.start()
 
 def validate_user(username: str) -> Tuple[str, Optional[str], Optional[int]]:
     """
     Validates the user and returns their status, interview type, and number of questions.
     Returns: A tuple of (status, interview_type, num_questions).
     """
-    try:
-        df = pd.read_excel(EXCEL_FILE)
-        # Add num_questions column with a default if it doesn't exist
-        if "num_questions" not in df.columns:
-            df.insert(2, "num_questions", 5) # Default to 5 questions
-            df.to_excel(EXCEL_FILE, index=False)
-
-        user_row = df[df["username"] == username]
-        if not user_row.empty:
-            if user_row.iloc[0]["test_taken"] == True:
-                return "taken", None, None
-            else:
-                interview_type = user_row.iloc[0]["interview_type"]
-                
-                num_questions_val = user_row.iloc[0]["num_questions"]
-                # Handle empty/NaN values for num_questions (e.g., for Static type)
-                if pd.isna(num_questions_val):
-                    num_questions = None
-                else:
-                    num_questions = int(num_questions_val)
-                    
-                return "valid", interview_type, num_questions
-        else:
-            return "not_found", None, None
-    except FileNotFoundError:
-        initialize_excel_file()
-        return validate_user(username)
+    # Check the journal first: compaction invalidates the cache before it clears the pending entry
+    if results_journal.is_pending(username):
+        return "taken", None, None
+    user = user_cache.get_user(username)
+    if user is None:
+        return "not_found", None, None
+    if user["test_taken"]:
+        return "taken", None, None
+    # num_questions is None for empty cells (e.g., for Static type)
+    return "valid", user["interview_type"], user["num_questions"]
 
 def save_interview_results(username: str, feedback_report: list, final_rating: Optional[str]):
-    """Saves the interview results to the Excel file."""
-    try:
-        df = pd.read_excel(EXCEL_FILE)
-        user_index = df[df["username"] == username].index
+    """
+    Durably records the interview results in the results journal; the background compactor merges
+    them into the data store. Raises if the results could not be written.
+    """
+    results_journal.append(username, feedback_report, final_rating)
+    print(f"Results journaled for user '{username}'.")
 
-        if not user_index.empty:
-            df.loc[user_index, "test_taken"] = True
-            df.loc[user_index, "final_rating"] = final_rating
+def _merge_journal():
+    # Merge any journaled results first so the dashboard never shows a finished interview as pending
+    if results_journal.pending_count():
+        results_journal.compact()
 
-            for i, report in enumerate(feedback_report, 1):
-                eval_col = f"evaluation_{i}"
-                ans_col = f"answer_{i}"
+def get_all_results() -> pd.DataFrame:
+    """Returns all user data and results, including every answer column (used for reports)."""
+    _merge_journal()
+    return get_backend().get_all_results()
 
-                if eval_col not in df.columns:
-                    df[eval_col] = pd.NA
-                if ans_col not in df.columns:
-                    df[ans_col] = pd.NA
+def count_users(search: Optional[str] = None, interview_type: Optional[str] = None, test_taken: Optional[bool] = None) -> int:
+    """Returns the number of users matching the admin dashboard filters."""
+    _merge_journal()
+    return get_backend().count_users(search, interview_type, test_taken)
 
-                full_text = f"Question: {report['question']}\n\nEvaluation: {report['evaluation']}"
-                df.loc[user_index, eval_col] = full_text
+def list_users(page: int, page_size: int, search: Optional[str] = None, interview_type: Optional[str] = None,
+               test_taken: Optional[bool] = None) -> pd.DataFrame:
+    """
+    Returns one page (0-based) of roster columns matching the filters.
+    Filtering and paging happen in the backend, so only the visible rows are loaded.
+    """
+    _merge_journal()
+    return get_backend().list_users(page * page_size, page_size, search, interview_type, test_taken)
 
-                evaluation_text = report['evaluation']
-                verdict_prefix = "Verdict: "
-                verdict = "N/A"
-                if verdict_prefix in evaluation_text:
-                    verdict = evaluation_text.split(verdict_prefix)[-1].strip()
+def get_user_results(username: str) -> List[dict]:
+    """Returns one user's stored answers and evaluations, fetched on demand."""
+    _merge_journal()
+    return get_backend().get_user_results(username)
 
-                df.loc[user_index, ans_col] = verdict
+def roster_changes_from_editor(page_df: pd.DataFrame, editor_state: dict) -> Dict[str, object]:
+    """
+    Converts st.data_editor's edit state for one page (edited_rows / added_rows / deleted_rows, keyed by
+    row position) into a diff keyed by username: {"updates": {username: fields}, "added": [...], "deleted": [...]}.
+    """
+    usernames = page_df["username"].astype(str).tolist()
+    deleted = [usernames[int(pos)] for pos in editor_state.get("deleted_rows", [])]
+    updates = {
+        usernames[int(pos)]: {c: v for c, v in fields.items() if c in EDITABLE_COLUMNS}
+        for pos, fields in editor_state.get("edited_rows", {}).items()
+        if usernames[int(pos)] not in deleted
+    }
+    added = [{c: row.get(c) for c in EDITABLE_COLUMNS} for row in editor_state.get("added_rows", [])]
+    return {"updates": {u: f for u, f in updates.items() if f}, "added": added, "deleted": deleted}
 
-            df.to_excel(EXCEL_FILE, index=False)
-            print(f"Results saved for user '{username}'.")
-    except Exception as e:
-        print(f"Error saving results for {username}: {e}")
+def validate_roster_changes(changes: Dict[str, object]) -> List[str]:
+    """Checks a roster diff against the whole roster (not just the edited page). Returns error messages."""
+    roster = user_cache.get_table()
+    names = roster["username"].astype(str)
+    taken = pd.Series(roster["test_taken"].fillna(False).astype(bool).values, index=names)
+    added = pd.DataFrame(changes["added"], columns=EDITABLE_COLUMNS)
 
-def get_all_results() -> pd.DataFrame:
-    """Loads and returns all user data and results from the Excel file."""
+    def edited(column: str) -> pd.Series:
+        # username -> new value, for the rows where this column was edited
+        return pd.Series({u: f[column] for u, f in changes["updates"].items() if column in f}, dtype=object)
+
+    errors = []
+    new_names = edited("username")
+    blank_edit = new_names.isna() | (new_names.astype(str).str.strip() == "")
+    renamed = new_names[~blank_edit & (new_names.astype(str) != new_names.index.to_series())]
+    locked = renamed.index[taken.reindex(renamed.index, fill_value=False).values]
+    if len(locked):
+        errors.append(f"Cannot rename {', '.join(locked)}: these users have already completed the interview.")
+
+    # Usernames after the change: survivors (renamed where edited) plus new rows
+    survivors = names[~names.isin(changes["deleted"])]
+    survivors = survivors.where(~survivors.isin(renamed.index), survivors.map(renamed))
+    final = pd.concat([survivors.astype(object), added["username"]], ignore_index=True)
+    blank = final.isna() | (final.astype(str).str.strip() == "")
+    if blank.any() or blank_edit.any():
+        errors.append("Username cannot be empty. Please enter a username for all users.")
+    duplicated = final[~blank].astype(str)
+    duplicated = duplicated[duplicated.duplicated()].unique()
+    if len(duplicated):
+        errors.append(f"Usernames must be unique. Duplicates: {', '.join(duplicated)}.")
+
+    if added["interview_type"].isna().any() or edited("interview_type").isna().any():
+        errors.append("Interview type is required for every user.")
+    num_questions = pd.to_numeric(pd.concat([edited("num_questions"), added["num_questions"]]), errors="coerce").dropna()
+    if ((num_questions < 1) | (num_questions > 10) | (num_questions % 1 != 0)).any():
+        errors.append("Number of questions must be a whole number between 1 and 10.")
+    return errors
+
+def apply_roster_changes(changes: Dict[str, object]):
+    """Persists a validated roster diff; only the changed users are written."""
     try:
-        df = pd.read_excel(EXCEL_FILE)
-        return df
-    except FileNotFoundError:
-        initialize_excel_file()
-        return pd.read_excel(EXCEL_FILE)
+        get_backend().apply_roster_changes(changes["updates"], changes["added"], changes["deleted"])
+    finally:
+        user_cache.invalidate()
+
+def get_analytics_summary() -> dict:
+    """Returns the precomputed interview analytics shown on the admin dashboard."""
+    return analytics.summary()
+
+def get_user_cache_stats() -> dict:
+    """Returns hit/miss/reload counters for the user table cache."""
+    return user_cache.stats()
+
+def export_results_to_excel(target=EXCEL_FILE):
+    """Writes an Excel report of all users and results to a path or file-like object."""
+    get_backend().export_to_excel(target)
+    return target
@@ -0,0 +1,264 @@
+import time
+import random
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from model_config import model_router
+from prompts import INIT_MESSAGE
+
+# Offline stand-ins for the Gemini models, used by benchmark.py. They never touch the network and
+# always give the same output for the same input, so runs can be compared between commits.
+
+QUESTION_TOOLS = {"Static": "ask_static_question", "Dynamic": "generate_dynamic_question", "Hybrid": "generate_hybrid_question"}
+# Generated questions are picked from this pool by prompt digest, so repeats (and dedup.py retries) occur like with a real model
+GENERATED_TOPICS = [
+    "how would you use XLOOKUP with a fallback value to match orders to customers?",
+    "how would you build a PivotTable that shows monthly revenue per sales rep with a running total?",
+    "how would you flag duplicate invoice numbers across two worksheets using conditional formatting?",
+    "how would you split a 'Last, First' name column into two columns without retyping anything?",
+    "how would you write a SUMIFS formula that totals refunds for one region within a date range?",
+    "how would you protect a budget template so managers can only edit the input cells?",
+    "how would you use Power Query to combine twelve monthly CSV exports into one table?",
+    "how would you chart actual against target spend and highlight the months over budget?",
+    "how would you use INDEX and MATCH to pull a price when the lookup column is left of the key?",
+    "how would you build a dropdown list whose options depend on the value chosen in another cell?",
+]
+
+
+class FakeRateLimitError(Exception):
+    """Stand-in for the provider's 429 quota error."""
+    status_code = 429
+
+
+class FakeTimeoutError(Exception):
+    """Stand-in for the client's request timeout (retried by llm_gateway, like the real one)."""
+
+
+# Shared, seeded generators so injected failures and slow calls are reproducible run to run
+_error_rng = random.Random(0)
+_slow_rng = random.Random(1)
+_error_lock = threading.Lock()
+
+
+def _should_fail(error_rate: float) -> bool:
+    if not error_rate:
+        return False
+    with _error_lock:
+        return _error_rng.random() < error_rate
+
+
+def _should_stall(slow_rate: float) -> bool:
+    if not slow_rate:
+        return False
+    with _error_lock:
+        return _slow_rng.random() < slow_rate
+
+
+class FakeCallLog:
+    """Records every fake model call (role, prompt size, response size) for reporting."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: List[Dict[str, Any]] = []
+
+    def record(self, role: str, prompt_chars: int, response_chars: int) -> None:
+        with self._lock:
+            self.calls.append({"role": role, "prompt_chars": prompt_chars, "response_chars": response_chars})
+
+    def reset(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            calls, self.calls = self.calls, []
+            return calls
+
+
+call_log = FakeCallLog()
+
+
+def _text(message: BaseMessage) -> str:
+    return message.content if isinstance(message.content, str) else str(message.content)
+
+
+def _prompt_chars(messages: List[BaseMessage]) -> int:
+    return sum(len(_text(m)) + sum(len(str(c["args"])) for c in getattr(m, "tool_calls", None) or []) for m in messages)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
+
+
+def _verdict(answer: str) -> str:
+    answer = answer.lower()
+    if "don't know" in answer or "not sure" in answer:
+        return "Incorrect"
+    if len(answer) < 160:
+        return "Partially Correct"
+    return "Correct"
+
+
+def _generated_question(prompt: str) -> str:
+    digest = _digest(prompt)
+    return f"Scenario {digest}: {GENERATED_TOPICS[int(digest, 16) % len(GENERATED_TOPICS)]}"
+
+
+def _rating(prompt: str) -> int:
+    return max(1, min(10, 3 + 2 * prompt.count("Verdict: Correct")))
+
+
+class _FakeChatModel(BaseChatModel):
+    role: str = "fake"
+    latency: float = 0.0
+    error_rate: float = 0.0
+    # Fraction of calls that take slow_latency instead (a latency tail, for testing turn budgets)
+    slow_rate: float = 0.0
+    slow_latency: float = 0.0
+    # The role's route (model_config.py): a call slower than timeout fails, a reply is cut at max_tokens
+    model: str = "fake"
+    timeout: float = 0.0
+    max_tokens: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-" + self.role
+
+    def bind_tools(self, tools, **kwargs):
+        # with_structured_output() binds a single schema; the fake then answers with a call of that "tool"
+        if "ls_structured_output_format" in kwargs:
+            return self.bind(structured_output=tools[0].__name__)
+        return self
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        raise NotImplementedError
+
+    def _respond_structured(self, schema: str, messages: List[BaseMessage]) -> AIMessage:
+        """Structured replies for agent.TurnResult and agent.Judgement, derived from the prompt like _respond."""
+        prompt = _text(messages[-1])
+        if schema == "Judgement":
+            args = {"summary": "The candidate showed a consistent level of Excel knowledge.", "rating": _rating(prompt)}
+        elif schema == "TurnResult":
+            reply = prompt.split("CANDIDATE'S REPLY:", 1)[1].strip().strip('"')
+            if reply.endswith("?") and len(reply) < 120:
+                args = {"is_answer": False, "message": "Let me put that another way: " + prompt.split("CURRENT QUESTION:", 1)[1].split("\n")[1].strip('"')}
+            else:
+                args = {
+                    "is_answer": True, "evaluation": "The answer was reviewed against the expected concepts.",
+                    "verdict": _verdict(reply), "message": "Thank you, let's move on.",
+                    "next_question": None if "next_question to null" in prompt else _generated_question(prompt),
+                }
+        else:
+            raise ValueError(f"No fake structured reply for {schema}")
+        return AIMessage(content="", tool_calls=[{"name": schema, "args": args, "id": f"call_{_digest(prompt)}"}])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        latency = self.slow_latency if _should_stall(self.slow_rate) else self.latency
+        if self.timeout and latency > self.timeout:
+            time.sleep(self.timeout)
+            raise FakeTimeoutError(f"Request to {self.model} timed out after {self.timeout:.1f}s.")
+        if latency:
+            time.sleep(latency)
+        if _should_fail(self.error_rate):
+            raise FakeRateLimitError("429 Resource has been exhausted (e.g. check quota).")
+        if "structured_output" in kwargs:
+            message = self._respond_structured(kwargs["structured_output"], messages)
+        else:
+            message = self._respond(messages)
+        if self.max_tokens and isinstance(message.content, str) and len(message.content) > self.max_tokens * 4:
+            message.content = message.content[:self.max_tokens * 4]
+        prompt_chars = _prompt_chars(messages)
+        response_chars = len(_text(message)) + sum(len(str(c["args"])) for c in message.tool_calls)
+        message.usage_metadata = {"input_tokens": prompt_chars // 4, "output_tokens": response_chars // 4, "total_tokens": (prompt_chars + response_chars) // 4}
+        call_log.record(self.role, prompt_chars, response_chars)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class FakeInterviewerModel(_FakeChatModel):
+    """
+    Scripted interviewer that follows the tool sequence from the system prompts: ask a question, evaluate
+    each answer, then judge and conclude after total_questions evaluations. Use one instance per interview.
+    """
+
+    role: str = "orchestrator"
+    interview_type: str = "Static"
+    total_questions: int = 5
+    call_count: int = 0
+    # Ids of the evaluation results seen, including those of steps the graph scripted without the model
+    evaluated_calls: List[str] = []
+
+    def _tool_call(self, name: str, **args) -> AIMessage:
+        self.call_count += 1
+        return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call_{self.call_count}"}])
+
+    def _question_call(self) -> AIMessage:
+        if self.interview_type == "Static":
+            return self._tool_call(QUESTION_TOOLS["Static"])
+        return self._tool_call(QUESTION_TOOLS[self.interview_type], request="Ask the next question, adapting to the previous answer.")
+
+    def _requested(self, messages: List[BaseMessage], tool_call_id: str):
+        return next((c["name"] for m in reversed(messages) for c in getattr(m, "tool_calls", None) or [] if c["id"] == tool_call_id), None)
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        for message in messages:
+            if isinstance(message, ToolMessage) and message.tool_call_id not in self.evaluated_calls \
+                    and self._requested(messages, message.tool_call_id) == "evaluate_candidate_answer":
+                self.evaluated_calls.append(message.tool_call_id)
+        evaluations = len(self.evaluated_calls)
+        last = messages[-1]
+        if isinstance(last, HumanMessage):
+            if last.content == INIT_MESSAGE:
+                return self._question_call()
+            if evaluations >= self.total_questions:
+                return self._tool_call("judge_interview_performance")
+            return self._tool_call("evaluate_candidate_answer", user_answer=last.content)
+        if isinstance(last, ToolMessage):
+            requested = self._requested(messages, last.tool_call_id)
+            if requested in QUESTION_TOOLS.values():
+                return AIMessage(content=f"Here is your next question:\n\n{last.content}")
+            if requested == "evaluate_candidate_answer":
+                if evaluations < self.total_questions:
+                    return self._question_call()
+                return self._tool_call("judge_interview_performance")
+            if requested == "judge_interview_performance":
+                return self._tool_call("conclude_interview")
+        return AIMessage(content="That concludes the interview. Thank you for your time!")
+
+
+class FakeToolModel(_FakeChatModel):
+    """Deterministic question generator, evaluator and judge, chosen by what the prompt asks for."""
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        prompt = _text(messages[-1])
+        if "Final Rating: X/10" in prompt:
+            return AIMessage(content=f"The candidate showed a consistent level of Excel knowledge.\nFinal Rating: {_rating(prompt)}/10")
+        if "CANDIDATE'S ANSWER:" in prompt:
+            answer = prompt.split("CANDIDATE'S ANSWER:", 1)[1].split("**Your Evaluation", 1)[0].strip().strip('"')
+            return AIMessage(content=f"The answer was reviewed against the expected concepts.\nVerdict: {_verdict(answer)}")
+        return AIMessage(content=_generated_question(prompt))
+
+
+def fake_client_factory(latency: float = 0.0, error_rate: float = 0.0, slow_rate: float = 0.0, slow_latency: float = 0.0,
+                        model_latency: Optional[Dict[str, float]] = None):
+    """
+    Returns an llm_registry factory that builds FakeToolModel clients with the given latency per call,
+    fraction of calls failing with FakeRateLimitError and fraction of calls taking slow_latency instead.
+    model_latency overrides the latency of particular models (e.g. a faster orchestrator model), and
+    each client gets its role's timeout and output-token cap from model_config.py.
+    """
+    def factory(model: str, temperature: float, role: str):
+        route = model_router.route(role)
+        return FakeToolModel(role=role, model=model, latency=(model_latency or {}).get(model, latency), error_rate=error_rate,
+                             slow_rate=slow_rate, slow_latency=slow_latency, timeout=route.timeout, max_tokens=route.max_tokens)
+    return factory
+
+
+def fake_interviewer(interview_type: str, total_questions: int, latency: float = 0.0, error_rate: float = 0.0,
+                     slow_rate: float = 0.0, slow_latency: float = 0.0,
+                     model_latency: Optional[Dict[str, float]] = None) -> FakeInterviewerModel:
+    """A scripted interviewer on the orchestrator's route, like the one the app binds into its graphs."""
+    route = model_router.route("orchestrator")
+    return FakeInterviewerModel(interview_type=interview_type, total_questions=total_questions, model=route.model,
+                                latency=(model_latency or {}).get(route.model, latency), error_rate=error_rate,
+                                slow_rate=slow_rate, slow_latency=slow_latency, timeout=route.timeout, max_tokens=route.max_tokens)
@@ -0,0 +1,270 @@
+import os
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from telemetry import telemetry
+from deadlines import BudgetExceeded, remaining, call_before_deadline, acall_before_deadline
+from model_config import model_router
+
+LLM_RATE_PER_SECOND = float(os.getenv("LLM_RATE_PER_SECOND", "0"))  # 0 = no rate limit
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+LLM_INITIAL_CONCURRENCY = float(os.getenv("LLM_INITIAL_CONCURRENCY", "8"))
+LLM_MIN_CONCURRENCY = float(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_MAX_CONCURRENCY = float(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "20"))
+
+# Priority classes: lower values are admitted first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+_RETRYABLE_NAMES = ("ResourceExhausted", "TooManyRequests", "RateLimit", "ServiceUnavailable", "DeadlineExceeded", "InternalServerError", "Timeout")
+_RETRYABLE_TEXT = ("429", "resource exhausted", "quota", "rate limit", "503", "overloaded", "unavailable", "timed out")
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Quota, overload and timeout errors are worth retrying; anything else (bad request, auth) is not."""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int) and status in _RETRYABLE_STATUS:
+        return True
+    if any(name in type(error).__name__ for name in _RETRYABLE_NAMES):
+        return True
+    message = str(error).lower()
+    return any(text in message for text in _RETRYABLE_TEXT)
+
+
+@contextmanager
+def priority_class(priority: int):
+    """Runs the model calls made inside the block (in this thread or task) with the given priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class LLMGateway:
+    """
+    Single entry point for every chat model call in the process.
+
+    - Token bucket: at most rate calls per second on average, with bursts of up to burst calls.
+    - Adaptive concurrency (AIMD): the in-flight limit grows by 1/limit after each success and is
+      halved after each retryable error (429, 503, ...), within [min_concurrency, max_concurrency].
+    - Retries: retryable errors are retried up to max_retries times with full-jitter exponential backoff.
+    - Priorities: waiting calls are admitted by priority class, then in arrival order, so interactive
+      interview turns go ahead of batch grading.
+    - Deadlines: inside a turn with a latency budget (see deadlines.py), waiting for a slot, backing off
+      and the call itself all stop at the deadline with BudgetExceeded, which is never retried.
+    Queue depth, in-flight calls, the concurrency limit, wait times and retries are exported through telemetry.
+    """
+
+    def __init__(self, rate: float = LLM_RATE_PER_SECOND, burst: int = LLM_BURST,
+                 initial_concurrency: float = LLM_INITIAL_CONCURRENCY, min_concurrency: float = LLM_MIN_CONCURRENCY,
+                 max_concurrency: float = LLM_MAX_CONCURRENCY, max_retries: int = LLM_MAX_RETRIES,
+                 backoff_base: float = LLM_BACKOFF_BASE_SECONDS, backoff_max: float = LLM_BACKOFF_MAX_SECONDS,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.min_concurrency = max(1.0, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._cond = threading.Condition()
+        self._waiting: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._limit = min(self.max_concurrency, max(self.min_concurrency, initial_concurrency))
+        self.configure(rate=rate, burst=burst)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.throttled = 0
+
+    def configure(self, rate: Optional[float] = None, burst: Optional[int] = None) -> None:
+        """Changes the rate limit (e.g. from a CLI flag). A rate of 0 disables it."""
+        with self._cond:
+            if rate is not None:
+                self.rate = max(0.0, rate)
+            if burst is not None:
+                self.burst = max(1, burst)
+            self._tokens = float(self.burst)
+            self._refilled_at = time.monotonic()
+            self._cond.notify_all()
+
+    # --- Admission ---
+    def _token_wait_locked(self) -> float:
+        """Seconds until a token is available (0 if one can be taken now)."""
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def _publish_locked(self) -> None:
+        for priority, name in PRIORITY_NAMES.items():
+            telemetry.set_gauge("gateway_queue_depth", sum(1 for p, _ in self._waiting if p == priority), priority=name)
+        telemetry.set_gauge("gateway_in_flight", self._in_flight)
+        telemetry.set_gauge("gateway_concurrency_limit", round(self._limit, 3))
+
+    def _acquire(self, priority: int, role: str, deadline: Optional[float] = None) -> None:
+        """Waits for a slot; deadline is a time.monotonic() value after which waiting raises BudgetExceeded."""
+        entry = (priority, next(self._sequence))
+        start = time.perf_counter()
+        with self._cond:
+            heapq.heappush(self._waiting, entry)
+            self._publish_locked()
+            while True:
+                left = deadline - time.monotonic() if deadline is not None else None
+                if left is not None and left <= 0:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._publish_locked()
+                    self._cond.notify_all()
+                    telemetry.increment("gateway_deadline_exceeded_total", role=role, stage="queue")
+                    raise BudgetExceeded(f"The {role} call waited for a model slot until the turn budget ran out.")
+                if self._waiting[0] == entry and self._in_flight < int(self._limit):
+                    wait = self._token_wait_locked()
+                    if wait <= 0:
+                        if self.rate:
+                            self._tokens -= 1
+                        heapq.heappop(self._waiting)
+                        self._in_flight += 1
+                        self._publish_locked()
+                        # The next caller in line may also fit under the limit
+                        self._cond.notify_all()
+                        break
+                    self._cond.wait(wait if left is None else min(wait, left))
+                else:
+                    self._cond.wait(left)
+        telemetry.observe("gateway_wait_seconds", time.perf_counter() - start, priority=PRIORITY_NAMES.get(priority, str(priority)), role=role)
+
+    def _release(self, throttled: bool) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                self._limit = max(self.min_concurrency, self._limit / 2)
+            else:
+                self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+            self._publish_locked()
+            self._cond.notify_all()
+
+    def _deadline(self) -> Optional[float]:
+        left = remaining()
+        return time.monotonic() + left if left is not None else None
+
+    def _late(self, error: BudgetExceeded, role: str) -> None:
+        """Releases the slot of a call given up at the deadline (once the abandoned call has actually returned)."""
+        telemetry.increment("gateway_deadline_exceeded_total", role=role, stage="call")
+        if error.abandoned is not None:
+            error.abandoned.add_done_callback(lambda _: self._release(throttled=False))
+        else:
+            self._release(throttled=False)
+
+    def _check_backoff(self, delay: float, role: str) -> None:
+        left = remaining()
+        if left is not None and delay >= left:
+            telemetry.increment("gateway_deadline_exceeded_total", role=role, stage="backoff")
+            raise BudgetExceeded(f"The {role} call cannot be retried within the turn budget.")
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _failed(self, error: Exception, attempt: int, role: str) -> Optional[float]:
+        """Records a failed attempt and returns the delay before retrying, or None if the error should be raised."""
+        if not is_retryable(error) or attempt >= self.max_retries:
+            with self._cond:
+                self.failures += 1
+            telemetry.increment("gateway_failures_total", role=role, error=type(error).__name__)
+            return None
+        with self._cond:
+            self.retries += 1
+        telemetry.increment("gateway_retries_total", role=role, error=type(error).__name__)
+        return self._backoff(attempt)
+
+    # --- Calls ---
+    def call(self, fn: Callable[[], Any], role: str = "unknown", priority: Optional[int] = None) -> Any:
+        """Runs fn() under the rate limit, concurrency limit and retry policy."""
+        priority = _priority.get() if priority is None else priority
+        attempt = 0
+        while True:
+            self._acquire(priority, role, self._deadline())
+            try:
+                result = call_before_deadline(fn, f"The {role} call")
+            except BudgetExceeded as e:
+                self._late(e, role)
+                raise
+            except Exception as e:
+                self._release(throttled=is_retryable(e))
+                delay = self._failed(e, attempt, role)
+                if delay is None:
+                    raise
+                self._check_backoff(delay, role)
+                self._sleep(delay)
+                attempt += 1
+                continue
+            self._release(throttled=False)
+            with self._cond:
+                self.calls += 1
+            return result
+
+    async def acall(self, fn: Callable[[], Any], role: str = "unknown", priority: Optional[int] = None) -> Any:
+        """Async variant of call(); fn returns an awaitable. Waiting for a slot happens off the event loop."""
+        priority = _priority.get() if priority is None else priority
+        attempt = 0
+        while True:
+            await asyncio.to_thread(self._acquire, priority, role, self._deadline())
+            try:
+                result = await acall_before_deadline(fn, f"The {role} call")
+            except BudgetExceeded as e:
+                self._late(e, role)
+                raise
+            except Exception as e:
+                self._release(throttled=is_retryable(e))
+                delay = self._failed(e, attempt, role)
+                if delay is None:
+                    raise
+                self._check_backoff(delay, role)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._release(throttled=False)
+            with self._cond:
+                self.calls += 1
+            return result
+
+    def invoke(self, role: str, client: Any, model_input: Any) -> Any:
+        """client.invoke(model_input) through the gateway, with its latency and tokens accounted to role (model_config.py)."""
+        start = time.perf_counter()
+        response = self.call(lambda: client.invoke(model_input), role=role)
+        model_router.record(role, time.perf_counter() - start, response)
+        return response
+
+    async def ainvoke(self, role: str, client: Any, model_input: Any) -> Any:
+        start = time.perf_counter()
+        response = await self.acall(lambda: client.ainvoke(model_input), role=role)
+        model_router.record(role, time.perf_counter() - start, response)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "calls": self.calls, "retries": self.retries, "failures": self.failures, "throttled": self.throttled,
+                "queue_depth": len(self._waiting), "in_flight": self._in_flight, "concurrency_limit": round(self._limit, 2),
+            }
+
+
+llm_gateway = LLMGateway()
@@ -0,0 +1,103 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from model_config import model_router
+
+LLM_MAX_CLIENTS = int(os.getenv("LLM_MAX_CLIENTS", "32"))  # 0 = no limit
+LLM_CLIENT_IDLE_SECONDS = float(os.getenv("LLM_CLIENT_IDLE_SECONDS", "300"))  # 0 = never evict idle clients
+
+ClientKey = Tuple[str, float, str]
+
+
+def default_client_factory(model: str, temperature: float, role: str):
+    """
+    Builds a Gemini chat client with the role's timeout and output-token cap (model_config.py).
+    The Gemini package is imported lazily so the registry can be used with fake models.
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    route = model_router.route(role)
+    # Retries are handled by llm_gateway, which also adapts concurrency to quota errors
+    return ChatGoogleGenerativeAI(model=model, temperature=temperature, max_retries=0,
+                                  timeout=route.timeout or None, max_output_tokens=route.max_tokens or None)
+
+
+class LLMClientRegistry:
+    """
+    Process-wide registry of chat model clients keyed by (model, temperature, role). The model and
+    temperature default to the role's route in model_config.py.
+
+    Tools get the key's client with shared() instead of constructing a new one per call, so the client's
+    HTTP connection pool (and its TLS sessions) is reused across tools and interview sessions. The chat
+    clients are thread-safe, so one client per key serves any number of concurrent calls; how many run
+    at once is up to llm_gateway's concurrency limit. At most max_clients are kept (least recently used
+    are dropped first), and clients unused for idle_seconds are dropped on the next access.
+    """
+
+    def __init__(self, factory: Callable[[str, float, str], Any] = default_client_factory,
+                 max_clients: int = LLM_MAX_CLIENTS, idle_seconds: float = LLM_CLIENT_IDLE_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.factory = factory
+        self.max_clients = max_clients
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        # key -> (client, last_used), least recently used first
+        self._shared: "OrderedDict[ClientKey, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def _key(self, role: str, temperature: Optional[float], model: Optional[str]) -> ClientKey:
+        route = model_router.route(role)
+        return (model or route.model, float(route.temperature if temperature is None else temperature), role)
+
+    def _evict_locked(self, now: float) -> None:
+        # Callers holding an evicted client keep using it; the registry just stops handing it out
+        if self.idle_seconds:
+            while self._shared and now - next(iter(self._shared.values()))[1] >= self.idle_seconds:
+                self._shared.popitem(last=False)
+                self.evicted += 1
+        while self.max_clients and len(self._shared) > self.max_clients:
+            self._shared.popitem(last=False)
+            self.evicted += 1
+
+    def shared(self, role: str, temperature: Optional[float] = None, model: Optional[str] = None) -> Any:
+        """Returns the long-lived client for a key, creating it if there is none (or it was evicted)."""
+        key = self._key(role, temperature, model)
+        with self._lock:
+            now = self._clock()
+            self._evict_locked(now)
+            if key in self._shared:
+                client = self._shared[key][0]
+                self._shared[key] = (client, now)
+                self._shared.move_to_end(key)
+                self.reused += 1
+                return client
+            factory = self.factory
+        client = factory(key[0], key[1], key[2])
+        with self._lock:
+            # A client built by a factory replaced in the meantime is not kept
+            if factory is not self.factory:
+                return client
+            if key in self._shared:
+                return self._shared[key][0]
+            self.created += 1
+            self._shared[key] = (client, self._clock())
+            self._evict_locked(self._clock())
+            return client
+
+    def set_factory(self, factory: Callable[[str, float, str], Any]) -> None:
+        """Replaces the client factory (e.g. with a local fake model) and drops every cached client."""
+        with self._lock:
+            self.factory = factory
+            self._shared.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"created": self.created, "reused": self.reused, "evicted": self.evicted, "shared": len(self._shared)}
+
+
+llm_registry = LLMClientRegistry()
@@ -0,0 +1,115 @@
+"""Per-role model routes (model, temperature, timeout, output-token cap) and per-role call accounting."""
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, NamedTuple, Optional
+
+from telemetry import telemetry, llm_usage
+
+CHAT_MODEL = os.getenv("CHAT_MODEL", "gemini-2.0-flash")
+# Opt-in model for the orchestrator's routing steps; unset = CHAT_MODEL
+FAST_MODEL = os.getenv("FAST_MODEL") or CHAT_MODEL
+# Latencies kept per role for the percentiles in stats()
+LATENCY_WINDOW = 1000
+
+
+class ModelRoute(NamedTuple):
+    model: str
+    temperature: float
+    timeout: float  # seconds per request; 0 = the client's default
+    max_tokens: int  # output tokens; 0 = the model's limit
+
+
+# The evaluator runs at temperature 0, which the evaluation cache relies on
+DEFAULT_ROUTES = {
+    "orchestrator": ModelRoute(FAST_MODEL, 0.7, 0.0, 0),
+    "generator": ModelRoute(CHAT_MODEL, 0.8, 0.0, 0),
+    "evaluator": ModelRoute(CHAT_MODEL, 0.0, 0.0, 0),
+    "judge": ModelRoute(CHAT_MODEL, 0.2, 0.0, 0),
+}
+
+
+def route_from_env(role: str, default: ModelRoute) -> ModelRoute:
+    prefix = role.upper()
+    return ModelRoute(
+        model=os.getenv(f"{prefix}_MODEL", default.model),
+        temperature=float(os.getenv(f"{prefix}_TEMPERATURE", default.temperature)),
+        timeout=float(os.getenv(f"{prefix}_TIMEOUT_SECONDS", default.timeout)),
+        max_tokens=int(os.getenv(f"{prefix}_MAX_TOKENS", default.max_tokens)),
+    )
+
+
+class _RoleUsage:
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+
+class ModelRouter:
+    """
+    The route of each role, and latency and token accounting per role. llm_registry builds clients from
+    route(role); llm_gateway reports every successful call with record(). configure() changes a route
+    (e.g. from a benchmark flag); clients already created keep their settings until
+    llm_registry.set_factory() drops them.
+    """
+
+    def __init__(self, routes: Optional[Dict[str, ModelRoute]] = None):
+        self._lock = threading.Lock()
+        self._routes = dict(routes) if routes is not None else {role: route_from_env(role, route) for role, route in DEFAULT_ROUTES.items()}
+        self._usage: Dict[str, _RoleUsage] = {}
+
+    def route(self, role: str) -> ModelRoute:
+        with self._lock:
+            if role not in self._routes:
+                raise KeyError(f"No model route for role {role!r}; known roles: {', '.join(self._routes)}")
+            return self._routes[role]
+
+    def configure(self, role: str, **changes: Any) -> ModelRoute:
+        """Replaces fields of a role's route (model, temperature, timeout, max_tokens) and returns the new route."""
+        with self._lock:
+            self._routes[role] = self._routes[role]._replace(**changes)
+            return self._routes[role]
+
+    def routes(self) -> Dict[str, ModelRoute]:
+        with self._lock:
+            return dict(self._routes)
+
+    # --- Accounting ---
+    def record(self, role: str, seconds: float, message: Any) -> None:
+        """Accounts one completed call (wall time including gateway queueing and retries) to its role."""
+        usage = llm_usage(message)
+        with self._lock:
+            model = self._routes[role].model if role in self._routes else None
+            role_usage = self._usage.setdefault(role, _RoleUsage())
+            role_usage.calls += 1
+            role_usage.input_tokens += usage.get("input_tokens") or 0
+            role_usage.output_tokens += usage.get("output_tokens") or 0
+            role_usage.latencies.append(seconds)
+        telemetry.record_llm_call(role, message, model=model, seconds=seconds)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            summary = {}
+            for role, usage in sorted(self._usage.items()):
+                latencies = sorted(usage.latencies)
+                summary[role] = {
+                    "model": self._routes[role].model if role in self._routes else None,
+                    "calls": usage.calls,
+                    "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+                    "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1),
+                    "input_tokens": usage.input_tokens,
+                    "output_tokens": usage.output_tokens,
+                }
+            return summary
+
+    def reset(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the accounting so far and starts over (e.g. between benchmark modes)."""
+        summary = self.stats()
+        with self._lock:
+            self._usage.clear()
+        return summary
+
+
+model_router = ModelRouter()
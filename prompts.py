@@ -1,3 +1,8 @@
+import hashlib
+
+# First human message of every interview thread: asks the interviewer to greet the candidate. It is not shown in the chat.
+INIT_MESSAGE = "INITIALIZE_INTERVIEW_AGENT"
+
 # --- Prompts for the Static (JSON-based) Interviewer ---
 
 STATIC_SYSTEM_PROMPT = """
@@ -38,6 +43,16 @@ Your role is to evaluate a candidate's answer to a predefined Excel question.
 """
 
 
+STATIC_FAST_PATH_PHRASING_PROMPT = """
+Your name is Excel Ninja, a friendly but strict professional Excel interviewer.
+Write the next message of the interview in at most three sentences.
+{instruction}
+You MUST include the question below verbatim and you MUST NOT add hints, examples, or any part of the answer.
+**Question:** "{question}"
+**Your message:**
+"""
+
+
 # --- Prompts for the Dynamic (LLM-Generated) Interviewer ---
 
 DYNAMIC_SYSTEM_PROMPT = """
@@ -142,3 +157,41 @@ Your task is to provide a holistic assessment of the candidate's entire performa
 {interview_transcript}
 **Your Final Judgment (paragraph followed by "Final Rating: X/10"):**
 """
+
+# --- Prompts for Structured Turns (one model call per answered turn) ---
+
+STRUCTURED_TURN_PROMPT_TEMPLATE = """
+Your name is Excel Ninja, a friendly but strict professional Excel interviewer.
+You are handling one turn of a {interview_type} interview: evaluate the candidate's reply to the current question and prepare the next step.
+**INSTRUCTIONS:**
+1.  If the reply asks for clarification instead of answering, set is_answer to false, leave evaluation, verdict and next_question empty, and rephrase the question in message without adding hints or new information.
+2.  Otherwise, write a brief, constructive, one-paragraph evaluation of the answer for correctness, technical accuracy, and clarity. A confession of inability is "Incorrect".
+3.  Set verdict to exactly one of "Correct", "Partially Correct" or "Incorrect".
+4.  {next_question_instruction}
+5.  Write message: one or two sentences acknowledging the reply, addressed to the candidate. Do not reveal the evaluation or the verdict and do not include the next question.
+**INTERVIEW HISTORY:**
+{history}
+**CURRENT QUESTION:**
+"{question}"
+{expected_concepts}
+**CANDIDATE'S REPLY:**
+"{user_answer}"
+"""
+
+STRUCTURED_NEXT_QUESTION_INSTRUCTIONS = {
+    "last": "This was the last question: set next_question to null.",
+    "given": "The next question is fixed; set next_question to null.",
+    "Dynamic": "Set next_question to the next practical, scenario-based Excel question, adapted to this answer and different from every question already asked.",
+    "Hybrid": "Set next_question to the next practical, scenario-based Excel question inspired by (but not copied from) these curriculum topics, and different from every question already asked:\n{curriculum}",
+}
+
+STRUCTURED_JUDGING_PROMPT_TEMPLATE = """
+You are an expert AI Hiring Manager, acting as a final judge for a completed technical interview.
+Review the entire transcript below and assess the candidate's technical accuracy, clarity, problem-solving approach, and professionalism.
+Write a concise, one-paragraph summary of your assessment and give an overall rating from 1 to 10.
+**INTERVIEW TRANSCRIPT:**
+{interview_transcript}
+"""
+
+# Fingerprint of the evaluation prompts, recorded with re-graded results; it changes whenever either template is edited
+EVALUATION_PROMPT_VERSION = hashlib.sha256((STATIC_EVALUATION_PROMPT_TEMPLATE + DYNAMIC_EVALUATION_PROMPT_TEMPLATE).encode("utf-8")).hexdigest()[:12]
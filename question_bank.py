@@ -0,0 +1,216 @@
+import os
+import json
+import random
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+QUESTIONS_FILE = "questions.json"
+QUESTION_BANK_DB = os.getenv("QUESTION_BANK_DB", "questions.db")
+# Questions per Static/Hybrid interview when the roster does not set num_questions
+DEFAULT_SAMPLE_SIZE = int(os.getenv("QUESTIONS_PER_INTERVIEW", "5"))
+# Curriculum items shown to the Hybrid question generator per turn
+HYBRID_CURRICULUM_SLICE = int(os.getenv("HYBRID_CURRICULUM_SLICE", "3"))
+
+DIFFICULTY_ORDER = {"Easy": 0, "Medium": 1, "Hard": 2}
+COLUMNS = ("id", "category", "difficulty", "question", "expected_concepts")
+
+Stratum = Tuple[str, str]
+
+
+def _question_hash(text: str) -> str:
+    return hashlib.sha1(text.strip().encode("utf-8")).hexdigest()
+
+
+def _source_signature(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def compile_bank(json_path: str = QUESTIONS_FILE, db_path: str = QUESTION_BANK_DB) -> int:
+    """
+    Compiles the authoring file (questions.json) into the indexed SQLite bank used at runtime.
+    The bank is built in a temporary file and swapped in, so readers never see a half-built bank.
+    Returns the number of questions.
+    """
+    with open(json_path, "r") as f:
+        questions = json.load(f)
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(
+            """
+            CREATE TABLE questions (
+                id INTEGER PRIMARY KEY,
+                category TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                question TEXT NOT NULL,
+                expected_concepts TEXT,
+                question_hash TEXT NOT NULL
+            );
+            CREATE INDEX idx_questions_stratum ON questions(category, difficulty);
+            CREATE INDEX idx_questions_hash ON questions(question_hash);
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        conn.executemany(
+            "INSERT INTO questions (id, category, difficulty, question, expected_concepts, question_hash) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (q.get("id", i), q.get("category", "General"), q.get("difficulty", "Medium"), q["question"], q.get("expected_concepts", ""), _question_hash(q["question"]))
+                for i, q in enumerate(questions, 1)
+            ],
+        )
+        conn.execute("INSERT INTO meta (key, value) VALUES ('source_signature', ?)", (_source_signature(json_path),))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return len(questions)
+
+
+class QuestionBank:
+    """
+    Indexed, lazily loaded question bank.
+
+    Questions live in a compact SQLite file compiled from questions.json (recompiled whenever the
+    JSON changes). Only the (category, difficulty) -> ids index is kept in memory; question text is
+    read on demand for the questions actually sampled, so memory and start-up cost do not grow with
+    the bank.
+    """
+
+    def __init__(self, json_path: str = QUESTIONS_FILE, db_path: str = QUESTION_BANK_DB):
+        self.json_path = json_path
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._strata: Optional[Dict[Stratum, List[int]]] = None
+
+    # --- Loading ---
+    def _ensure_compiled(self) -> None:
+        if not os.path.exists(self.json_path):
+            if not os.path.exists(self.db_path):
+                raise FileNotFoundError(f"Neither {self.json_path} nor {self.db_path} exists.")
+            return
+        signature = _source_signature(self.json_path)
+        if os.path.exists(self.db_path):
+            conn = sqlite3.connect(self.db_path)
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'source_signature'").fetchone()
+            except sqlite3.DatabaseError:
+                row = None
+            finally:
+                conn.close()
+            if row and row[0] == signature:
+                return
+        count = compile_bank(self.json_path, self.db_path)
+        print(f"Compiled question bank: {count} questions into '{self.db_path}'.")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def _index(self) -> Dict[Stratum, List[int]]:
+        with self._lock:
+            if self._strata is None:
+                self._ensure_compiled()
+                strata: Dict[Stratum, List[int]] = {}
+                for question_id, category, difficulty in self._connect().execute("SELECT id, category, difficulty FROM questions ORDER BY id"):
+                    strata.setdefault((category, difficulty), []).append(question_id)
+                self._strata = strata
+            return self._strata
+
+    def reload(self) -> None:
+        """Drops the in-memory index so the next call recompiles (if needed) and reloads the bank."""
+        with self._lock:
+            self._strata = None
+            conn = getattr(self._local, "conn", None)
+            if conn is not None:
+                conn.close()
+                self._local.conn = None
+
+    # --- Queries ---
+    def count(self, category: Optional[str] = None, difficulty: Optional[str] = None) -> int:
+        return sum(len(ids) for (c, d), ids in self._index().items() if category in (None, c) and difficulty in (None, d))
+
+    def categories(self) -> List[str]:
+        return sorted({c for c, _ in self._index()})
+
+    def difficulties(self) -> List[str]:
+        return sorted({d for _, d in self._index()}, key=lambda d: DIFFICULTY_ORDER.get(d, len(DIFFICULTY_ORDER)))
+
+    def get(self, ids: Iterable[int]) -> List[dict]:
+        """Returns the questions with the given ids, in the given order."""
+        ids = list(ids)
+        if not ids:
+            return []
+        self._index()
+        placeholders = ",".join("?" * len(ids))
+        rows = self._connect().execute(f"SELECT {', '.join(COLUMNS)} FROM questions WHERE id IN ({placeholders})", ids)
+        by_id = {row[0]: dict(zip(COLUMNS, row)) for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def texts(self) -> List[str]:
+        """Every question's text (used to build the near-duplicate index)."""
+        self._index()
+        return [row[0] for row in self._connect().execute("SELECT question FROM questions ORDER BY id")]
+
+    def find_by_question(self, text: str) -> Optional[dict]:
+        """Looks a question up by its exact text (surrounding whitespace ignored)."""
+        self._index()
+        row = self._connect().execute(f"SELECT {', '.join(COLUMNS)} FROM questions WHERE question_hash = ?", (_question_hash(text),)).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def sample(self, n: Optional[int], seed: str, categories: Optional[List[str]] = None,
+               difficulties: Optional[List[str]] = None) -> List[dict]:
+        """
+        Draws n questions stratified by (category, difficulty), ordered from easy to hard.
+        The same seed (e.g. the candidate's username) always gives the same questions for the same bank.
+        """
+        strata = {
+            key: ids for key, ids in self._index().items()
+            if (not categories or key[0] in categories) and (not difficulties or key[1] in difficulties)
+        }
+        total = sum(len(ids) for ids in strata.values())
+        n = min(n or DEFAULT_SAMPLE_SIZE, total)
+        rng = random.Random(str(seed))
+        keys = sorted(strata)
+        if n < len(keys):
+            quotas = {key: 1 for key in rng.sample(keys, n)}
+        else:
+            # One question per stratum, then the rest proportionally to stratum size (largest remainder)
+            quotas = {key: 1 for key in keys}
+            remaining = n - len(keys)
+            spare = {key: len(strata[key]) - 1 for key in keys}
+            spare_total = sum(spare.values())
+            if remaining and spare_total:
+                shares = {key: remaining * spare[key] / spare_total for key in keys}
+                for key in keys:
+                    quotas[key] += int(shares[key])
+                leftover = n - sum(quotas.values())
+                for key in sorted(keys, key=lambda k: (shares[k] - int(shares[k]), rng.random()), reverse=True):
+                    if leftover <= 0:
+                        break
+                    if quotas[key] < len(strata[key]):
+                        quotas[key] += 1
+                        leftover -= 1
+        picked = [(key, question_id) for key, quota in quotas.items() for question_id in rng.sample(strata[key], quota)]
+        rng.shuffle(picked)
+        picked.sort(key=lambda item: DIFFICULTY_ORDER.get(item[0][1], len(DIFFICULTY_ORDER)))
+        return self.get(question_id for _, question_id in picked)
+
+
+def curriculum_slice(curriculum: List[dict], asked: int, size: int = HYBRID_CURRICULUM_SLICE) -> List[dict]:
+    """The next `size` curriculum items after the `asked` already covered (wrapping around), for the Hybrid generator."""
+    if not curriculum:
+        return []
+    size = min(size, len(curriculum))
+    return [curriculum[(asked + i) % len(curriculum)] for i in range(size)]
+
+
+question_bank = QuestionBank()
@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import uuid
+import atexit
+import threading
+from typing import Callable, Dict, List, Optional
+
+from storage import StorageBackend, get_backend
+
+JOURNAL_FILE = os.getenv("RESULTS_JOURNAL_FILE", "results_journal.jsonl")
+COMPACT_BATCH_SIZE = int(os.getenv("RESULTS_COMPACT_BATCH_SIZE", "100"))
+COMPACT_INTERVAL_SECONDS = float(os.getenv("RESULTS_COMPACT_INTERVAL_SECONDS", "2.0"))
+
+
+class ResultsJournal:
+    """
+    Write-behind journal for finished interviews.
+
+    append() writes one fsync'd JSON line and returns, so finishing an interview costs the same
+    regardless of how big the results store is. A background compactor merges batches of entries
+    into the store with save_results_batch (one rewrite per batch for the Excel backend) and records
+    the compacted byte offset in a sidecar file. On start-up, entries past that offset are replayed.
+    Replaying an entry twice is harmless because saving results is idempotent.
+    """
+
+    def __init__(
+        self,
+        path: str = JOURNAL_FILE,
+        backend_getter: Callable[[], StorageBackend] = get_backend,
+        batch_size: int = COMPACT_BATCH_SIZE,
+        interval: float = COMPACT_INTERVAL_SECONDS,
+        on_compacted: Optional[Callable[[List[dict]], None]] = None,
+    ):
+        self.path = path
+        self.offset_path = f"{path}.offset"
+        self.batch_size = batch_size
+        self.interval = interval
+        self.on_compacted = on_compacted
+        self._backend_getter = backend_getter
+        self._append_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Dict[str, dict] = {}
+
+    # --- Offsets ---
+    def _read_offset(self) -> int:
+        try:
+            with open(self.offset_path, "r") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _write_offset(self, offset: int) -> None:
+        tmp_path = f"{self.offset_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.offset_path)
+
+    def _read_entries(self, offset: int) -> List[tuple]:
+        """
+        Returns (entry, end_offset) pairs for complete lines after offset. Lines that do not parse are
+        skipped, so one corrupt entry does not block every entry after it.
+        """
+        entries = []
+        try:
+            with open(self.path, "rb") as f:
+                if offset > os.fstat(f.fileno()).st_size:
+                    # The journal was emptied after this offset was recorded; everything in it is new
+                    offset = 0
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        entries.append((json.loads(line), offset))
+                    except ValueError as e:
+                        print(f"Skipping unreadable results journal line ending at byte {offset}: {e}")
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _drop_torn_tail(self) -> None:
+        """Truncates a partially written last line left behind by a crash."""
+        try:
+            with open(self.path, "rb+") as f:
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    f.truncate(data.rfind(b"\n") + 1)
+        except FileNotFoundError:
+            pass
+
+    # --- Public API ---
+    def start(self) -> None:
+        """Replays entries that were not yet compacted and starts the background compactor."""
+        with self._append_lock:
+            if self._thread is not None:
+                return
+            self._drop_torn_tail()
+            for entry, _ in self._read_entries(self._read_offset()):
+                self._pending[entry["username"]] = entry
+            self._thread = threading.Thread(target=self._run, name="results-compactor", daemon=True)
+            self._thread.start()
+        if self._pending:
+            print(f"Replaying {len(self._pending)} journaled interview result(s).")
+            self._wakeup.set()
+        atexit.register(self.stop)
+
+    def append(self, username: str, feedback_report: list, final_rating: Optional[str]) -> str:
+        """Durably records an interview result and returns its entry id. Raises if the write fails."""
+        entry = {
+            "id": uuid.uuid4().hex,
+            "ts": time.time(),
+            "username": username,
+            "final_rating": final_rating,
+            "feedback_report": feedback_report,
+        }
+        line = (json.dumps(entry, default=str) + "\n").encode("utf-8")
+        with self._append_lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._pending[username] = entry
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return entry["id"]
+
+    def is_pending(self, username: str) -> bool:
+        """True if the user has a journaled result that is not yet in the store."""
+        return username in self._pending
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def compact(self) -> int:
+        """Merges all journaled entries into the store. Returns the number of entries applied."""
+        with self._compact_lock:
+            applied = 0
+            offset = self._read_offset()
+            entries = self._read_entries(offset)
+            for start in range(0, len(entries), self.batch_size):
+                batch = entries[start:start + self.batch_size]
+                records = [entry for entry, _ in batch]
+                saved = self._backend_getter().save_results_batch(records)
+                for record, ok in zip(records, saved):
+                    if not ok:
+                        print(f"Dropping journaled result for unknown user '{record['username']}'.")
+                offset = batch[-1][1]
+                self._write_offset(offset)
+                # Notify before clearing pending so readers never see the user as neither pending nor saved
+                if self.on_compacted:
+                    try:
+                        self.on_compacted(records)
+                    except Exception as e:
+                        # The batch is already saved and past the offset, so it must not stay pending
+                        print(f"Error in results journal compaction callback: {e}")
+                with self._append_lock:
+                    for record in records:
+                        if self._pending.get(record["username"], {}).get("id") == record["id"]:
+                            del self._pending[record["username"]]
+                applied += len(records)
+            self._rotate(offset)
+            return applied
+
+    def _rotate(self, offset: int) -> None:
+        """Empties the journal once everything in it has been compacted."""
+        with self._append_lock:
+            try:
+                if offset == 0 or os.path.getsize(self.path) != offset:
+                    return
+            except FileNotFoundError:
+                return
+            # Offset first: a crash before the truncation only replays entries, which is idempotent
+            self._write_offset(0)
+            with open(self.path, "wb") as f:
+                os.fsync(f.fileno())
+
+    def stop(self) -> None:
+        """Stops the compactor after a final compaction."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self._compact_safely()
+        self._compact_safely()
+
+    def _compact_safely(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            # Entries stay in the journal and are retried on the next cycle
+            print(f"Error compacting results journal: {e}")
+
+
+results_journal = ResultsJournal()
@@ -0,0 +1,221 @@
+"""Tracks live interview threads and evicts (archives) idle ones to bound per-worker memory."""
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from telemetry import telemetry
+from checkpointing import PrunedSqliteSaver
+
+SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "1800"))
+SESSION_MAX_LIVE = int(os.getenv("SESSION_MAX_LIVE", "200"))  # 0 = no limit
+SESSION_MAX_RSS_MB = float(os.getenv("SESSION_MAX_RSS_MB", "0"))  # 0 = no limit
+# Limits are soft: a session active this recently is never evicted, so a running turn keeps its thread
+SESSION_MIN_IDLE_SECONDS = float(os.getenv("SESSION_MIN_IDLE_SECONDS", "60"))
+SESSION_SWEEP_SECONDS = float(os.getenv("SESSION_SWEEP_SECONDS", "30"))
+SESSION_ARCHIVE_FILE = os.getenv("SESSION_ARCHIVE_FILE", "sessions.db")
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """Current resident set size of the process (Linux /proc), or the peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def copy_thread(source: Any, target: Any, thread_id: str) -> bool:
+    """Copies the latest checkpoint of a thread (and its pending writes) between checkpointers."""
+    saved = source.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+    if saved is None:
+        return False
+    config = target.put(
+        {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}},
+        saved.checkpoint, saved.metadata, saved.checkpoint["channel_versions"],
+    )
+    writes: Dict[str, list] = {}
+    for task_id, channel, value in saved.pending_writes or []:
+        writes.setdefault(task_id, []).append((channel, value))
+    for task_id, task_writes in writes.items():
+        target.put_writes(config, task_writes, task_id)
+    return True
+
+
+class SessionManager:
+    """
+    Last-activity bookkeeping and eviction for interview threads. The app touches a thread on every
+    rerun; touching an evicted thread restores it. Sweeps run on touch (at most every sweep_seconds)
+    and from a background thread once start() is called, so abandoned sessions are released too.
+    """
+
+    def __init__(self, idle_seconds: float = SESSION_IDLE_SECONDS, max_live: int = SESSION_MAX_LIVE,
+                 max_rss_mb: float = SESSION_MAX_RSS_MB, min_idle_seconds: float = SESSION_MIN_IDLE_SECONDS,
+                 sweep_seconds: float = SESSION_SWEEP_SECONDS, archive_path: str = SESSION_ARCHIVE_FILE):
+        self.idle_seconds = idle_seconds
+        self.max_live = max_live
+        self.max_rss_mb = max_rss_mb
+        self.min_idle_seconds = min_idle_seconds
+        self.sweep_seconds = sweep_seconds
+        self.archive_path = archive_path
+        self.checkpointer = None
+        self._archive: Optional[PrunedSqliteSaver] = None
+        self._lock = threading.RLock()
+        # thread_id -> {"username", "interview_type", "last_active"}, least recently active first
+        self._live: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._swept_at = 0.0
+        self._started = False
+        self.evictions = 0
+        self.restores = 0
+
+    def bind(self, checkpointer: Any) -> None:
+        """Sets the checkpointer whose threads are managed (the app's shared checkpointer)."""
+        with self._lock:
+            self.checkpointer = checkpointer
+
+    # --- Archive ---
+    def _persistent(self) -> bool:
+        return not isinstance(self.checkpointer, MemorySaver)
+
+    def _archive_locked(self) -> PrunedSqliteSaver:
+        if self._archive is None:
+            conn = sqlite3.connect(self.archive_path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._archive = PrunedSqliteSaver(conn, keep_last=1)
+        return self._archive
+
+    # --- Activity ---
+    def touch(self, thread_id: str, username: str, interview_type: Optional[str] = None) -> bool:
+        """
+        Marks a thread as active, restoring it first if it was evicted. Returns True if it was restored.
+        """
+        with self._lock:
+            restored = False
+            if thread_id not in self._live and not self._persistent():
+                restored = self._restore_locked(thread_id)
+            self._live[thread_id] = {"username": username, "interview_type": interview_type, "last_active": time.monotonic()}
+            self._live.move_to_end(thread_id)
+            if time.monotonic() - self._swept_at >= self.sweep_seconds:
+                self._sweep_locked()
+            self._publish_locked()
+            return restored
+
+    def end(self, thread_id: str) -> None:
+        """Stops tracking a finished interview and drops its archived copy."""
+        with self._lock:
+            self._live.pop(thread_id, None)
+            if not self._persistent() and os.path.exists(self.archive_path):
+                self._archive_locked().delete_thread(thread_id)
+            self._publish_locked()
+
+    def find_thread(self, username: str) -> Optional[str]:
+        """The candidate's unfinished interview thread: live, in the checkpointer's registry or archived."""
+        with self._lock:
+            for thread_id, session in reversed(self._live.items()):
+                if session["username"] == username:
+                    return thread_id
+            thread_id = self.checkpointer.find_thread(username) if self.checkpointer is not None else None
+            if thread_id is None and not self._persistent() and os.path.exists(self.archive_path):
+                thread_id = self._archive_locked().find_thread(username)
+            return thread_id
+
+    # --- Eviction ---
+    def _evict_locked(self, thread_id: str, reason: str) -> None:
+        session = self._live[thread_id]
+        if not self._persistent():
+            archive = self._archive_locked()
+            if copy_thread(self.checkpointer, archive, thread_id):
+                archive.register_thread(session["username"], thread_id, session["interview_type"])
+            self.checkpointer.delete_thread(thread_id)
+        # Only dropped once archived, so a failed archive write leaves the session tracked for the next sweep
+        del self._live[thread_id]
+        self.evictions += 1
+        telemetry.increment("sessions_evicted_total", reason=reason)
+
+    def _restore_locked(self, thread_id: str) -> bool:
+        if not os.path.exists(self.archive_path):
+            return False
+        archive = self._archive_locked()
+        if not copy_thread(archive, self.checkpointer, thread_id):
+            return False
+        archive.delete_thread(thread_id)
+        self.restores += 1
+        telemetry.increment("sessions_restored_total")
+        return True
+
+    def _sweep_locked(self) -> int:
+        self._swept_at = now = time.monotonic()
+        evicted = 0
+        for thread_id, session in list(self._live.items()):
+            if now - session["last_active"] >= self.idle_seconds:
+                self._evict_locked(thread_id, "idle")
+                evicted += 1
+        # Caps evict the least recently active sessions, skipping any active in the last min_idle_seconds
+        evictable = [t for t, s in self._live.items() if now - s["last_active"] >= self.min_idle_seconds]
+        while self.max_live and len(self._live) > self.max_live and evictable:
+            self._evict_locked(evictable.pop(0), "sessions")
+            evicted += 1
+        rss = resident_memory_bytes()
+        if self.max_rss_mb and rss and rss > self.max_rss_mb * 1024 * 1024 and evictable:
+            # Freed memory is not returned to the OS at once, so evict a quarter of the evictable sessions per sweep
+            for thread_id in evictable[:max(1, len(evictable) // 4)]:
+                self._evict_locked(thread_id, "memory")
+                evicted += 1
+        return evicted
+
+    def sweep(self) -> int:
+        """Evicts idle sessions and enforces the caps now. Returns the number evicted."""
+        with self._lock:
+            evicted = self._sweep_locked()
+            self._publish_locked()
+            return evicted
+
+    def start(self) -> None:
+        """Sweeps every sweep_seconds in a daemon thread, so sessions nobody touches are released too."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        def sweep_loop():
+            while True:
+                time.sleep(self.sweep_seconds)
+                self._sweep_safely()
+
+        threading.Thread(target=sweep_loop, name="session-sweeper", daemon=True).start()
+
+    def _sweep_safely(self) -> None:
+        try:
+            self.sweep()
+        except Exception as e:
+            # Sessions not evicted now are retried on the next sweep
+            print(f"Error sweeping interview sessions: {e}")
+
+    # --- Reads ---
+    def _publish_locked(self) -> None:
+        telemetry.set_gauge("sessions_live", len(self._live))
+        rss = resident_memory_bytes()
+        if rss:
+            telemetry.set_gauge("process_resident_memory_bytes", rss)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rss = resident_memory_bytes()
+            return {
+                "live": len(self._live), "evictions": self.evictions, "restores": self.restores,
+                "rss_mb": round(rss / (1024 * 1024), 1) if rss else None,
+            }
+
+
+session_manager = SessionManager()
@@ -0,0 +1,123 @@
+import os
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional
+
+from telemetry import telemetry
+from deadlines import clear_turn, remaining, reserve_seconds
+
+SPECULATIVE_QUESTIONS = os.getenv("SPECULATIVE_QUESTIONS", "0") == "1"
+SPECULATIVE_WORKERS = int(os.getenv("SPECULATIVE_WORKERS", "4"))
+SPECULATIVE_WAIT_SECONDS = float(os.getenv("SPECULATIVE_WAIT_SECONDS", "30"))
+
+# The interviewer's free-text request is not known ahead of time, so speculation uses a generic one
+SPECULATIVE_REQUEST = "Generate the next logical question, following up on how the candidate answered the previous one."
+
+BRANCH_VERDICTS = {"correct": "Correct", "incorrect": "Incorrect"}
+
+
+def verdict_branch(verdict: str) -> str:
+    """Maps an evaluation verdict onto a speculation branch. Partially correct answers take the 'incorrect' branch."""
+    return "correct" if verdict.strip().lower().startswith("correct") else "incorrect"
+
+
+class _Speculation:
+    def __init__(self, history_length: int, futures: Dict[str, Future]):
+        self.history_length = history_length
+        self.futures = futures
+
+
+class SpeculativeQuestionGenerator:
+    """
+    Pre-generates the next Dynamic/Hybrid question while the candidate is answering.
+
+    As soon as a question is shown, prefetch() starts one generation for each verdict branch, using
+    the feedback history plus the shown question marked Correct or Incorrect. Once the real verdict
+    arrives, take() returns the matching question and discards the other, so the generation call no
+    longer runs after the evaluation call.
+    """
+
+    def __init__(self, generate_fn: Callable[..., str], max_workers: int = SPECULATIVE_WORKERS,
+                 wait_seconds: float = SPECULATIVE_WAIT_SECONDS):
+        self.generate_fn = generate_fn
+        self.wait_seconds = wait_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative-question")
+        self._lock = threading.Lock()
+        self._speculations: Dict[str, _Speculation] = {}
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def prefetch(self, thread_id: str, interview_type: str, feedback_report: List[dict],
+                 interview_questions: List[dict], shown_question: str) -> None:
+        """Starts generating both candidate follow-ups for the question that was just shown."""
+        futures = {}
+        for branch, verdict in BRANCH_VERDICTS.items():
+            history = list(feedback_report) + [{"question": shown_question, "verdict": verdict}]
+            # Run in a copy of the caller's context so telemetry labels (thread_id, interview type) carry over,
+            # but not the turn's deadline: the speculation is meant to outlive the turn that started it
+            context = contextvars.copy_context()
+            context.run(clear_turn)
+            futures[branch] = self._executor.submit(
+                context.run, self.generate_fn, interview_type, history, interview_questions, SPECULATIVE_REQUEST
+            )
+        with self._lock:
+            previous = self._speculations.pop(thread_id, None)
+            self._speculations[thread_id] = _Speculation(len(feedback_report) + 1, futures)
+        if previous is not None:
+            self._discard(previous.futures.values())
+
+    def take(self, thread_id: str, feedback_report: List[dict]) -> Optional[str]:
+        """Returns the pre-generated question matching the latest verdict, or None if there isn't a usable one."""
+        with self._lock:
+            speculation = self._speculations.pop(thread_id, None)
+        if speculation is None or not feedback_report or speculation.history_length != len(feedback_report):
+            if speculation is not None:
+                self._discard(speculation.futures.values())
+            with self._lock:
+                self.misses += 1
+            return None
+        branch = verdict_branch(feedback_report[-1].get("verdict", ""))
+        self._discard(f for name, f in speculation.futures.items() if name != branch)
+        # Never wait past the point where generating normally would still fit in the turn's budget
+        wait = self.wait_seconds
+        left = remaining()
+        if left is not None:
+            wait = max(0.0, min(wait, left - reserve_seconds()))
+        try:
+            question = speculation.futures[branch].result(timeout=wait)
+        except FutureTimeoutError:
+            telemetry.increment("speculative_failures_total", error="Timeout")
+            telemetry.annotate("speculative_error", f"not ready within {wait:.2f}s")
+            with self._lock:
+                self.misses += 1
+            return None
+        except Exception as e:
+            # Generating normally is the fallback, so the failure is only recorded
+            telemetry.increment("speculative_failures_total", error=type(e).__name__)
+            telemetry.annotate("speculative_error", f"{type(e).__name__}: {e}")
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return question
+
+    def cancel(self, thread_id: str) -> None:
+        """Drops any pending speculation for a thread (e.g. when the interview ends)."""
+        with self._lock:
+            speculation = self._speculations.pop(thread_id, None)
+        if speculation is not None:
+            self._discard(speculation.futures.values())
+
+    def _discard(self, futures) -> None:
+        futures = list(futures)
+        for future in futures:
+            future.cancel()
+        with self._lock:
+            self.discarded += len(futures)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "discarded": self.discarded, "pending": len(self._speculations)}
@@ -0,0 +1,565 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from question_bank import question_bank, DEFAULT_SAMPLE_SIZE
+
+EXCEL_FILE = "user_credential_and_analysis.xlsx"
+DB_FILE = os.getenv("RESULTS_DB_FILE", "interviews.db")
+
+ROSTER_COLUMNS = ["username", "interview_type", "num_questions", "test_taken", "final_rating"]
+# Roster columns the admin can edit; the rest are written by finished interviews only
+EDITABLE_COLUMNS = ["username", "interview_type", "num_questions"]
+
+DEFAULT_USERS = [
+    {"username": "user1", "interview_type": "Static", "num_questions": None},
+    {"username": "user2", "interview_type": "Dynamic", "num_questions": 4},
+    {"username": "user3", "interview_type": "Hybrid", "num_questions": 5},
+]
+
+
+# --- Shared helpers ---
+def count_static_questions() -> int:
+    """Returns the number of questions in a default-sized Static interview (used to size the answer columns)."""
+    try:
+        return min(question_bank.count(), DEFAULT_SAMPLE_SIZE)
+    except FileNotFoundError:
+        return DEFAULT_SAMPLE_SIZE
+
+def result_columns(num_questions: int) -> List[str]:
+    """Returns the interleaved answer_i/evaluation_i column names for a results table."""
+    columns = []
+    for i in range(1, num_questions + 1):
+        columns.append(f"answer_{i}")
+        columns.append(f"evaluation_{i}")
+    return columns
+
+def parse_verdict(evaluation_text: str) -> str:
+    """Extracts the 'Verdict: ...' suffix from an evaluation, or 'N/A' if there is none."""
+    verdict_prefix = "Verdict: "
+    if verdict_prefix in evaluation_text:
+        return evaluation_text.split(verdict_prefix)[-1].strip()
+    return "N/A"
+
+def format_report_entry(report: dict) -> Dict[str, str]:
+    """
+    Converts one feedback_report entry into the stored (answer, evaluation) cell values. Cells written
+    before batch re-grading have no "Candidate's Answer" section; parse_report_entry reads both.
+    """
+    return {
+        "answer": parse_verdict(report["evaluation"]),
+        "evaluation": f"Question: {report['question']}\n\nCandidate's Answer: {report.get('user_answer', '')}\n\nEvaluation: {report['evaluation']}",
+    }
+
+def parse_report_entry(evaluation_cell) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Recovers the question, candidate answer and evaluation from a stored evaluation cell.
+    Cells written before candidate answers were stored (only the question and the evaluation) parse
+    with user_answer None. Returns None for empty cells and for text in neither format.
+    """
+    if evaluation_cell is None or pd.isna(evaluation_cell):
+        return None
+    text = str(evaluation_cell)
+    if not text.startswith("Question: "):
+        return None
+    if "\n\nCandidate's Answer: " in text:
+        question, _, rest = text[len("Question: "):].partition("\n\nCandidate's Answer: ")
+        user_answer, _, evaluation = rest.rpartition("\n\nEvaluation: ")
+        return {"question": question, "user_answer": user_answer, "evaluation": evaluation}
+    if "\n\nEvaluation: " in text:
+        question, _, evaluation = text[len("Question: "):].partition("\n\nEvaluation: ")
+        return {"question": question, "user_answer": None, "evaluation": evaluation}
+    return None
+
+def filter_roster(roster: pd.DataFrame, search: Optional[str] = None, interview_type: Optional[str] = None,
+                  test_taken: Optional[bool] = None) -> pd.DataFrame:
+    """Applies the admin dashboard filters to a roster table (username substring, interview type, status)."""
+    mask = pd.Series(True, index=roster.index)
+    if search:
+        mask &= roster["username"].astype(str).str.contains(search, case=False, regex=False)
+    if interview_type:
+        mask &= roster["interview_type"] == interview_type
+    if test_taken is not None:
+        mask &= roster["test_taken"].fillna(False).astype(bool) == test_taken
+    return roster[mask]
+
+def _is_taken(value) -> bool:
+    return value is True or (not pd.isna(value) and bool(value) and value != 0)
+
+def _to_optional_int(value) -> Optional[int]:
+    if value is None or pd.isna(value):
+        return None
+    return int(value)
+
+def _file_signature(*paths: str) -> tuple:
+    """Returns (mtime_ns, size) for each path, or None for paths that don't exist."""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+def user_record_from_row(row) -> dict:
+    """Builds the roster record returned by get_user from a row of the results table."""
+    return {
+        "username": row["username"],
+        "interview_type": row["interview_type"],
+        "num_questions": _to_optional_int(row["num_questions"]),
+        "test_taken": _is_taken(row["test_taken"]),
+        "final_rating": None if pd.isna(row["final_rating"]) else row["final_rating"],
+    }
+
+
+# --- Backend Interface ---
+class StorageBackend:
+    """Interface every results store implements. excel_handler delegates to the active backend."""
+
+    name = "base"
+
+    def initialize(self) -> None:
+        raise NotImplementedError
+
+    def get_user(self, username: str) -> Optional[dict]:
+        """Returns the roster fields for a user, or None if the username does not exist."""
+        raise NotImplementedError
+
+    def save_results(self, username: str, feedback_report: list, final_rating: Optional[str]) -> bool:
+        """Marks the user as having taken the test and stores their answers. Returns False for unknown users."""
+        raise NotImplementedError
+
+    def save_results_batch(self, entries: List[dict]) -> List[bool]:
+        """
+        Saves several interviews at once. Each entry has username, feedback_report and final_rating.
+        Backends override this to apply the whole batch in a single write.
+        """
+        return [self.save_results(e["username"], e["feedback_report"], e["final_rating"]) for e in entries]
+
+    def get_all_results(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def signature(self) -> tuple:
+        """Returns a cheap fingerprint of the underlying files; it changes whenever the data may have changed."""
+        raise NotImplementedError
+
+    def replace_user_table(self, df: pd.DataFrame) -> None:
+        """Replaces the roster with the admin-edited table."""
+        raise NotImplementedError
+
+    def export_to_excel(self, target) -> None:
+        """Writes the full results table as an Excel report to a path or file-like object."""
+        self.get_all_results().to_excel(target, index=False)
+
+    # --- Roster queries (no answer/evaluation columns) ---
+    # The defaults work from the full table; backends with an index override them.
+    def get_roster(self) -> pd.DataFrame:
+        """Returns the ROSTER_COLUMNS of every user."""
+        return self.get_all_results()[ROSTER_COLUMNS]
+
+    def list_users(self, offset: int = 0, limit: int = 50, search: Optional[str] = None,
+                   interview_type: Optional[str] = None, test_taken: Optional[bool] = None) -> pd.DataFrame:
+        """Returns one page of the filtered roster, in insertion order."""
+        roster = filter_roster(self.get_roster(), search, interview_type, test_taken)
+        return roster.iloc[offset:offset + limit].reset_index(drop=True)
+
+    def count_users(self, search: Optional[str] = None, interview_type: Optional[str] = None,
+                    test_taken: Optional[bool] = None) -> int:
+        return len(filter_roster(self.get_roster(), search, interview_type, test_taken))
+
+    def get_user_results(self, username: str) -> List[dict]:
+        """Returns a user's stored answers as [{"index", "answer", "evaluation"}], in question order."""
+        df = self.get_all_results()
+        rows = df[df["username"] == username]
+        if rows.empty:
+            return []
+        row, results, i = rows.iloc[0], [], 1
+        while f"answer_{i}" in df.columns or f"evaluation_{i}" in df.columns:
+            answer, evaluation = row.get(f"answer_{i}"), row.get(f"evaluation_{i}")
+            if not (pd.isna(answer) and pd.isna(evaluation)):
+                results.append({"index": i, "answer": None if pd.isna(answer) else answer, "evaluation": None if pd.isna(evaluation) else evaluation})
+            i += 1
+        return results
+
+    def apply_roster_changes(self, updates: Dict[str, dict], added: List[dict], deleted: List[str]) -> None:
+        """
+        Applies an admin edit as a diff: updates maps an existing username to its changed EDITABLE_COLUMNS,
+        added holds new users and deleted lists usernames to remove. Results of untouched users are kept.
+        """
+        df = self.get_all_results()
+        df = df[~df["username"].isin(deleted)].copy()
+        # Rows are matched on their usernames before the edit, so swapped or chained renames hit the right rows
+        original = df["username"].astype(str).copy()
+        for username, fields in updates.items():
+            for column, value in fields.items():
+                df[column] = df[column].astype(object)
+                df.loc[original == username, column] = value
+        if added:
+            df = pd.concat([df, pd.DataFrame(added, columns=EDITABLE_COLUMNS).assign(test_taken=False)], ignore_index=True)
+        self.replace_user_table(df)
+
+
+# --- Excel Backend (legacy live store) ---
+class ExcelBackend(StorageBackend):
+    """Keeps everything in a single workbook. Every write rewrites the whole file."""
+
+    name = "excel"
+
+    def __init__(self, path: str = EXCEL_FILE):
+        self.path = path
+
+    def initialize(self) -> None:
+        if os.path.exists(self.path):
+            return
+        columns = ROSTER_COLUMNS + result_columns(count_static_questions())
+        df = pd.concat([pd.DataFrame(columns=columns), pd.DataFrame(DEFAULT_USERS)], ignore_index=True)
+        # Ensure correct column order and handle NaNs for empty cells
+        df = df.reindex(columns=columns)
+        df.to_excel(self.path, index=False)
+        print(f"'{self.path}' created with default users.")
+
+    def _read(self) -> pd.DataFrame:
+        try:
+            df = pd.read_excel(self.path)
+        except FileNotFoundError:
+            self.initialize()
+            df = pd.read_excel(self.path)
+        # Add num_questions column with a default if it doesn't exist
+        if "num_questions" not in df.columns:
+            df.insert(2, "num_questions", 5)
+            df.to_excel(self.path, index=False)
+        return df
+
+    def get_user(self, username: str) -> Optional[dict]:
+        df = self._read()
+        user_row = df[df["username"] == username]
+        if user_row.empty:
+            return None
+        return user_record_from_row(user_row.iloc[0])
+
+    def _apply_results(self, df: pd.DataFrame, username: str, feedback_report: list, final_rating: Optional[str]) -> bool:
+        user_index = df[df["username"] == username].index
+        if user_index.empty:
+            return False
+        df.loc[user_index, "test_taken"] = True
+        df.loc[user_index, "final_rating"] = final_rating
+        for i, report in enumerate(feedback_report, 1):
+            for col in (f"answer_{i}", f"evaluation_{i}"):
+                if col not in df.columns:
+                    df[col] = pd.NA
+                df[col] = df[col].astype(object)
+            cells = format_report_entry(report)
+            df.loc[user_index, f"evaluation_{i}"] = cells["evaluation"]
+            df.loc[user_index, f"answer_{i}"] = cells["answer"]
+        return True
+
+    def save_results(self, username: str, feedback_report: list, final_rating: Optional[str]) -> bool:
+        return self.save_results_batch([
+            {"username": username, "feedback_report": feedback_report, "final_rating": final_rating}
+        ])[0]
+
+    def save_results_batch(self, entries: List[dict]) -> List[bool]:
+        df = self._read()
+        df["final_rating"] = df["final_rating"].astype(object)
+        df["test_taken"] = df["test_taken"].astype(object)
+        saved = [self._apply_results(df, e["username"], e["feedback_report"], e["final_rating"]) for e in entries]
+        if any(saved):
+            df.to_excel(self.path, index=False)
+        return saved
+
+    def get_all_results(self) -> pd.DataFrame:
+        return self._read()
+
+    def signature(self) -> tuple:
+        return _file_signature(self.path)
+
+    def replace_user_table(self, df: pd.DataFrame) -> None:
+        df.to_excel(self.path, index=False)
+
+
+# --- SQLite Backend (default live store) ---
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    interview_type TEXT NOT NULL,
+    num_questions INTEGER,
+    test_taken INTEGER NOT NULL DEFAULT 0,
+    final_rating TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users(username);
+CREATE TABLE IF NOT EXISTS answers (
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    question_index INTEGER NOT NULL,
+    answer TEXT,
+    evaluation TEXT,
+    PRIMARY KEY (user_id, question_index)
+);
+"""
+
+class SQLiteBackend(StorageBackend):
+    """
+    Stores users and answers in an SQLite database in WAL mode.
+    Lookups go through the unique username index and saving results only touches that user's rows,
+    so concurrent sessions never overwrite each other. Excel is only produced on demand via export_to_excel.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = DB_FILE, seed_excel_file: str = EXCEL_FILE):
+        self.path = path
+        self.seed_excel_file = seed_excel_file
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def initialize(self) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            conn = self._connect()
+            conn.executescript(_SQLITE_SCHEMA)
+            if conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0:
+                if os.path.exists(self.seed_excel_file):
+                    self._import_workbook(conn, pd.read_excel(self.seed_excel_file))
+                    print(f"'{self.path}' created from '{self.seed_excel_file}'.")
+                else:
+                    self._import_workbook(conn, pd.DataFrame(DEFAULT_USERS))
+                    print(f"'{self.path}' created with default users.")
+            self._initialized = True
+
+    def _import_workbook(self, conn: sqlite3.Connection, df: pd.DataFrame) -> None:
+        """Loads a wide (Excel-shaped) results table into the normalized schema."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for _, row in df.iterrows():
+                if pd.isna(row.get("username")):
+                    continue
+                cursor = conn.execute(
+                    "INSERT INTO users (username, interview_type, num_questions, test_taken, final_rating) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        str(row["username"]),
+                        row.get("interview_type"),
+                        _to_optional_int(row.get("num_questions")),
+                        int(_is_taken(row.get("test_taken"))),
+                        None if pd.isna(row.get("final_rating")) else str(row.get("final_rating")),
+                    ),
+                )
+                i = 1
+                while f"answer_{i}" in df.columns or f"evaluation_{i}" in df.columns:
+                    answer, evaluation = row.get(f"answer_{i}"), row.get(f"evaluation_{i}")
+                    if not (pd.isna(answer) and pd.isna(evaluation)):
+                        conn.execute(
+                            "INSERT INTO answers (user_id, question_index, answer, evaluation) VALUES (?, ?, ?, ?)",
+                            (cursor.lastrowid, i, None if pd.isna(answer) else str(answer), None if pd.isna(evaluation) else str(evaluation)),
+                        )
+                    i += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_user(self, username: str) -> Optional[dict]:
+        self.initialize()
+        row = self._connect().execute(
+            "SELECT username, interview_type, num_questions, test_taken, final_rating FROM users WHERE username = ?",
+            (username,),
+        ).fetchone()
+        if row is None:
+            return None
+        user = dict(row)
+        user["test_taken"] = bool(user["test_taken"])
+        return user
+
+    def _write_results(self, conn: sqlite3.Connection, username: str, feedback_report: list, final_rating: Optional[str]) -> bool:
+        row = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("UPDATE users SET test_taken = 1, final_rating = ? WHERE id = ?", (final_rating, row["id"]))
+        conn.executemany(
+            "INSERT OR REPLACE INTO answers (user_id, question_index, answer, evaluation) VALUES (?, ?, ?, ?)",
+            [
+                (row["id"], i, cells["answer"], cells["evaluation"])
+                for i, cells in enumerate((format_report_entry(r) for r in feedback_report), 1)
+            ],
+        )
+        return True
+
+    def save_results(self, username: str, feedback_report: list, final_rating: Optional[str]) -> bool:
+        return self.save_results_batch([
+            {"username": username, "feedback_report": feedback_report, "final_rating": final_rating}
+        ])[0]
+
+    def save_results_batch(self, entries: List[dict]) -> List[bool]:
+        self.initialize()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            saved = [self._write_results(conn, e["username"], e["feedback_report"], e["final_rating"]) for e in entries]
+            conn.execute("COMMIT")
+            return saved
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_all_results(self) -> pd.DataFrame:
+        self.initialize()
+        conn = self._connect()
+        users = pd.read_sql_query(
+            "SELECT id, username, interview_type, num_questions, test_taken, final_rating FROM users ORDER BY id", conn
+        )
+        answers = pd.read_sql_query("SELECT user_id, question_index, answer, evaluation FROM answers", conn)
+        users["num_questions"] = users["num_questions"].astype("Int64")
+        users["test_taken"] = users["test_taken"].astype(bool)
+
+        num_columns = max([count_static_questions()] + answers["question_index"].tolist())
+        wide = pd.DataFrame(index=users["id"], columns=result_columns(num_columns), dtype=object)
+        for user_id, index, answer, evaluation in answers.itertuples(index=False):
+            wide.at[user_id, f"answer_{index}"] = answer
+            wide.at[user_id, f"evaluation_{index}"] = evaluation
+        df = users.set_index("id").join(wide)
+        return df.reset_index(drop=True)[ROSTER_COLUMNS + result_columns(num_columns)]
+
+    def get_roster(self) -> pd.DataFrame:
+        self.initialize()
+        return self._roster_query("", ())
+
+    def _roster_query(self, where: str, params: tuple, suffix: str = "") -> pd.DataFrame:
+        df = pd.read_sql_query(
+            f"SELECT username, interview_type, num_questions, test_taken, final_rating FROM users {where} ORDER BY id {suffix}",
+            self._connect(), params=params,
+        )
+        df["num_questions"] = df["num_questions"].astype("Int64")
+        df["test_taken"] = df["test_taken"].astype(bool)
+        return df
+
+    @staticmethod
+    def _roster_filter(search: Optional[str], interview_type: Optional[str], test_taken: Optional[bool]) -> tuple:
+        clauses, params = [], []
+        if search:
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("username LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if interview_type:
+            clauses.append("interview_type = ?")
+            params.append(interview_type)
+        if test_taken is not None:
+            clauses.append("test_taken = ?")
+            params.append(int(test_taken))
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", tuple(params)
+
+    def list_users(self, offset: int = 0, limit: int = 50, search: Optional[str] = None,
+                   interview_type: Optional[str] = None, test_taken: Optional[bool] = None) -> pd.DataFrame:
+        self.initialize()
+        where, params = self._roster_filter(search, interview_type, test_taken)
+        return self._roster_query(where, params + (limit, offset), "LIMIT ? OFFSET ?")
+
+    def count_users(self, search: Optional[str] = None, interview_type: Optional[str] = None,
+                    test_taken: Optional[bool] = None) -> int:
+        self.initialize()
+        where, params = self._roster_filter(search, interview_type, test_taken)
+        return self._connect().execute(f"SELECT COUNT(*) FROM users {where}", params).fetchone()[0]
+
+    def get_user_results(self, username: str) -> List[dict]:
+        self.initialize()
+        rows = self._connect().execute(
+            "SELECT a.question_index, a.answer, a.evaluation FROM answers a JOIN users u ON u.id = a.user_id "
+            "WHERE u.username = ? ORDER BY a.question_index",
+            (username,),
+        ).fetchall()
+        return [{"index": row["question_index"], "answer": row["answer"], "evaluation": row["evaluation"]} for row in rows]
+
+    def apply_roster_changes(self, updates: Dict[str, dict], added: List[dict], deleted: List[str]) -> None:
+        self.initialize()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("DELETE FROM users WHERE username = ?", [(u,) for u in deleted])
+            renames = {u: str(f["username"]) for u, f in updates.items() if "username" in f and str(f["username"]) != u}
+            # Renamed rows are parked under temporary names first, so swaps (A->B, B->A) and chains
+            # (A->B, B->C) never collide on the unique username index
+            parked = {username: f"\0renaming-{i}" for i, username in enumerate(renames)}
+            conn.executemany("UPDATE users SET username = ? WHERE username = ?", [(temp, u) for u, temp in parked.items()])
+            for username, fields in updates.items():
+                fields = {c: v for c, v in fields.items() if c in EDITABLE_COLUMNS and c != "username"}
+                if "num_questions" in fields:
+                    fields["num_questions"] = _to_optional_int(fields["num_questions"])
+                if fields:
+                    assignments = ", ".join(f"{column} = ?" for column in fields)
+                    conn.execute(f"UPDATE users SET {assignments} WHERE username = ?", (*fields.values(), parked.get(username, username)))
+            conn.executemany("UPDATE users SET username = ? WHERE username = ?", [(renames[u], temp) for u, temp in parked.items()])
+            conn.executemany(
+                "INSERT INTO users (username, interview_type, num_questions) VALUES (?, ?, ?)",
+                [(str(u["username"]), u["interview_type"], _to_optional_int(u.get("num_questions"))) for u in added],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def signature(self) -> tuple:
+        # Commits land in the -wal file first and move to the main file on checkpoint
+        return _file_signature(self.path, f"{self.path}-wal")
+
+    def replace_user_table(self, df: pd.DataFrame) -> None:
+        self.initialize()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            usernames = [str(u) for u in df["username"]]
+            placeholders = ",".join("?" * len(usernames))
+            conn.execute(f"DELETE FROM users WHERE username NOT IN ({placeholders})", usernames)
+            for row in df[["username", "interview_type", "num_questions"]].itertuples(index=False):
+                conn.execute(
+                    "INSERT INTO users (username, interview_type, num_questions) VALUES (?, ?, ?) "
+                    "ON CONFLICT(username) DO UPDATE SET interview_type = excluded.interview_type, num_questions = excluded.num_questions",
+                    (str(row.username), row.interview_type, _to_optional_int(row.num_questions)),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+# --- Backend Selection ---
+BACKENDS = {
+    "sqlite": SQLiteBackend,
+    "excel": ExcelBackend,
+}
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+def get_backend() -> StorageBackend:
+    """Returns the process-wide storage backend selected by the STORAGE_BACKEND env var (default: sqlite)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = os.getenv("STORAGE_BACKEND", "sqlite").lower()
+                if name not in BACKENDS:
+                    raise ValueError(f"Unknown storage backend: {name}")
+                _backend = BACKENDS[name]()
+    return _backend
+
+def set_backend(backend: StorageBackend) -> None:
+    """Overrides the active backend (e.g. to point at a different file)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
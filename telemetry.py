@@ -0,0 +1,319 @@
+import os
+import json
+import time
+import uuid
+import atexit
+import asyncio
+import inspect
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+METRICS_PATH = os.getenv("METRICS_PATH")  # Prometheus text file, e.g. for node_exporter's textfile collector
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # Serves /metrics when set
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "15"))
+TRACE_FILE = os.getenv("TRACE_FILE")  # JSONL spans, one line per node/tool run, e.g. "traces.jsonl"
+TRACE_CONSOLE = os.getenv("TRACE_CONSOLE", "0") == "1"  # One line per span on stdout, for local debugging
+
+METRIC_PREFIX = "excel_interviewer_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_HELP = {
+    "node_latency_seconds": "Wall time of graph node runs.",
+    "tool_latency_seconds": "Wall time of tool runs.",
+    "llm_calls_total": "Chat model calls.",
+    "llm_call_seconds": "Wall time of chat model calls, including gateway queueing and retries.",
+    "llm_tokens_total": "Tokens reported by the model provider.",
+    "cache_lookups_total": "Cache lookups by result.",
+    "errors_total": "Node and tool runs that raised.",
+    "gateway_wait_seconds": "Time model calls waited in the gateway queue.",
+    "gateway_queue_depth": "Model calls waiting in the gateway queue.",
+    "gateway_in_flight": "Model calls currently running.",
+    "gateway_concurrency_limit": "Current adaptive concurrency limit of the gateway.",
+    "gateway_retries_total": "Model calls retried after a retryable error.",
+    "gateway_failures_total": "Model calls that failed after all retries.",
+}
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# Labels for everything that runs inside a node (thread_id, interview_type) and the enclosing span
+_trace_context: contextvars.ContextVar = contextvars.ContextVar("trace_context", default={})
+
+
+def _labels(labels: Dict[str, Any]) -> LabelSet:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def llm_usage(message: Any) -> Dict[str, int]:
+    """The provider-reported token usage of a model reply ({} if there is none)."""
+    if isinstance(message, dict):
+        # Structured output with include_raw=True: {"raw": AIMessage, "parsed": ..., "parsing_error": ...}
+        message = message.get("raw")
+    return getattr(message, "usage_metadata", None) or {}
+
+
+def _escape_label_value(value: str) -> str:
+    """Escapes a label value for the Prometheus text format (backslash, double quote and newline)."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelSet, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+
+class Span:
+    """A timed node or tool run. Attributes set with set() end up in the JSONL trace."""
+
+    def __init__(self, kind: str, name: str, context: dict):
+        self.kind = kind
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        parent = context.get("span")
+        self.parent_id = parent.span_id if parent else None
+        self.thread_id = context.get("thread_id")
+        self.interview_type = context.get("interview_type")
+        self.attributes: Dict[str, Any] = {}
+        self.start = time.time()
+        self.started = time.perf_counter()
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class Telemetry:
+    """
+    In-process metrics and tracing for the interview graph.
+
+    Nodes and tools run inside spans, which feed latency histograms and error counters labelled by
+    interview type and node/tool name. LLM calls, token usage and cache lookups are counters. Metrics
+    can be written as a Prometheus text file (METRICS_PATH) or served on /metrics (METRICS_PORT), and
+    every span can be appended to a JSONL file (TRACE_FILE) with its thread_id.
+    """
+
+    def __init__(self, trace_file: Optional[str] = TRACE_FILE, console: bool = TRACE_CONSOLE):
+        self.trace_file = trace_file
+        self.console = console
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelSet, _Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+        self._gauges: Dict[str, Dict[LabelSet, float]] = {}
+        self._trace_handle = None
+        self._started = False
+
+    # --- Recording ---
+    def observe(self, name: str, seconds: float, /, **labels) -> None:
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            series.setdefault(_labels(labels), _Histogram()).observe(seconds)
+
+    def increment(self, name: str, value: float = 1, /, **labels) -> None:
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = _labels(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, /, **labels) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def record_llm_call(self, role: str, message: Any, model: Optional[str] = None, seconds: Optional[float] = None) -> None:
+        """Counts a chat model call, its latency and the token usage the provider reported for it."""
+        interview_type = _trace_context.get().get("interview_type")
+        self.increment("llm_calls_total", role=role, model=model, interview_type=interview_type)
+        if seconds is not None:
+            self.observe("llm_call_seconds", seconds, role=role, model=model)
+        usage = llm_usage(message)
+        for direction, key in (("input", "input_tokens"), ("output", "output_tokens")):
+            if usage.get(key):
+                self.increment("llm_tokens_total", usage[key], role=role, model=model, direction=direction, interview_type=interview_type)
+
+    def annotate(self, key: str, value: Any) -> None:
+        """Adds an attribute to the innermost active span, if there is one."""
+        span = _trace_context.get().get("span")
+        if span is not None:
+            span.set(key, value)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        self.increment("cache_lookups_total", cache=cache, result="hit" if hit else "miss")
+
+    @contextmanager
+    def span(self, kind: str, name: str, thread_id: Optional[str] = None, interview_type: Optional[str] = None):
+        """Times a node ("node") or tool ("tool") run. Labels not given are inherited from the enclosing span."""
+        context = dict(_trace_context.get())
+        if thread_id is not None:
+            context["thread_id"] = thread_id
+        if interview_type is not None:
+            context["interview_type"] = interview_type
+        span = Span(kind, name, context)
+        token = _trace_context.set({**context, "span": span})
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _trace_context.reset(token)
+            self._finish(span, time.perf_counter() - span.started, error)
+
+    def _finish(self, span: Span, seconds: float, error: Optional[BaseException]) -> None:
+        labels = {"interview_type": span.interview_type, span.kind: span.name}
+        self.observe(f"{span.kind}_latency_seconds", seconds, **labels)
+        if error is not None:
+            self.increment("errors_total", kind=span.kind, name=span.name, interview_type=span.interview_type, error=type(error).__name__)
+        record = {
+            "ts": round(span.start, 6), "thread_id": span.thread_id, "interview_type": span.interview_type,
+            "kind": span.kind, "name": span.name, "span_id": span.span_id, "parent_id": span.parent_id,
+            "duration_ms": round(seconds * 1000, 3), "status": "error" if error is not None else "ok",
+            "attributes": span.attributes,
+        }
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        if self.console:
+            attrs = " ".join(f"{k}={v!r}" for k, v in span.attributes.items())
+            print(f"[{span.kind}] {span.name} ({span.interview_type}) {record['duration_ms']:.1f} ms {record['status']} {attrs}".rstrip())
+        if self.trace_file:
+            line = json.dumps(record, default=str) + "\n"
+            with self._lock:
+                if self._trace_handle is None:
+                    self._trace_handle = open(self.trace_file, "a", encoding="utf-8")
+                self._trace_handle.write(line)
+                self._trace_handle.flush()
+
+    # --- Wrappers ---
+    def trace_node(self, name: str, interview_type: str, func: Callable) -> Callable:
+        """Wraps a graph node (sync or async) in a span carrying the thread_id from the run's config."""
+        accepts_config = "config" in inspect.signature(func).parameters
+
+        def call_args(state, config):
+            return (state, config) if accepts_config else (state,)
+
+        def thread_of(config) -> Optional[str]:
+            return (config or {}).get("configurable", {}).get("thread_id")
+
+        if asyncio.iscoroutinefunction(func):
+            async def async_node(state, config):
+                with self.span("node", name, thread_id=thread_of(config), interview_type=interview_type):
+                    return await func(*call_args(state, config))
+            async_node.__name__ = name
+            return async_node
+
+        def node(state, config):
+            with self.span("node", name, thread_id=thread_of(config), interview_type=interview_type):
+                return func(*call_args(state, config))
+        node.__name__ = name
+        return node
+
+    # --- Export ---
+    def render_prometheus(self) -> str:
+        """Current metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                metric = METRIC_PREFIX + name
+                lines += [f"# HELP {metric} {METRIC_HELP.get(name, name)}", f"# TYPE {metric} histogram"]
+                for labels, hist in sorted(series.items()):
+                    for bound, count in zip(LATENCY_BUCKETS, hist.buckets):
+                        lines.append(f"{metric}_bucket{_format_labels(labels, ('le', str(bound)))} {count}")
+                    lines.append(f"{metric}_bucket{_format_labels(labels, ('le', '+Inf'))} {hist.count}")
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {hist.sum:.6f}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {hist.count}")
+            for name, series in sorted(self._counters.items()):
+                metric = METRIC_PREFIX + name
+                lines += [f"# HELP {metric} {METRIC_HELP.get(name, name)}", f"# TYPE {metric} counter"]
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self._gauges.items()):
+                metric = METRIC_PREFIX + name
+                lines += [f"# HELP {metric} {METRIC_HELP.get(name, name)}", f"# TYPE {metric} gauge"]
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_metrics_file(self, path: str) -> None:
+        """Atomically replaces path with the current metrics."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def start(self, metrics_path: Optional[str] = METRICS_PATH, port: int = METRICS_PORT,
+              flush_seconds: float = METRICS_FLUSH_SECONDS) -> None:
+        """Starts the metrics file writer and/or the /metrics endpoint once per process, if configured."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        if metrics_path:
+            def flush_loop():
+                while True:
+                    time.sleep(flush_seconds)
+                    self._safe_write(metrics_path)
+            threading.Thread(target=flush_loop, name="metrics-writer", daemon=True).start()
+            atexit.register(self._safe_write, metrics_path)
+        if port:
+            self._serve(port)
+
+    def _safe_write(self, path: str) -> None:
+        try:
+            self.write_metrics_file(path)
+        except OSError as e:
+            print(f"Failed to write metrics file {path}: {e}")
+
+    def _serve(self, port: int) -> None:
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+        except OSError as e:
+            print(f"Metrics endpoint not started on port {port}: {e}")
+            return
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        print(f"Serving metrics on http://0.0.0.0:{port}/metrics")
+
+
+telemetry = Telemetry()
+
+
+def traced_tool(func: Callable) -> Callable:
+    """Runs a tool function inside a "tool" span. Apply below @tool so the tool schema is unchanged."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        state = kwargs.get("state") or {}
+        with telemetry.span("tool", func.__name__, interview_type=state.get("interview_type")):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# The app's modules resolve questions.json and their databases relative to the working directory
+os.chdir(ROOT)
+
+
+@pytest.fixture
+def fake_models():
+    """Installs the offline fake models for every role and returns the call log, emptied."""
+    from fake_llm import call_log, fake_client_factory
+    from llm_registry import llm_registry, default_client_factory
+    llm_registry.set_factory(fake_client_factory())
+    call_log.reset()
+    yield call_log
+    llm_registry.set_factory(default_client_factory)
+
+
+@pytest.fixture
+def new_interview():
+    """Returns a function that builds the initial graph state of an interview, as the app does."""
+    from langchain_core.messages import HumanMessage
+    from prompts import INIT_MESSAGE
+
+    def build(interview_type, questions=(), num_questions=None, user_name="candidate"):
+        return {
+            "messages": [HumanMessage(content=INIT_MESSAGE)], "interview_questions": list(questions),
+            "question_number": 0, "feedback_report": [], "interview_finished": False, "user_name": user_name,
+            "interview_type": interview_type, "current_question": "", "final_rating": None,
+            "num_questions_to_ask": num_questions or len(questions),
+        }
+
+    return build
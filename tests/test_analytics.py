@@ -0,0 +1,51 @@
+from analytics import InterviewAnalytics
+from question_bank import question_bank
+from storage import SQLiteBackend
+
+BANK_QUESTION = question_bank.sample(1, seed="analytics")[0]
+
+
+def _entries():
+    return [
+        {"id": "a", "username": "user2", "interview_type": "Dynamic", "final_rating": "7/10", "feedback_report": [
+            {"question": BANK_QUESTION["question"], "user_answer": "A1", "evaluation": "Good.\nVerdict: Correct"},
+            {"question": "How do you remove duplicate rows?", "user_answer": "A2", "evaluation": "Partly.\nVerdict: Partially Correct"},
+        ]},
+        {"id": "b", "username": "user3", "interview_type": "Hybrid", "final_rating": "4/10", "feedback_report": [
+            {"question": BANK_QUESTION["question"], "user_answer": "A3", "evaluation": "No.\nVerdict: Incorrect"},
+        ]},
+    ]
+
+
+def _without_timestamp(data):
+    return {key: value for key, value in data.items() if key != "updated_at"}
+
+
+def test_replayed_journal_entries_are_counted_once(tmp_path):
+    analytics = InterviewAnalytics(path=str(tmp_path / "analytics.json"))
+    assert analytics.record(_entries()) == 2
+    assert analytics.record(_entries()) == 0
+    summary = analytics.summary(min_asked=1)
+    assert summary["interviews"] == 2
+    assert summary["ratings"]["Dynamic"]["count"] == 1 and summary["ratings"]["Hybrid"]["average"] == 4.0
+    bank = next(q for q in summary["hardest_questions"] if q["question"] == BANK_QUESTION["question"])
+    assert bank["asked"] == 2 and bank["pass_rate"] == 0.5
+    # The applied ids are persisted, so a fresh process skips the replay too
+    assert InterviewAnalytics(path=analytics.path).record(_entries()[:1]) == 0
+
+
+def test_a_rebuild_matches_the_incremental_aggregates(tmp_path):
+    backend = SQLiteBackend(path=str(tmp_path / "interviews.db"), seed_excel_file=str(tmp_path / "missing.xlsx"))
+    backend.initialize()
+    entries = _entries()
+    backend.save_results_batch(entries)
+
+    incremental = InterviewAnalytics(path=str(tmp_path / "incremental.json"))
+    incremental.record(entries)
+    rebuilt = InterviewAnalytics(path=str(tmp_path / "rebuilt.json"))
+    rebuilt.record(entries)
+    rebuilt.rebuild(backend.get_all_results())
+
+    assert _without_timestamp(rebuilt._load_locked()) == _without_timestamp(incremental._load_locked())
+    # The rebuild keeps the applied ids, so replaying the journal afterwards adds nothing
+    assert rebuilt.record(entries) == 0
@@ -0,0 +1,41 @@
+import operator
+from typing import Annotated, List, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from checkpointing import TimedMemorySaver
+
+
+class CounterState(TypedDict):
+    turns: Annotated[List[int], operator.add]
+
+
+def _graph(checkpointer):
+    builder = StateGraph(CounterState)
+    builder.add_node("step", lambda state: {"turns": [len(state["turns"])]})
+    builder.add_edge(START, "step")
+    builder.add_edge("step", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def test_memory_saver_keeps_the_latest_checkpoints_of_each_thread():
+    saver = TimedMemorySaver(keep_last=3)
+    graph = _graph(saver)
+    config = {"configurable": {"thread_id": "interview-1"}}
+    for _ in range(20):
+        graph.invoke({"turns": []}, config)
+
+    assert len(list(saver.list(config))) == 3
+    # The state is intact and the channel values of dropped checkpoints are gone
+    assert graph.get_state(config).values["turns"] == list(range(20))
+    assert len([key for key in saver.blobs if key[0] == "interview-1"]) <= 3 * 3
+
+
+def test_deleted_threads_release_their_checkpoints():
+    saver = TimedMemorySaver(keep_last=3)
+    graph = _graph(saver)
+    for thread_id in ("a", "b"):
+        graph.invoke({"turns": []}, {"configurable": {"thread_id": thread_id}})
+    saver.delete_thread("a")
+    assert set(saver.storage) == {"b"}
+    assert all(key[0] == "b" for key in saver.blobs)
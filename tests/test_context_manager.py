@@ -0,0 +1,53 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from context_manager import build_prompt, split_turns
+
+REPORT = [{"question": f"Q{i}", "verdict": "Correct"} for i in range(1, 5)]
+
+
+def _transcript(turns, answer_length=10):
+    """turns answered turns; each is an answer, a tool call with its result and the next question."""
+    messages = []
+    for i in range(1, turns + 1):
+        messages += [
+            HumanMessage(content=f"Answer {i} " + "x" * answer_length),
+            AIMessage(content="", tool_calls=[{"id": f"call{i}", "name": "evaluate_answer", "args": {"answer": f"Answer {i}"}}]),
+            ToolMessage(content=f"Evaluation {i}", tool_call_id=f"call{i}"),
+            AIMessage(content=f"Question {i + 1}?"),
+        ]
+    return messages
+
+
+def test_turns_start_at_human_messages_and_keep_tool_results_with_their_call():
+    turns = split_turns(_transcript(3))
+    assert len(turns) == 3
+    assert all(isinstance(turn[0], HumanMessage) and isinstance(turn[2], ToolMessage) for turn in turns)
+
+
+def test_older_turns_are_summarized_behind_a_single_system_message():
+    messages = _transcript(4, answer_length=200)
+    prompt, stats = build_prompt("You are an interviewer.", messages, REPORT, "Q5", "alice", keep_turns=2)
+    assert isinstance(prompt[0], SystemMessage)
+    assert not any(isinstance(m, SystemMessage) for m in prompt[1:])
+    assert "2 earlier turns summarized" in prompt[0].content
+    assert "Q3: Q3 -> Verdict: Correct" in prompt[0].content and "Current question: Q5" in prompt[0].content
+    assert prompt[1:] == messages[8:]
+    assert (stats["kept_turns"], stats["summarized_turns"]) == (2, 2)
+    assert stats["prompt_tokens"] < stats["full_history_tokens"]
+
+
+def test_short_interviews_are_sent_verbatim():
+    messages = _transcript(2)
+    prompt, stats = build_prompt("You are an interviewer.", messages, REPORT[:2], keep_turns=2)
+    assert prompt == [SystemMessage(content="You are an interviewer.")] + messages
+    assert stats["summarized_turns"] == 0
+
+
+def test_the_token_budget_summarizes_more_turns_but_keeps_the_latest():
+    messages = _transcript(4, answer_length=400)
+    prompt, stats = build_prompt("You are an interviewer.", messages, REPORT, keep_turns=3, token_budget=300)
+    assert stats["kept_turns"] == 1 and stats["summarized_turns"] == 3
+    assert prompt[1:] == messages[12:]
+    # Even a budget the latest turn alone exceeds keeps that turn
+    prompt, stats = build_prompt("You are an interviewer.", messages, REPORT, keep_turns=3, token_budget=10)
+    assert stats["kept_turns"] == 1 and prompt[1:] == messages[12:]
@@ -0,0 +1,100 @@
+import time
+import uuid
+import threading
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from agent import create_agent_graph, merge_feedback
+from deadlines import (
+    PENDING_EVALUATION,
+    PENDING_VERDICT,
+    deferred_evaluations,
+    resolved_feedback,
+    turn_config,
+    with_deadline,
+)
+from fake_llm import fake_client_factory, fake_interviewer
+from llm_registry import llm_registry, default_client_factory
+from model_config import model_router
+from question_bank import question_bank
+
+
+@pytest.fixture
+def slow_evaluator():
+    """Fake models where every evaluation takes 0.4 s and everything else is instant."""
+    original = model_router.route("evaluator")
+    model_router.configure("evaluator", model="slow-evaluator")
+    llm_registry.set_factory(fake_client_factory(model_latency={"slow-evaluator": 0.4}))
+    yield
+    model_router.configure("evaluator", model=original.model)
+    llm_registry.set_factory(default_client_factory)
+
+
+def test_judge_node_writes_back_evaluations_it_waited_for():
+    thread_id = f"test-{uuid.uuid4().hex}"
+    report = [{"question": "Q1", "user_answer": "A1", "evaluation": PENDING_EVALUATION, "verdict": PENDING_VERDICT}]
+    release = threading.Event()
+
+    def evaluate():
+        release.wait(5)
+        return "Covers the key points.\nVerdict: Correct"
+
+    deferred_evaluations.submit(thread_id, "Q1", "A1", evaluate)
+    seen = {}
+
+    def judge(state):
+        # Like judge_within_budget: the resolved report only feeds the prompt, the update has just the rating
+        release.set()
+        seen["report"] = resolved_feedback(thread_id, state["feedback_report"], wait=5)
+        return {"final_rating": "8/10"}
+
+    update = with_deadline(judge)({"feedback_report": report}, {"configurable": {"thread_id": thread_id}})
+
+    assert seen["report"][0]["verdict"] == "Correct"
+    assert update["final_rating"] == "8/10"
+    merged = merge_feedback(report, update["feedback_report"])
+    assert [entry["verdict"] for entry in merged] == ["Correct"]
+    # Taken into the state, so the result is no longer held for the thread
+    assert deferred_evaluations.resolve(thread_id, report) == {}
+
+
+def test_deferred_evaluations_are_filled_in_after_the_deadline(slow_evaluator, new_interview):
+    questions = question_bank.sample(2, seed="deadline-test")
+    graph = create_agent_graph(fake_interviewer("Static", len(questions)), MemorySaver(), "Static", static_fast_path=True)
+    thread_id = f"test-{uuid.uuid4().hex}"
+    config = {"configurable": {"thread_id": thread_id}}
+    graph.invoke(new_interview("Static", questions), turn_config(config, 0.2))
+    for turn in range(len(questions)):
+        # Unique answers, so no evaluation is served from the cache
+        answer = f"I would use a lookup formula with an exact match ({uuid.uuid4().hex})."
+        graph.update_state(config, {"messages": [HumanMessage(content=answer)]})
+        graph.invoke(None, turn_config(config, 0.2))
+
+    state = graph.get_state(config).values
+    assert state["interview_finished"]
+    assert "evaluation_deferred" in {d["kind"] for d in state["degradations"]}
+    # What the app saves: deferred evaluations still running at the last deadline are waited for
+    report = resolved_feedback(thread_id, state["feedback_report"], wait=5)
+    assert len(report) == len(questions)
+    assert all(entry["verdict"] != PENDING_VERDICT for entry in report)
+    assert all(entry["evaluation"] != PENDING_EVALUATION for entry in report)
+
+
+def test_finished_deferred_evaluations_reach_the_state_on_the_next_turn(slow_evaluator, new_interview):
+    questions = question_bank.sample(3, seed="deadline-next-turn")
+    graph = create_agent_graph(fake_interviewer("Static", len(questions)), MemorySaver(), "Static", static_fast_path=True)
+    thread_id = f"test-{uuid.uuid4().hex}"
+    config = {"configurable": {"thread_id": thread_id}}
+    graph.invoke(new_interview("Static", questions), turn_config(config, 0.2))
+    graph.update_state(config, {"messages": [HumanMessage(content=f"First answer {uuid.uuid4().hex}")]})
+    graph.invoke(None, turn_config(config, 0.2))
+    assert graph.get_state(config).values["feedback_report"][0]["verdict"] == PENDING_VERDICT
+
+    time.sleep(0.6)
+    graph.update_state(config, {"messages": [HumanMessage(content=f"Second answer {uuid.uuid4().hex}")]})
+    graph.invoke(None, turn_config(config, 0.2))
+    first = graph.get_state(config).values["feedback_report"][0]
+    assert first["verdict"] != PENDING_VERDICT
+    assert first["metadata"]["degradations"][0]["resolved"]
@@ -0,0 +1,75 @@
+from dedup import DuplicateFilter, SimilarityIndex, minhash, similarity
+
+BANK = ["What is the difference between a relative and an absolute cell reference, like A1 and $A$1?"]
+SESSION = ["How would you use XLOOKUP with a fallback value to match orders to customers?"]
+REWORDED = "What's the difference between a relative and an absolute cell reference, such as A1 and $A$1?"
+
+
+def _filter(**kwargs):
+    return DuplicateFilter(lambda: BANK, threshold=0.5, max_retries=2, enabled=True, **kwargs)
+
+
+def _generator(*questions):
+    """Returns the questions in order, recording the questions to avoid that each attempt was given."""
+    calls = []
+
+    def generate(avoid):
+        calls.append(list(avoid))
+        return questions[min(len(calls), len(questions)) - 1]
+
+    return generate, calls
+
+
+def test_hybrid_questions_taken_from_the_bank_are_not_rejected():
+    generate, calls = _generator(BANK[0])
+    assert _filter().generate_unique(generate, SESSION, "Hybrid") == BANK[0]
+    assert calls == [[]]
+
+
+def test_dynamic_questions_copied_from_the_bank_are_regenerated():
+    fresh = "Which chart would you pick to show monthly sales against a target, and why?"
+    generate, calls = _generator(BANK[0], fresh)
+    assert _filter().generate_unique(generate, SESSION, "Dynamic") == fresh
+    assert calls == [[], [BANK[0]]]
+
+
+def test_repeats_within_the_session_are_regenerated_in_hybrid_too():
+    fresh = "How do you build a PivotTable that shows sales by region and quarter?"
+    reworded = "How would you use XLOOKUP with a fallback value to match the orders to customers?"
+    generate, calls = _generator(reworded, fresh)
+    assert _filter().generate_unique(generate, SESSION, "Hybrid") == fresh
+    assert calls == [[], [SESSION[0]]]
+
+
+def test_case_punctuation_and_spacing_are_ignored():
+    shouted = "WHAT IS THE DIFFERENCE between a relative and an absolute cell reference,   like A1 and $A$1"
+    assert similarity(minhash(BANK[0]), minhash(shouted)) == 1.0
+
+
+def test_rewordings_score_over_the_threshold_and_unrelated_questions_near_zero():
+    assert similarity(minhash(BANK[0]), minhash(REWORDED)) >= 0.5
+    assert similarity(minhash(BANK[0]), minhash(SESSION[0])) < 0.1
+
+
+def test_the_index_finds_near_duplicates_through_shared_bands():
+    index = SimilarityIndex()
+    for text in BANK + SESSION:
+        index.add(text)
+    match, score = index.most_similar(REWORDED)
+    assert match == BANK[0] and score >= 0.5
+    assert index.most_similar("Explain what a volatile function is and name two examples.") is None
+
+
+def test_matches_under_the_threshold_are_not_duplicates():
+    score = similarity(minhash(BANK[0]), minhash(REWORDED))
+    assert _filter().find_duplicate(REWORDED, []) == ("bank", BANK[0], score)
+    strict = DuplicateFilter(lambda: BANK, threshold=score + 0.01, max_retries=2, enabled=True)
+    assert strict.find_duplicate(REWORDED, []) is None
+
+
+def test_the_least_similar_candidate_is_used_when_retries_run_out():
+    generate, calls = _generator(BANK[0], REWORDED, BANK[0])
+    duplicate_filter = _filter()
+    assert duplicate_filter.generate_unique(generate, [], "Dynamic") == REWORDED
+    assert len(calls) == 3
+    assert duplicate_filter.stats()["exhausted"] == 1 and duplicate_filter.stats()["rejections"] == 3
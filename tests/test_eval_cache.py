@@ -0,0 +1,62 @@
+import uuid
+
+import agent
+from eval_cache import EvaluationCache, make_cache_key
+
+
+def test_cache_key_normalizes_the_answer_only():
+    key = make_cache_key("template", "model", "What is $A$1?", "absolute references", "An absolute reference.")
+    assert key == make_cache_key("template", "model", "What is $A$1?", "absolute references", "  an ABSOLUTE reference ")
+    assert key != make_cache_key("template", "model", "What is $A$1?", "absolute references", "A relative reference.")
+
+
+def test_cache_key_changes_with_the_prompt_text_and_the_model():
+    key = make_cache_key("Evaluate {user_answer}", "model-a", "Q?", "", "answer")
+    assert key != make_cache_key("Evaluate carefully {user_answer}", "model-a", "Q?", "", "answer")
+    assert key != make_cache_key("Evaluate {user_answer}", "model-b", "Q?", "", "answer")
+
+
+def test_editing_the_evaluation_prompt_bypasses_old_cache_entries(fake_models, monkeypatch):
+    answer = f"I would use XLOOKUP with an exact match ({uuid.uuid4().hex})."
+    agent.run_evaluation("Dynamic", "How do you look up a price?", answer)
+    agent.run_evaluation("Dynamic", "How do you look up a price?", answer)
+    assert len(fake_models.reset()) == 1
+
+    monkeypatch.setattr(agent, "DYNAMIC_EVALUATION_PROMPT_TEMPLATE", agent.DYNAMIC_EVALUATION_PROMPT_TEMPLATE + "\nBe strict.")
+    agent.run_evaluation("Dynamic", "How do you look up a price?", answer)
+    assert len(fake_models.reset()) == 1
+
+
+def test_memory_layer_is_lru_bounded():
+    cache = EvaluationCache(max_entries=2, path=None)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+
+
+def _disk_rows(cache):
+    return cache._connect().execute("SELECT COUNT(*) FROM eval_cache").fetchone()[0]
+
+
+def test_disk_layer_is_pruned_every_n_puts(tmp_path):
+    cache = EvaluationCache(path=str(tmp_path / "cache.db"), disk_max_entries=3, prune_every=5)
+    for i in range(4):
+        cache.put(f"key{i}", f"Verdict: Correct {i}")
+    assert _disk_rows(cache) == 4
+    cache.put("key4", "Verdict: Correct 4")
+    assert _disk_rows(cache) == 3
+    # The newest entries are kept and are still served from disk by another process
+    restarted = EvaluationCache(path=str(tmp_path / "cache.db"))
+    assert restarted.get("key4") == "Verdict: Correct 4"
+    assert restarted.get("key0") is None
+
+
+def test_prune_drops_expired_disk_entries(tmp_path):
+    cache = EvaluationCache(path=str(tmp_path / "cache.db"), ttl=60, prune_every=1000)
+    cache._disk_put("old", "Verdict: Incorrect", created_at=0.0)
+    cache.put("new", "Verdict: Correct")
+    cache.prune()
+    assert _disk_rows(cache) == 1
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from fake_llm import FakeRateLimitError, FakeTimeoutError
+from llm_gateway import LLMGateway, is_retryable
+
+
+class Flaky:
+    """Raises the given errors on its first calls, then returns "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def _gateway(**kwargs):
+    sleeps = []
+    options = {"initial_concurrency": 8, "min_concurrency": 1, "max_concurrency": 32, "backoff_base": 0.5, "backoff_max": 20}
+    gateway = LLMGateway(sleep=sleeps.append, **{**options, **kwargs})
+    return gateway, sleeps
+
+
+def test_rate_limit_errors_are_retried_with_bounded_backoff():
+    gateway, sleeps = _gateway(max_retries=4)
+    fn = Flaky(FakeRateLimitError("429 quota"), FakeTimeoutError("timed out"))
+    assert gateway.call(fn, role="evaluator") == "ok"
+    assert fn.calls == 3
+    # Full jitter: attempt n sleeps at most backoff_base * 2**n
+    assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+    stats = gateway.stats()
+    assert (stats["calls"], stats["retries"], stats["failures"], stats["throttled"]) == (1, 2, 0, 2)
+
+
+def test_retries_stop_after_max_retries():
+    gateway, sleeps = _gateway(max_retries=2)
+    fn = Flaky(*(FakeRateLimitError("429") for _ in range(5)))
+    with pytest.raises(FakeRateLimitError):
+        gateway.call(fn, role="evaluator")
+    assert fn.calls == 3 and len(sleeps) == 2
+    assert gateway.stats()["failures"] == 1
+
+
+def test_other_errors_are_not_retried():
+    gateway, sleeps = _gateway()
+    fn = Flaky(ValueError("bad request: invalid argument"))
+    assert not is_retryable(ValueError("bad request: invalid argument"))
+    with pytest.raises(ValueError):
+        gateway.call(fn, role="evaluator")
+    assert fn.calls == 1 and sleeps == []
+    assert gateway.stats()["retries"] == 0
+
+
+def test_concurrency_limit_halves_on_throttling_and_grows_additively():
+    gateway, _ = _gateway(initial_concurrency=8, max_retries=10)
+    gateway.call(Flaky(FakeRateLimitError("429"), FakeRateLimitError("429")), role="evaluator")
+    # 8 -> 4 -> 2 on the two 429s, then + 1/2 for the success
+    assert gateway.stats()["concurrency_limit"] == 2.5
+
+    for _ in range(20):
+        gateway.call(Flaky(), role="evaluator")
+    grown = gateway.stats()["concurrency_limit"]
+    assert 6 < grown < 8
+
+    # Repeated 429s floor the limit at min_concurrency (1), and the success adds 1/1
+    gateway.call(Flaky(*(FakeRateLimitError("429") for _ in range(10))), role="evaluator")
+    assert gateway.stats()["concurrency_limit"] == 2.0
+
+
+def test_concurrency_limit_stays_within_bounds():
+    gateway, _ = _gateway(initial_concurrency=4, min_concurrency=2, max_concurrency=5, max_retries=10)
+    gateway.call(Flaky(*(FakeRateLimitError("429") for _ in range(6))), role="evaluator")
+    assert gateway.stats()["throttled"] == 6
+    assert gateway.stats()["concurrency_limit"] == 2.5
+    for _ in range(50):
+        gateway.call(Flaky(), role="evaluator")
+    assert gateway.stats()["concurrency_limit"] == 5
+
+
+def test_async_calls_are_retried_too():
+    gateway, _ = _gateway(max_retries=3, backoff_base=0.001)
+    fn = Flaky(FakeRateLimitError("429"))
+
+    async def call():
+        return fn()
+
+    assert asyncio.run(gateway.acall(call, role="generator")) == "ok"
+    assert fn.calls == 2
+    assert gateway.stats()["retries"] == 1
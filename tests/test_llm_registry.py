@@ -0,0 +1,65 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_llm import fake_client_factory
+from llm_gateway import LLMGateway
+from llm_registry import LLMClientRegistry
+
+
+def test_one_client_per_key():
+    registry = LLMClientRegistry(factory=fake_client_factory())
+    assert registry.shared("evaluator") is registry.shared("evaluator")
+    assert registry.shared("generator", temperature=0.85) is not registry.shared("generator", temperature=0.8)
+    assert registry.stats()["shared"] == 3
+
+
+def test_concurrent_calls_are_limited_by_the_gateway_only():
+    registry = LLMClientRegistry(factory=fake_client_factory(latency=0.2))
+    gateway = LLMGateway(initial_concurrency=16, max_concurrency=16)
+
+    def evaluate(i):
+        return gateway.invoke("evaluator", registry.shared("evaluator"), f"Question {i}? CANDIDATE'S ANSWER: \"answer {i}\"").content
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(evaluate, range(16)))
+    elapsed = time.perf_counter() - start
+
+    assert all("Verdict: " in result for result in results)
+    # Sixteen 200 ms calls in one wave; a pool of four clients per key would need four waves
+    assert elapsed < 0.6
+    assert registry.stats()["created"] == 1
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_idle_clients_are_evicted_on_access():
+    clock = Clock()
+    registry = LLMClientRegistry(factory=fake_client_factory(), idle_seconds=60, clock=clock)
+    evaluator = registry.shared("evaluator")
+    judge = registry.shared("judge")
+    clock.now = 45
+    assert registry.shared("judge") is judge
+    clock.now = 90
+    # The evaluator was last used 90 s ago, the judge 45 s ago
+    assert registry.shared("evaluator") is not evaluator
+    assert registry.shared("judge") is judge
+    assert registry.stats()["evicted"] == 1
+
+
+def test_least_recently_used_clients_are_dropped_over_max_clients():
+    registry = LLMClientRegistry(factory=fake_client_factory(), max_clients=2, idle_seconds=0)
+    evaluator = registry.shared("evaluator")
+    judge = registry.shared("judge")
+    registry.shared("evaluator")
+    registry.shared("generator")
+    assert registry.stats()["shared"] == 2
+    assert registry.shared("evaluator") is evaluator
+    assert registry.shared("judge") is not judge
+    assert registry.stats()["evicted"] == 2
@@ -0,0 +1,35 @@
+from model_config import CHAT_MODEL, DEFAULT_ROUTES, ModelRouter, route_from_env
+
+
+def test_defaults_keep_every_role_on_the_chat_model_without_caps(monkeypatch):
+    for role in DEFAULT_ROUTES:
+        for suffix in ("MODEL", "TEMPERATURE", "TIMEOUT_SECONDS", "MAX_TOKENS"):
+            monkeypatch.delenv(f"{role.upper()}_{suffix}", raising=False)
+    router = ModelRouter({role: route_from_env(role, route) for role, route in DEFAULT_ROUTES.items()})
+    for role in ("generator", "evaluator", "judge"):
+        assert router.route(role).model == CHAT_MODEL
+    for route in router.routes().values():
+        assert route.timeout == 0 and route.max_tokens == 0
+
+
+def test_routes_are_overridden_per_role(monkeypatch):
+    monkeypatch.setenv("ORCHESTRATOR_MODEL", "gemini-2.0-flash-lite")
+    monkeypatch.setenv("ORCHESTRATOR_MAX_TOKENS", "256")
+    route = route_from_env("orchestrator", DEFAULT_ROUTES["orchestrator"])
+    assert route.model == "gemini-2.0-flash-lite"
+    assert route.max_tokens == 256
+    assert route.temperature == DEFAULT_ROUTES["orchestrator"].temperature
+
+
+def test_calls_are_accounted_per_role():
+    class Reply:
+        usage_metadata = {"input_tokens": 40, "output_tokens": 10}
+
+    router = ModelRouter(dict(DEFAULT_ROUTES))
+    router.record("evaluator", 0.2, Reply())
+    router.record("evaluator", 0.4, {"raw": Reply(), "parsed": None})
+    stats = router.reset()["evaluator"]
+    assert stats["calls"] == 2
+    assert (stats["input_tokens"], stats["output_tokens"]) == (80, 20)
+    assert stats["p50_ms"] == 400.0
+    assert router.stats() == {}
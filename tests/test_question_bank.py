@@ -0,0 +1,62 @@
+import json
+from collections import Counter
+
+import question_bank as question_bank_module
+from question_bank import DIFFICULTY_ORDER, QuestionBank, curriculum_slice
+
+
+def _bank(tmp_path, strata):
+    """A bank with count questions per (category, difficulty) in strata."""
+    questions, next_id = [], 1
+    for (category, difficulty), count in strata.items():
+        for _ in range(count):
+            questions.append({"id": next_id, "category": category, "difficulty": difficulty,
+                              "question": f"{category} {difficulty} question {next_id}?", "expected_concepts": "Anything."})
+            next_id += 1
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps(questions))
+    return QuestionBank(json_path=str(path), db_path=str(tmp_path / "questions.db"))
+
+
+STRATA = {("Formulas", "Easy"): 10, ("Formulas", "Hard"): 2, ("Charts", "Easy"): 4, ("Charts", "Medium"): 4}
+
+
+def test_samples_are_stratified_and_ordered_from_easy_to_hard(tmp_path):
+    bank = _bank(tmp_path, STRATA)
+    picked = bank.sample(8, seed="alice")
+    strata = Counter((q["category"], q["difficulty"]) for q in picked)
+    # One per stratum first, then the other four in proportion to stratum size
+    assert set(strata) == set(STRATA)
+    assert strata[("Formulas", "Easy")] == 3 and strata[("Formulas", "Hard")] == 1
+    assert len({q["id"] for q in picked}) == 8
+    ranks = [DIFFICULTY_ORDER[q["difficulty"]] for q in picked]
+    assert ranks == sorted(ranks)
+
+
+def test_the_same_seed_gives_the_same_questions(tmp_path):
+    bank = _bank(tmp_path, STRATA)
+    assert bank.sample(5, seed="alice") == bank.sample(5, seed="alice")
+    seeds = {tuple(q["id"] for q in bank.sample(5, seed=f"user{i}")) for i in range(10)}
+    assert len(seeds) > 1
+
+
+def test_fewer_questions_than_strata_come_from_distinct_strata(tmp_path):
+    bank = _bank(tmp_path, STRATA)
+    picked = bank.sample(2, seed="bob", categories=["Formulas", "Charts"])
+    assert len({(q["category"], q["difficulty"]) for q in picked}) == 2
+
+
+def test_a_sample_larger_than_the_bank_returns_the_whole_bank(monkeypatch):
+    # questions.json has 4 questions, fewer than the default of 5 per interview
+    monkeypatch.setattr(question_bank_module, "DEFAULT_SAMPLE_SIZE", 5)
+    bank = QuestionBank()
+    assert bank.count() == 4
+    picked = bank.sample(None, seed="carol")
+    assert len(picked) == 4 and len({q["id"] for q in picked}) == 4
+    assert len(bank.sample(10, seed="carol")) == 4
+
+
+def test_curriculum_slice_wraps_around():
+    curriculum = [{"question": f"Q{i}"} for i in range(4)]
+    assert [q["question"] for q in curriculum_slice(curriculum, 3, size=3)] == ["Q3", "Q0", "Q1"]
+    assert curriculum_slice([], 2) == []
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from analytics import _QUESTION_PATTERN
+from batch_grade import load_workbook
+from storage import format_report_entry, parse_report_entry
+
+REPORT = {"question": "What does $A$1 do?", "user_answer": "It locks the reference.", "evaluation": "Good.\nVerdict: Correct"}
+LEGACY_CELL = "Question: What does $A$1 do?\n\nEvaluation: Good.\nVerdict: Correct"
+
+
+def test_current_cells_round_trip():
+    cells = format_report_entry(REPORT)
+    assert cells["answer"] == "Correct"
+    assert parse_report_entry(cells["evaluation"]) == REPORT
+
+
+def test_cells_without_a_stored_answer_still_parse():
+    assert parse_report_entry(LEGACY_CELL) == {"question": REPORT["question"], "user_answer": None, "evaluation": REPORT["evaluation"]}
+    assert parse_report_entry("free text") is None
+    assert parse_report_entry(None) is None
+
+
+def test_analytics_reads_the_question_from_both_formats():
+    cells = pd.Series([format_report_entry(REPORT)["evaluation"], LEGACY_CELL])
+    assert list(cells.str.extract(_QUESTION_PATTERN)[0]) == [REPORT["question"]] * 2
+
+
+def test_batch_grade_skips_interviews_without_stored_answers(tmp_path):
+    path = tmp_path / "results.xlsx"
+    pd.DataFrame([
+        {"username": "new", "interview_type": "Static", "test_taken": True, "answer_1": "Correct", "evaluation_1": format_report_entry(REPORT)["evaluation"]},
+        {"username": "old", "interview_type": "Static", "test_taken": True, "answer_1": "Correct", "evaluation_1": LEGACY_CELL},
+    ]).to_excel(path, index=False)
+    records, skipped = load_workbook(str(path))
+    assert [r["username"] for r in records] == ["new"]
+    assert records[0]["answers"][0]["user_answer"] == REPORT["user_answer"]
+    assert skipped == 1
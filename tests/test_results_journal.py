@@ -0,0 +1,103 @@
+import os
+
+from results_journal import ResultsJournal
+
+
+class RecordingBackend:
+    """Stands in for the results store: remembers every saved entry by username."""
+
+    def __init__(self):
+        self.saved = {}
+        self.batches = 0
+
+    def save_results_batch(self, entries):
+        self.batches += 1
+        for entry in entries:
+            self.saved[entry["username"]] = entry["final_rating"]
+        return [True] * len(entries)
+
+
+def _journal(tmp_path, backend):
+    return ResultsJournal(path=str(tmp_path / "journal.jsonl"), backend_getter=lambda: backend, batch_size=10)
+
+
+def test_compaction_saves_entries_and_rotates(tmp_path):
+    backend = RecordingBackend()
+    journal = _journal(tmp_path, backend)
+    journal.append("alice", [], "7/10")
+    journal.append("bob", [], "4/10")
+
+    assert journal.compact() == 2
+    assert backend.saved == {"alice": "7/10", "bob": "4/10"}
+    assert os.path.getsize(journal.path) == 0
+    assert journal._read_offset() == 0
+    assert journal.pending_count() == 0
+
+
+def test_uncompacted_entries_are_replayed_on_start(tmp_path):
+    _journal(tmp_path, RecordingBackend()).append("alice", [], "7/10")
+
+    backend = RecordingBackend()
+    restarted = _journal(tmp_path, backend)
+    restarted.start()
+    assert restarted.is_pending("alice")
+    restarted.stop()
+    assert backend.saved == {"alice": "7/10"}
+
+
+def test_torn_and_corrupt_lines_do_not_block_later_entries(tmp_path):
+    backend = RecordingBackend()
+    journal = _journal(tmp_path, backend)
+    journal.append("alice", [], "7/10")
+    with open(journal.path, "ab") as f:
+        f.write(b'{"username": "broken", "final_rat\n')
+    journal.append("bob", [], "4/10")
+    with open(journal.path, "ab") as f:
+        f.write(b'{"username": "torn"')
+
+    restarted = _journal(tmp_path, backend)
+    restarted._drop_torn_tail()
+    assert restarted.compact() == 2
+    assert backend.saved == {"alice": "7/10", "bob": "4/10"}
+
+
+def test_crash_during_rotation_replays_instead_of_skipping(tmp_path):
+    backend = RecordingBackend()
+    journal = _journal(tmp_path, backend)
+    journal.append("alice", [], "7/10")
+    journal.compact()
+
+    # A crash after the journal was emptied but before the offset was reset (the old rotation order)
+    journal._write_offset(10_000)
+    journal.append("bob", [], "4/10")
+    assert journal.compact() == 1
+    assert backend.saved["bob"] == "4/10"
+
+    # A crash after the offset was reset but before the journal was emptied replays everything once more
+    journal.append("carol", [], "9/10")
+    journal._write_offset(0)
+    assert journal.compact() == 1
+    assert backend.saved["carol"] == "9/10"
+
+
+def test_a_failing_compaction_callback_does_not_leave_entries_pending(tmp_path):
+    backend = RecordingBackend()
+    journal = _journal(tmp_path, backend)
+    notified = []
+
+    def on_compacted(records):
+        notified.append([r["username"] for r in records])
+        raise RuntimeError("analytics store unavailable")
+
+    journal.on_compacted = on_compacted
+    journal.append("alice", [], "7/10")
+    assert journal.is_pending("alice")
+
+    assert journal.compact() == 1
+    assert notified == [["alice"]]
+    assert backend.saved == {"alice": "7/10"}
+    assert not journal.is_pending("alice")
+    # Later batches are still compacted and reported
+    journal.append("bob", [], "4/10")
+    assert journal.compact() == 1
+    assert notified == [["alice"], ["bob"]]
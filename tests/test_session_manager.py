@@ -0,0 +1,87 @@
+import time
+import operator
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+import session_manager as session_manager_module
+from checkpointing import TimedMemorySaver
+from session_manager import SessionManager
+
+
+def _manager(tmp_path, **kwargs):
+    manager = SessionManager(archive_path=str(tmp_path / "sessions.db"), min_idle_seconds=0, **kwargs)
+    manager.bind(TimedMemorySaver())
+    return manager
+
+
+class _State(TypedDict):
+    answers: Annotated[list, operator.add]
+
+
+def _graph(checkpointer):
+    graph = StateGraph(_State)
+    graph.add_node("answer", lambda state: {"answers": [f"A{len(state['answers']) + 1}"]})
+    graph.add_edge(START, "answer")
+    graph.add_edge("answer", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def test_evicted_threads_are_archived_found_and_restored(tmp_path):
+    manager = _manager(tmp_path, idle_seconds=3600, sweep_seconds=3600)
+    graph = _graph(manager.checkpointer)
+    thread_id = "interview-Dynamic-alice-1"
+    config = {"configurable": {"thread_id": thread_id}}
+    manager.touch(thread_id, "alice", "Dynamic")
+    graph.invoke({"answers": []}, config)
+    graph.invoke({"answers": []}, config)
+
+    manager.idle_seconds = 0
+    assert manager.sweep() == 1
+    assert manager.stats()["live"] == 0
+    assert not graph.get_state(config).values
+    assert manager.find_thread("alice") == thread_id
+
+    manager.idle_seconds = 3600
+    assert manager.touch(thread_id, "alice", "Dynamic") is True
+    assert graph.get_state(config).values["answers"] == ["A1", "A2"]
+    graph.invoke({"answers": []}, config)
+    assert graph.get_state(config).values["answers"] == ["A1", "A2", "A3"]
+    assert manager.stats()["restores"] == 1
+    # A live thread is not restored again
+    assert manager.touch(thread_id, "alice", "Dynamic") is False
+
+
+def test_ended_threads_are_not_found_after_eviction(tmp_path):
+    manager = _manager(tmp_path, idle_seconds=3600, sweep_seconds=3600)
+    graph = _graph(manager.checkpointer)
+    config = {"configurable": {"thread_id": "interview-Static-bob-1"}}
+    manager.touch("interview-Static-bob-1", "bob", "Static")
+    graph.invoke({"answers": []}, config)
+    manager.idle_seconds = 0
+    manager.sweep()
+    manager.end("interview-Static-bob-1")
+    assert manager.find_thread("bob") is None
+    assert manager.touch("interview-Static-bob-1", "bob", "Static") is False
+
+
+def test_a_failing_sweep_does_not_stop_later_sweeps(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, idle_seconds=0.05, sweep_seconds=0.02)
+    manager.touch("interview-Static-alice-1", "alice", "Static")
+    failures = []
+    copy_thread = session_manager_module.copy_thread
+
+    def flaky_copy(source, target, thread_id):
+        if not failures:
+            failures.append(thread_id)
+            raise OSError("disk full")
+        return copy_thread(source, target, thread_id)
+
+    monkeypatch.setattr(session_manager_module, "copy_thread", flaky_copy)
+    manager.start()
+    deadline = time.monotonic() + 2
+    while manager.stats()["live"] and time.monotonic() < deadline:
+        time.sleep(0.02)
+    manager.sweep_seconds = 3600  # Parks the sweeper thread for the rest of the run
+    assert failures == ["interview-Static-alice-1"]
+    assert manager.stats()["live"] == 0 and manager.evictions == 1
@@ -0,0 +1,36 @@
+import time
+import threading
+
+from deadlines import remaining, with_deadline
+from speculative import SpeculativeQuestionGenerator
+
+
+def _run_in_turn(fn, budget: float):
+    """Runs fn inside a graph node whose turn has the given budget."""
+    node = with_deadline(lambda state: fn() or {})
+    config = {"configurable": {"thread_id": "speculative-test", "turn_deadline": time.time() + budget, "turn_budget": budget}}
+    return node({"feedback_report": []}, config)
+
+
+def test_prefetch_runs_without_the_turn_deadline():
+    seen = []
+    generator = SpeculativeQuestionGenerator(lambda *args: seen.append(remaining()) or "Next question?")
+    _run_in_turn(lambda: generator.prefetch("t1", "Dynamic", [], [], "Shown question?"), budget=0.5)
+    report = [{"question": "Shown question?", "verdict": "Correct"}]
+    assert generator.take("t1", report) == "Next question?"
+    # The other branch may have been discarded before it ran
+    assert seen and all(left is None for left in seen)
+
+
+def test_take_waits_no_longer_than_the_turn_allows():
+    release = threading.Event()
+    generator = SpeculativeQuestionGenerator(lambda *args: release.wait(5) and "Late question?", wait_seconds=30)
+    generator.prefetch("t2", "Dynamic", [], [], "Shown question?")
+    report = [{"question": "Shown question?", "verdict": "Incorrect"}]
+    taken = {}
+    start = time.perf_counter()
+    _run_in_turn(lambda: taken.setdefault("question", generator.take("t2", report)), budget=0.4)
+    release.set()
+    assert taken["question"] is None
+    assert time.perf_counter() - start < 1.0
+    assert generator.misses == 1
@@ -0,0 +1,50 @@
+import uuid
+from collections import Counter
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from agent import create_agent_graph, create_static_fast_graph
+from fake_llm import fake_interviewer
+from question_bank import question_bank
+
+
+def _run(graph, state, answers):
+    config = {"configurable": {"thread_id": f"test-{uuid.uuid4().hex}"}}
+    graph.invoke(state, config)
+    for answer in answers:
+        graph.update_state(config, {"messages": [HumanMessage(content=answer)]})
+        graph.invoke(None, config)
+    return graph.get_state(config).values
+
+
+def _answers(n):
+    # Unique answers, so no evaluation is served from the cache
+    return [f"I would use an absolute reference so the formula keeps pointing at one cell ({uuid.uuid4().hex})." for _ in range(n)]
+
+
+def test_fast_path_asks_every_question_without_the_interviewer(fake_models, new_interview):
+    questions = question_bank.sample(3, seed="fast-path")
+    state = _run(create_static_fast_graph(None, MemorySaver()), new_interview("Static", questions), _answers(3))
+
+    assert state["interview_finished"] and state["final_rating"]
+    assert [r["question"] for r in state["feedback_report"]] == [q["question"] for q in questions]
+    assert all(r["verdict"] in ("Correct", "Partially Correct", "Incorrect") for r in state["feedback_report"])
+    # Greeting + 3 questions' worth of replies + the closing, one AI message per candidate message
+    assert sum(isinstance(m, AIMessage) for m in state["messages"]) == 4
+    # Routing and asking are local: one evaluation per answer and one judgement, no orchestrator calls
+    assert Counter(call["role"] for call in fake_models.reset()) == {"evaluator": 3, "judge": 1}
+
+
+def test_fast_path_needs_fewer_calls_than_the_interviewer_graph(fake_models, new_interview):
+    questions = question_bank.sample(2, seed="fast-path-compare")
+    interviewer = fake_interviewer("Static", len(questions))
+    full = _run(create_agent_graph(interviewer, MemorySaver(), "Static"), new_interview("Static", questions), _answers(2))
+    full_calls = Counter(call["role"] for call in fake_models.reset())
+    fast = _run(create_agent_graph(interviewer, MemorySaver(), "Static", static_fast_path=True), new_interview("Static", questions), _answers(2))
+    fast_calls = Counter(call["role"] for call in fake_models.reset())
+
+    assert [r["question"] for r in fast["feedback_report"]] == [r["question"] for r in full["feedback_report"]]
+    assert full["interview_finished"] and fast["interview_finished"]
+    assert full_calls["orchestrator"] > 0 and fast_calls["orchestrator"] == 0
+    assert fast_calls["evaluator"] == full_calls["evaluator"] == 2
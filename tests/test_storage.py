@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from storage import ExcelBackend, SQLiteBackend
+
+
+@pytest.fixture(params=["sqlite", "excel"])
+def backend(request, tmp_path):
+    # Both start from DEFAULT_USERS: user1 (Static), user2 (Dynamic, 4 questions), user3 (Hybrid, 5 questions)
+    if request.param == "sqlite":
+        backend = SQLiteBackend(path=str(tmp_path / "interviews.db"), seed_excel_file=str(tmp_path / "missing.xlsx"))
+    else:
+        backend = ExcelBackend(path=str(tmp_path / "users.xlsx"))
+    backend.initialize()
+    return backend
+
+
+def _roster(backend):
+    users = backend.list_users(limit=100)
+    return {row.username: (row.interview_type, None if pd.isna(row.num_questions) else int(row.num_questions))
+            for row in users.itertuples()}
+
+
+def test_swapped_usernames(backend):
+    backend.save_results("user1", [{"question": "Q1", "user_answer": "A1", "evaluation": "Fine.\nVerdict: Correct"}], "7/10")
+    backend.apply_roster_changes({"user2": {"username": "user3", "num_questions": 2}, "user3": {"username": "user2"}}, [], [])
+    roster = _roster(backend)
+    assert roster["user3"] == ("Dynamic", 2)
+    assert roster["user2"] == ("Hybrid", 5)
+    # Untouched users keep their results
+    assert backend.get_user_results("user1")
+
+
+def test_chained_renames_and_reused_names(backend):
+    backend.apply_roster_changes(
+        {"user1": {"username": "user2"}, "user2": {"username": "user4"}, "user3": {"interview_type": "Static"}},
+        [{"username": "user1", "interview_type": "Dynamic", "num_questions": 3}],
+        [],
+    )
+    roster = _roster(backend)
+    assert set(roster) == {"user1", "user2", "user3", "user4"}
+    assert roster["user2"][0] == "Static"
+    assert roster["user4"] == ("Dynamic", 4)
+    assert roster["user3"][0] == "Static"
+    assert roster["user1"] == ("Dynamic", 3)
+
+
+def test_rename_into_a_deleted_name(backend):
+    backend.apply_roster_changes({"user2": {"username": "user1"}}, [], ["user1"])
+    roster = _roster(backend)
+    assert set(roster) == {"user1", "user3"}
+    assert roster["user1"] == ("Dynamic", 4)
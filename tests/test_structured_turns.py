@@ -0,0 +1,86 @@
+import uuid
+from collections import Counter
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from agent import create_agent_graph, create_structured_turn_graph, stream_turn
+from fake_llm import fake_interviewer
+from question_bank import question_bank
+
+
+def _turn(graph, config, graph_input):
+    return list(stream_turn(graph, graph_input, config, budget=0))
+
+
+def _answer():
+    return f"I would wrap the lookup in IFERROR and use an exact match so missing ids are flagged ({uuid.uuid4().hex})."
+
+
+def test_each_answer_costs_one_structured_call(fake_models, new_interview):
+    questions = question_bank.sample(3, seed="structured")
+    graph = create_structured_turn_graph(None, MemorySaver(), "Static")
+    config = {"configurable": {"thread_id": f"test-{uuid.uuid4().hex}"}}
+
+    opening = _turn(graph, config, new_interview("Static", questions))
+    assert [kind for kind, _ in opening] == ["message"]
+    assert questions[0]["question"] in opening[0][1].content
+    assert fake_models.reset() == []
+
+    for number in range(1, len(questions) + 1):
+        graph.update_state(config, {"messages": [HumanMessage(content=_answer())]})
+        events = _turn(graph, config, None)
+        assert all(kind == "message" for kind, _ in events)
+        roles = Counter(call["role"] for call in fake_models.reset())
+        # The last answer is followed by the structured judgement
+        assert roles == ({"evaluator": 1} if number < len(questions) else {"evaluator": 1, "judge": 1})
+
+    state = graph.get_state(config).values
+    assert state["interview_finished"]
+    assert state["final_rating"].endswith("/10")
+    assert [r["question"] for r in state["feedback_report"]] == [q["question"] for q in questions]
+    assert all(r["evaluation"].endswith(f"Verdict: {r['verdict']}") for r in state["feedback_report"])
+
+
+def test_clarification_requests_are_not_graded(fake_models, new_interview):
+    questions = question_bank.sample(2, seed="structured-clarify")
+    graph = create_structured_turn_graph(None, MemorySaver(), "Static")
+    config = {"configurable": {"thread_id": f"test-{uuid.uuid4().hex}"}}
+    _turn(graph, config, new_interview("Static", questions))
+
+    graph.update_state(config, {"messages": [HumanMessage(content="Do you mean in a table or a range?")]})
+    _turn(graph, config, None)
+    state = graph.get_state(config).values
+    assert state["feedback_report"] == [] and state["question_number"] == 0
+    assert isinstance(state["messages"][-1], AIMessage)
+
+
+def test_dynamic_turns_propose_the_next_question(fake_models, new_interview):
+    graph = create_structured_turn_graph(None, MemorySaver(), "Dynamic")
+    config = {"configurable": {"thread_id": f"test-{uuid.uuid4().hex}"}}
+    _turn(graph, config, new_interview("Dynamic", num_questions=2))
+    fake_models.reset()
+
+    graph.update_state(config, {"messages": [HumanMessage(content=_answer())]})
+    _turn(graph, config, None)
+    state = graph.get_state(config).values
+    assert len(state["feedback_report"]) == 1
+    assert state["current_question"] and state["current_question"] != state["feedback_report"][0]["question"]
+    # The next question comes with the turn result; the generator is only called if dedup rejects it
+    roles = Counter(call["role"] for call in fake_models.reset())
+    assert roles["evaluator"] == 1 and roles["orchestrator"] == 0
+
+
+def test_stream_turn_reports_tool_progress(fake_models, new_interview):
+    questions = question_bank.sample(1, seed="stream-turn")
+    graph = create_agent_graph(fake_interviewer("Static", len(questions)), MemorySaver(), "Static")
+    config = {"configurable": {"thread_id": f"test-{uuid.uuid4().hex}"}}
+
+    events = _turn(graph, config, new_interview("Static", questions))
+    kinds = [kind for kind, _ in events]
+    assert ("tool_start", "ask_static_question") in events and ("tool_end", "ask_static_question") in events
+    assert kinds.index("tool_start") < kinds.index("tool_end")
+    # The interviewer's reply is delivered whole once complete; streamed tokens (if any) only come from it
+    final = [payload for kind, payload in events if kind == "message"][-1]
+    assert questions[0]["question"] in final.content
+    assert all(payload in final.content for kind, payload in events if kind == "token")
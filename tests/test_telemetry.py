@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+from telemetry import Telemetry
+
+
+def test_label_values_are_escaped_for_prometheus():
+    metrics = Telemetry(trace_file=None, console=False)
+    metrics.increment("errors_total", error='ValueError: bad "cell" C:\\data\nline 2')
+    line = next(l for l in metrics.render_prometheus().splitlines() if l.startswith("excel_interviewer_errors_total{"))
+    assert line == 'excel_interviewer_errors_total{error="ValueError: bad \\"cell\\" C:\\\\data\\nline 2"} 1'
+
+
+def test_console_traces_are_off_by_default():
+    env = {k: v for k, v in os.environ.items() if k != "TRACE_CONSOLE"}
+    result = subprocess.run([sys.executable, "-c", "import telemetry; print(telemetry.TRACE_CONSOLE)"],
+                            env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,49 @@
+import pytest
+
+from storage import SQLiteBackend
+from user_cache import UserTableCache
+
+
+class _PinnedBackend(SQLiteBackend):
+    """A backend whose file signature never changes, so only invalidate() can trigger a reload."""
+
+    def signature(self) -> tuple:
+        return ("pinned",)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteBackend(path=str(tmp_path / "interviews.db"), seed_excel_file=str(tmp_path / "missing.xlsx"))
+    backend.initialize()
+    return backend
+
+
+def test_lookups_are_served_from_memory_until_the_store_changes(backend):
+    cache = UserTableCache(lambda: backend)
+    assert cache.get_user("user2")["interview_type"] == "Dynamic"
+    assert cache.get_user("missing") is None
+    assert len(cache.get_table()) == 3
+    assert cache.stats() == {"hits": 2, "misses": 1, "reloads": 1, "users": 3}
+
+    backend.save_results("user2", [{"question": "Q1", "user_answer": "A1", "evaluation": "Fine.\nVerdict: Correct"}], "8/10")
+    assert cache.get_user("user2")["test_taken"] is True
+    assert cache.stats()["reloads"] == 2
+
+
+def test_invalidate_reloads_on_the_next_lookup(tmp_path):
+    backend = _PinnedBackend(path=str(tmp_path / "interviews.db"), seed_excel_file=str(tmp_path / "missing.xlsx"))
+    backend.initialize()
+    cache = UserTableCache(lambda: backend)
+    assert cache.get_user("user1")["final_rating"] is None
+
+    backend.save_results("user1", [{"question": "Q1", "user_answer": "A1", "evaluation": "Fine.\nVerdict: Correct"}], "6/10")
+    assert cache.get_user("user1")["final_rating"] is None  # Same signature, so still the old snapshot
+    cache.invalidate()
+    assert cache.get_user("user1")["final_rating"] == "6/10"
+    assert cache.stats()["reloads"] == 2 and cache.stats()["hits"] == 1
+
+
+def test_returned_records_are_copies(backend):
+    cache = UserTableCache(lambda: backend)
+    cache.get_user("user3")["interview_type"] = "Static"
+    assert cache.get_user("user3")["interview_type"] == "Hybrid"
@@ -0,0 +1,69 @@
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from storage import StorageBackend, get_backend, user_record_from_row
+
+
+class UserTableCache:
+    """
+    Process-wide, memory-resident copy of the roster (no answer columns), indexed by username.
+    The table is reloaded only when the backend's file signature (mtime/size) changes
+    or after invalidate() is called for a local write, so a login is a dict lookup.
+    """
+
+    def __init__(self, backend_getter: Callable[[], StorageBackend] = get_backend):
+        self._backend_getter = backend_getter
+        self._lock = threading.Lock()
+        # (signature, table, index) is swapped as one tuple so readers never see a half-built snapshot
+        self._snapshot: Optional[Tuple[tuple, pd.DataFrame, Dict[str, dict]]] = None
+        self._stale = True
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _fresh_snapshot(self) -> Tuple[tuple, pd.DataFrame, Dict[str, dict]]:
+        backend = self._backend_getter()
+        signature = backend.signature()
+        snapshot = self._snapshot
+        if snapshot is not None and not self._stale and signature == snapshot[0]:
+            self.hits += 1
+            return snapshot
+        with self._lock:
+            self.misses += 1
+            # Another thread may have reloaded while we waited for the lock
+            snapshot = self._snapshot
+            if snapshot is not None and not self._stale and signature == snapshot[0]:
+                return snapshot
+            self._stale = False
+            table = backend.get_roster()
+            index = {
+                str(row["username"]): user_record_from_row(row)
+                for _, row in table.iterrows()
+                if not pd.isna(row["username"])
+            }
+            # The signature is taken before loading, so a write racing with the load triggers another reload
+            self._snapshot = (signature, table, index)
+            self.reloads += 1
+            return self._snapshot
+
+    def get_user(self, username: str) -> Optional[dict]:
+        """Returns the roster record for a username, or None if it doesn't exist."""
+        user = self._fresh_snapshot()[2].get(username)
+        return dict(user) if user is not None else None
+
+    def get_table(self) -> pd.DataFrame:
+        """Returns a copy of the roster table."""
+        return self._fresh_snapshot()[1].copy()
+
+    def invalidate(self) -> None:
+        """Forces a reload on the next lookup. Call after every local write."""
+        self._stale = True
+
+    def stats(self) -> Dict[str, int]:
+        users = len(self._snapshot[2]) if self._snapshot is not None else 0
+        return {"hits": self.hits, "misses": self.misses, "reloads": self.reloads, "users": users}
+
+
+user_cache = UserTableCache()